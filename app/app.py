@@ -4,14 +4,19 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
-import pandas as pd
-import joblib
-import numpy as np
-import requests
 import streamlit as st
 from streamlit_option_menu import option_menu  # For better navigation
 from dotenv import load_dotenv
 
+from cache_backend import shared_cache
+from feedback_store import record_feedback
+from image_assets import crop_image_bytes, image_count
+from inference import (PREDICTION_CACHE, load_model_bundle, predict_proba_cached,
+                       proba_by_label, resolve_model_path)
+from telemetry import TIMINGS, render_metrics_text, span
+from weather_cache import WEATHER_CACHE, cached_weather
+from weather_prefetch import start_prefetcher
+
 load_dotenv()
 
 # -------------------------
@@ -58,9 +63,8 @@ st.markdown('<h2 class="sub-header">Intelligent Crop Recommendations for Indian
 # =========================
 BASE_DIR = Path(__file__).resolve().parent
 IMAGES_DIR = BASE_DIR.parent / "images"
-MODEL_PATH = BASE_DIR / "crop_model.pkl"
-if not MODEL_PATH.exists():
-    MODEL_PATH = BASE_DIR.parent / "crop_model.pkl"
+GEOCODE_TTL = 30 * 24 * 3600  # pincode locations don't move
+MODEL_PATH = Path(resolve_model_path())  # KRISHIMITRA_MODEL_VARIANT=lite for the distilled model
 
 # API key - prefer st.secrets, then env; fail if missing (Option A - strict)
 API_KEY = None
@@ -76,6 +80,10 @@ if not API_KEY:
     st.error("Missing OpenWeather API key. Set OPENWEATHER_API_KEY in st.secrets or as an environment variable.")
     st.stop()
 
+# Keeps the busiest weather tiles fresh in the background (once per process, across reruns);
+# its fetches log failures instead of calling st.error, which has no script context there
+weather_prefetcher = start_prefetcher({"forecast": lambda lat, lon: fetch_forecast(lat, lon, show_errors=False)})
+
 # Gemini API key
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 
@@ -456,13 +464,21 @@ CROP_DISEASES = {
 # =========================
 # Utilities
 # =========================
-def http_get_json(url: str, timeout=15):
-    """HTTP request with error handling; returns parsed JSON or None."""
+def http_get_json(url: str, timeout=15, show_errors=True):
+    """HTTP request with error handling; returns parsed JSON or None.
+
+    With ``show_errors=False`` failures are only logged - for background threads,
+    which have no Streamlit script context to show them in.
+    """
+    import requests  # deferred: only the recommendations tab talks to external APIs
     try:
         r = requests.get(url, timeout=timeout)
         r.raise_for_status()
         return r.json()
     except requests.exceptions.RequestException as e:
+        if not show_errors:
+            logger.warning("HTTP request failed: %s", e)
+            return None
         logger.exception("HTTP request failed")
         st.error(f"Network error while contacting external API: {e}")
         return None
@@ -473,82 +489,9 @@ def safe_image_show(crop_name: str):
         st.warning("❌ Images folder not found.")
         return
 
-    base = crop_name.lower().replace(' ', '_')
-    for ext in (".jpg", ".jpeg", ".png"):
-        test_path = IMAGES_DIR / (base + ext)
-        if test_path.exists():
-            try:
-                # Try to verify the image is valid before displaying
-                from PIL import Image as PILImage
-                with PILImage.open(test_path) as img:
-                    img.verify()
-                
-                # If verification passes, display the image
-                st.image(str(test_path), caption=crop_name, width=300)
-                return
-            except (TypeError, Exception) as e:
-                # If there's any error with the image, create a placeholder instead
-                logger.warning(f"Image error for {crop_name}: {e}")
-                break
-
-    # Show a nice placeholder instead of warning
-    create_crop_placeholder(crop_name)
-
-def create_crop_placeholder(crop_name: str):
-    """Create a styled placeholder for missing crop images"""
-    # Crop-specific colors and emojis
-    crop_themes = {
-        'blackgram': {'color': '#4A4A4A', 'bg': '#F5F5F5', 'emoji': '🤎', 'desc': 'Black Lentil'},
-        'chickpea': {'color': '#D2691E', 'bg': '#FFF8DC', 'emoji': '🥬', 'desc': 'Chickpea/Gram'},
-        'cotton': {'color': '#FFE4E1', 'bg': '#FFFFFF', 'emoji': '☁️', 'desc': 'Cotton Plant'},
-        'lentil': {'color': '#CD853F', 'bg': '#FFF8DC', 'emoji': '🥬', 'desc': 'Red Lentils'},
-        'mango': {'color': '#FFD700', 'bg': '#FFFAF0', 'emoji': '🥭', 'desc': 'Mango Tree'},
-        'mothbeans': {'color': '#8B4513', 'bg': '#F5DEB3', 'emoji': '🌱', 'desc': 'Moth Beans'},
-        'mungbean': {'color': '#228B22', 'bg': '#F0FFF0', 'emoji': '👌', 'desc': 'Mung Bean'},
-        'muskmelon': {'color': '#FFA500', 'bg': '#FFFACD', 'emoji': '🍈', 'desc': 'Muskmelon'},
-        'pigeonpeas': {'color': '#DAA520', 'bg': '#FFFAF0', 'emoji': '🥬', 'desc': 'Pigeon Peas'}
-    }
-    
-    theme = crop_themes.get(crop_name.lower(), {'color': '#2E8B57', 'bg': '#F0FFF0', 'emoji': '🌱', 'desc': 'Agricultural Crop'})
-    
-    # Create a styled HTML placeholder
-    placeholder_html = f"""
-    <div style="
-        width: 300px;
-        height: 200px;
-        background: linear-gradient(135deg, {theme['bg']} 0%, {theme['color']}20 100%);
-        border: 2px solid {theme['color']};
-        border-radius: 15px;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        text-align: center;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        margin: 10px 0;
-    ">
-        <div style="font-size: 48px; margin-bottom: 10px;">{theme['emoji']}</div>
-        <div style="
-            font-size: 18px;
-            font-weight: bold;
-            color: {theme['color']};
-            margin-bottom: 5px;
-        ">{crop_name.title()}</div>
-        <div style="
-            font-size: 14px;
-            color: {theme['color']}80;
-            font-style: italic;
-        ">{theme['desc']}</div>
-        <div style="
-            font-size: 12px;
-            color: {theme['color']}60;
-            margin-top: 8px;
-        ">🎨 Crop Placeholder</div>
-    </div>
-    """
-    
-    st.markdown(placeholder_html, unsafe_allow_html=True)
+    # Cached thumbnail bytes, or the crop's pre-rendered placeholder when it has no usable image
+    with span("image"):
+        st.image(crop_image_bytes(crop_name, IMAGES_DIR), caption=crop_name, width=300)
 
 def fmt_money(val: float) -> str:
     """Format currency (INR) nicely."""
@@ -558,14 +501,26 @@ def fmt_money(val: float) -> str:
         return "₹-"
 
 def get_lat_lon(pin: str):
-    """Resolve lat/lon from Indian PIN code using OpenWeather geocoding (zip)."""
+    """Resolve lat/lon from Indian PIN code: offline gazetteer first, OpenWeather geocoding (zip) for unknown codes."""
     if not pin or len(pin) != 6 or not pin.isdigit():
         return None, None
 
+    from gazetteer import locate
+    location = locate(pin)
+    if location:
+        return location["lat"], location["lon"]
+
+    # Online lookups are shared with the other workers through the result cache
+    logger.info("PIN %s isn't in the offline gazetteer; geocoding online", pin)
+    coords = shared_cache().get_or_compute("geocode", pin, lambda: geocode_online(pin), ttl=GEOCODE_TTL)
+    return tuple(coords) if coords else (None, None)
+
+def geocode_online(pin: str):
+    """OpenWeather zip geocoding: (lat, lon), or None."""
     url = f"https://api.openweathermap.org/geo/1.0/zip?zip={pin},IN&appid={API_KEY}"
     data = http_get_json(url)
     if not data:
-        return None, None
+        return None
 
     lat = data.get("lat")
     lon = data.get("lon")
@@ -573,25 +528,31 @@ def get_lat_lon(pin: str):
     if lat is None or lon is None:
         # Some responses may include different fields or an error message
         logger.warning("Geocode response missing lat/lon: %s", data)
-        return None, None
+        return None
 
     try:
         return float(lat), float(lon)
     except Exception:
-        return None, None
+        return None
 
 def get_weather(lat: float, lon: float):
-    """Get weather summary (avg temp, avg humidity, total rainfall across forecast entries)."""
+    """Get weather summary (avg temp, avg humidity, total rainfall across forecast entries).
+
+    Served per geohash tile, so nearby pincodes share one forecast fetch per TTL.
+    """
     if lat is None or lon is None:
         return None, None, None
+    return cached_weather(lat, lon, fetch_forecast, kind="forecast") or (None, None, None)
 
+def fetch_forecast(lat: float, lon: float, show_errors=True):
+    """One forecast call: (avg temp, avg humidity, total rainfall), or None on failure."""
     url = (
         f"https://api.openweathermap.org/data/2.5/forecast"
         f"?lat={lat}&lon={lon}&appid={API_KEY}&units=metric"
     )
-    data = http_get_json(url)
+    data = http_get_json(url, show_errors=show_errors)
     if not data or "list" not in data:
-        return None, None, None
+        return None
 
     temps, hums, rains = [], [], []
     for entry in data["list"]:
@@ -607,26 +568,30 @@ def get_weather(lat: float, lon: float):
             rains.append(0.0)
 
     try:
-        temp_avg = float(np.mean(temps)) if temps else None
-        hum_avg = float(np.mean(hums)) if hums else None
-        rain_total = float(np.sum(rains)) if rains else 0.0
+        temp_avg = float(sum(temps) / len(temps)) if temps else None
+        hum_avg = float(sum(hums) / len(hums)) if hums else None
+        rain_total = float(sum(rains)) if rains else 0.0
         return temp_avg, hum_avg, rain_total
     except Exception:
         logger.exception("Error computing weather aggregates")
-        return None, None, None
+        return None
 
 # =========================
 # Model & Encoder Load
 # =========================
 @st.cache_resource()
-def load_model_and_encoder():
-    """Load model and best-effort encoder with backward compatibility."""
+def load_model_and_encoder(model_mtime=None):
+    """Load model and best-effort encoder with backward compatibility.
+
+    ``model_mtime`` is part of the cache key so a version published by
+    update_model.py is picked up on the next run.
+    """
     try:
         if not MODEL_PATH.exists():
             st.error(f"Model file not found at: {MODEL_PATH}")
             return None, None
 
-        model_bundle = joblib.load(str(MODEL_PATH))
+        model_bundle = load_model_bundle(str(MODEL_PATH), model_mtime)
         # preferred: dict {"model":..., "encoder":...}
         if isinstance(model_bundle, dict) and "model" in model_bundle and "encoder" in model_bundle:
             return model_bundle["model"], model_bundle["encoder"]
@@ -657,42 +622,43 @@ def load_model_and_encoder():
         st.error(f"⚠️ Could not load model or encoder. Technical detail: {e}")
         return None, None
 
-model, label_encoder = load_model_and_encoder()
 
-# Recommendation fallback if module not available
-try:
-    from recommendation import get_crop_recommendations  # type: ignore
-except Exception as e:
-    st.warning("Recommendation module not found. Using built-in fallback recommendations.")
-    st.error(f"Import error details: {e}")
-    def get_crop_recommendations(prediction, land_area, budget):
-        """Fallback: return a single recommendation object."""
-        return [{
-            "name": prediction,
-            "roi": budget * 1.5,
-            "profit": budget * 0.8,
-            "investment": budget * 0.7,
-            "demand": "High",
-            "price_trend": 1,
-            "harvest_time": "3-4",
-            "resilience": "7",
-            "sowing_window": "June-July",
-            "critical_months": "August",
-            "weather_impact": {
-                "Temperature": "Optimal between 20-30°C",
-                "Rainfall": "Requires moderate rainfall"
-            },
-            "tips": ["Use organic fertilizers", "Maintain proper spacing"],
-            "warnings": ["Avoid waterlogging", "Watch for pest attacks"]
-        }]
-
-# PDF export fallback
+# PDF export fallback (fpdf itself is only imported when a report is built)
 try:
-    from export_pdf import generate_crop_pdf  # type: ignore
+    from export_pdf import generate_crop_pdf, pdf_available  # type: ignore
+    if not pdf_available():
+        raise ImportError("fpdf2 is not installed")
 except Exception:
     generate_crop_pdf = None
     st.info("PDF export disabled. Add export_pdf.py (uses fpdf) to enable PDF reports.")
 
+# =========================
+# Admin: pipeline stage timings (hidden; open the app with ?admin=<KRISHIMITRA_ADMIN_TOKEN>)
+# =========================
+ADMIN_TOKEN = os.getenv("KRISHIMITRA_ADMIN_TOKEN")
+if ADMIN_TOKEN and st.query_params.get("admin") == ADMIN_TOKEN:
+    with st.sidebar.expander("⏱️ Pipeline Timings", expanded=True):
+        if st.button("Reset timings"):
+            TIMINGS.reset()
+        timings = TIMINGS.snapshot()
+        if timings:
+            rows = "\n".join(f"| {stage} | {row['count']} | {row['p50_ms']:.2f} | {row['p95_ms']:.2f} | "
+                             f"{row['p99_ms']:.2f} | {row['max_ms']:.2f} |" for stage, row in timings.items())
+            st.markdown("| stage | n | p50 ms | p95 ms | p99 ms | max ms |\n|---|---|---|---|---|---|\n" + rows)
+        else:
+            st.caption("No requests timed yet.")
+        metrics_text = render_metrics_text()
+        st.code(metrics_text, language="text")
+        st.download_button("Download metrics", metrics_text, file_name="metrics.txt", mime="text/plain",
+                           on_click="ignore")
+        st.caption(f"Prediction cache: {PREDICTION_CACHE.stats()}")
+        st.caption(f"Weather tile cache: {WEATHER_CACHE.stats()}")
+        if weather_prefetcher:
+            st.caption(f"Weather prefetch: {weather_prefetcher.stats()}")
+        from fresh_recommendations import RECOMMENDATION_FLIGHTS
+        st.caption(f"Recommendation coalescing: {RECOMMENDATION_FLIGHTS.stats()}")
+        st.caption(f"Shared result cache: {shared_cache().stats()}")
+
 # =========================
 # Navigation
 # =========================
@@ -732,21 +698,36 @@ if selected_tab == "Get Recommendations":
         submitted = st.form_submit_button("🌱 Get Crop Recommendations", width='stretch')
 
     if submitted:
+        # Loaded on first submit and cached, so other tabs never import joblib/sklearn
+        model, label_encoder = load_model_and_encoder(MODEL_PATH.stat().st_mtime if MODEL_PATH.exists() else None)
+
         # basic validations
         if not pin_code or len(pin_code) != 6 or not pin_code.isdigit():
             st.error("❌ Please enter a valid 6-digit PIN code.")
         elif model is None:
             st.error("❌ Crop prediction model is not available.")
         else:
-            with st.spinner("🌤️ Fetching weather data..."):
+            with st.spinner("🌤️ Fetching weather data..."), span("geocode", pincode=pin_code):
                 lat, lon = get_lat_lon(pin_code)
 
             if lat is None or lon is None:
                 st.error("📍 Couldn't find location for that PIN code. Please check and try again.")
             else:
-                with st.spinner("📊 Analyzing weather and soil conditions..."):
+                with st.spinner("📊 Analyzing weather and soil conditions..."), span("weather", pincode=pin_code):
                     temp, humidity, rainfall = get_weather(lat, lon)
 
+                rainfall_label = "Rainfall (forecast sum)"
+                using_normals = False
+                if temp is None:
+                    # Live weather failed: use this month's climate normals for the location instead
+                    from climatology import climate_normals
+                    normals = climate_normals(lat, lon)
+                    if normals:
+                        temp, humidity, rainfall = normals["temperature"], normals["humidity"], normals["rainfall"]
+                        rainfall_label = "Rainfall (monthly normal)"
+                        using_normals = True
+                        st.info("🌦️ Live weather unavailable - using this month's climate normals for your location.")
+
                 if temp is None:
                     st.error("⚠️ Weather data unavailable. Please try again later.")
                 else:
@@ -757,123 +738,64 @@ if selected_tab == "Get Recommendations":
                     with weather_col2:
                         st.metric("Humidity", f"{humidity:.1f}%")
                     with weather_col3:
-                        st.metric("Rainfall (forecast sum)", f"{rainfall:.1f} mm")
-
-                    # Feature order used during model training - ensure exact order
-                    feature_order = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
-                    features = pd.DataFrame([{
-                        "N": n, "P": p, "K": k,
-                        "temperature": temp, "humidity": humidity,
-                        "ph": ph, "rainfall": rainfall
-                    }])[feature_order]
-
-                    # Skip ML model prediction - use pincode-based recommendations directly
-                    st.info("📍 **Using Pincode-Based Recommendations:** Analyzing crops from dataset based on your location")
-                    
-                    # Set a dummy prediction since we're using pincode-based mode
-                    prediction = "PINCODE_BASED"
+                        st.metric(rainfall_label, f"{rainfall:.1f} mm")
+
+                    # Model probabilities via the LRU keyed on the quantized feature vector
+                    # (same order as training: N, P, K, temperature, humidity, ph, rainfall)
+                    with span("model_predict"):
+                        model_proba = predict_proba_cached(model, (n, p, k, temp, humidity, ph, rainfall))
+                        model_scores = proba_by_label(model, label_encoder, model_proba)
+                    if model_scores:
+                        logger.info("Model top crop for PIN %s: %s (cache %s)", pin_code,
+                                    max(model_scores, key=model_scores.get), PREDICTION_CACHE.stats())
+
+                    # One ranking pass blends location suitability, regional preference and the model
+                    st.info("📍 **Blended Recommendations:** Ranking crops by your location's conditions, regional preferences and the ML model")
 
                     # get recommendations (plugin or fallback) - pass pincode for location-specific recommendations
                     try:
-                        # Get recommendations with API key
-                        api_key = os.getenv('OPENWEATHERMAP_API_KEY')
-                        
-                        # Show weather data status
-                        if api_key:
+                        # Show weather data status (the normals fallback announced itself above)
+                        if not using_normals:
                             st.info("🌤️ Using real-time weather data for recommendations...")
-                        else:
-                            st.warning("⚠️ No API key found. Using pincode-based weather estimation for recommendations.")
-                        
-                        # IMPORTANT: Get pincode-specific recommendations directly from dataset
-                        # AGGRESSIVE cache clearing and session state management
-                        try:
-                            st.cache_data.clear()
-                        except:
-                            pass
-                        try:
-                            st.cache_resource.clear() 
-                        except:
-                            pass
-                        
-                        # Clear any cached function results
-                        if hasattr(get_crop_recommendations, 'clear'):
-                            get_crop_recommendations.clear()
-                        
-                        # Force Python to clear any internal caches
-                        import gc
-                        gc.collect()
-                        
-                        # Store current pincode in session state to track changes
-                        if 'current_pincode' not in st.session_state:
-                            st.session_state.current_pincode = None
-                        
-                        # Check if pincode changed
-                        if st.session_state.current_pincode != pin_code:
-                            st.write(f"🔄 **PINCODE CHANGED:** {st.session_state.current_pincode} → {pin_code}**")
-                            st.session_state.current_pincode = pin_code
-                            # Clear any cached data when pincode changes
-                            if hasattr(st, 'cache_data'):
-                                st.cache_data.clear()
-                        else:
-                            st.write(f"🔍 **Getting recommendations for PIN {pin_code}...**")
-                        
-                        # Get recommendations with explicit parameters and unique processing
-                        import hashlib
-                        import time
-                        timestamp = int(time.time() * 1000)  # Millisecond timestamp
-                        pincode_hash = hashlib.md5(f"{pin_code}_{budget}_{land_area}_{timestamp}".encode()).hexdigest()[:8]
-                        st.write(f"📊 **Processing ID:** {pincode_hash} (timestamp: {timestamp})")
-                        
-                        # USE COMPLETELY FRESH FUNCTION - bypass ALL possible caching
-                        import sys
-                        import os
-                        
-                        # Import the fresh recommendation function
-                        sys.path.insert(0, os.path.join(os.getcwd(), 'app'))
-                        from fresh_recommendations import get_fresh_crop_recommendations
-                        
-                        # Call completely fresh function
-                        st.write(f"🆕 **USING FRESH FUNCTION for PIN {pin_code}**")
-                        recommendations = get_fresh_crop_recommendations(
-                            pincode=str(pin_code),
-                            land_area=land_area, 
-                            budget=budget
-                        )
-                        
-                        # Show fresh results immediately
-                        if recommendations:
-                            fresh_top_3 = [rec['name'] for rec in recommendations[:3]]
-                            st.success(f"✨ **FRESH RESULTS for PIN {pin_code}:** {', '.join(fresh_top_3)}")
+
+                        # Concurrent identical submissions share one run, and results are reused
+                        # from the shared result cache (keyed on the inputs and dataset version);
+                        # the model, dataset and images stay cached (and pre-warmed by warmup.py)
+                        # (imported here so the other tabs never load pandas)
+                        from fresh_recommendations import coalesced_recommendations
+
+                        with span("recommend", pincode=pin_code):
+                            recommendations = coalesced_recommendations(
+                                pincode=str(pin_code),
+                                land_area=land_area, 
+                                budget=budget,
+                                model_proba=model_scores,
+                                # Rank against the conditions shown above (live weather or normals)
+                                conditions={"temperature": temp, "humidity": humidity,
+                                            "rainfall": rainfall, "ph": ph},
+                            )
                         
                         if recommendations:
-                            # Show detailed debugging information
                             top_3_crops = [rec['name'] for rec in recommendations[:3]]
                             st.success(f"🌾 **PIN {pin_code} Top 3:** {', '.join(top_3_crops)}")
-                            
-                            # Additional verification
-                            st.write("**🗺️ VERIFICATION:**")
-                            for i, rec in enumerate(recommendations[:5], 1):
-                                score = rec.get('debug_score', 'N/A')
-                                st.write(f"{i}. **{rec['name']}** (Score: {score})")
-                            
-                            # Double-check by calling fresh function again
-                            st.write("**🔄 DOUBLE-CHECK (calling fresh function again):**")
-                            verify_recs = get_fresh_crop_recommendations(str(pin_code), land_area, budget)
-                            verify_top_3 = [rec['name'] for rec in verify_recs[:3]] if verify_recs else ["No crops"]
-                            st.write(f"Second call result: {', '.join(verify_top_3)}")
-                            
+                            from pincode_index import lookup_pincode
+                            location = lookup_pincode(pin_code)
+                            if location["state"]:
+                                st.caption(f"📍 {location['state']} · {location['agro_zone']} agro-climatic zone")
+                            logger.debug("PIN %s scores: %s", pin_code,
+                                         [(rec['name'], rec.get('debug_score')) for rec in recommendations[:5]])
                         else:
                             st.error("No recommendations generated!")
                         
                         # Show success message
-                        if api_key and recommendations:
+                        if recommendations and not using_normals:
                             st.success(f"✅ Found {len(recommendations)} crops specifically suited for PIN {pin_code} using real-time weather!")
                         elif recommendations:
-                            st.success(f"✅ Found {len(recommendations)} crops specifically suited for PIN {pin_code} based on regional conditions!")
+                            st.success(f"✅ Found {len(recommendations)} crops specifically suited for PIN {pin_code} using this month's climate normals!")
                     except Exception:
                         logger.exception("Recommendation function failed; using fallback single recommendation")
                         recommendations = [{
-                            "name": prediction,
+                            "name": max(model_scores, key=model_scores.get) if model_scores else "Unknown Crop",
                             "roi": budget * 1.2,
                             "profit": budget * 0.7,
                             "investment": budget * 0.6,
@@ -889,7 +811,7 @@ if selected_tab == "Get Recommendations":
                         }]
 
                     # Check image availability
-                    available_images = len([f for f in (IMAGES_DIR).glob('*.jpg')]) if IMAGES_DIR.exists() else 0
+                    available_images = image_count(IMAGES_DIR)
                     total_crops = 22  # From dataset analysis
                     
                     if available_images >= total_crops:
@@ -962,22 +884,55 @@ if selected_tab == "Get Recommendations":
 
                     # PDF Export if supported
                     if generate_crop_pdf:
-                        try:
-                            pdf_path = generate_crop_pdf(recommendations, land_area)
-                            with open(pdf_path, "rb") as f:
-                                st.download_button(
-                                    label="📄 Download Detailed PDF Report",
-                                    data=f,
-                                    file_name="crop_recommendation_report.pdf",
-                                    mime="application/pdf",
-                                    width='stretch',
-                                )
-                        except Exception as e:
-                            logger.exception("PDF export failed")
-                            st.error(f"PDF generation failed: {e}")
+                        report_recommendations, report_land_area = recommendations, land_area
+
+                        def build_report():
+                            # Runs only when the button is clicked; repeat downloads hit the PDF cache
+                            try:
+                                return generate_crop_pdf(report_recommendations, report_land_area)
+                            except Exception:
+                                logger.exception("PDF export failed")
+                                raise
+
+                        st.download_button(
+                            label="📄 Download Detailed PDF Report",
+                            data=build_report,
+                            file_name="crop_recommendation_report.pdf",
+                            mime="application/pdf",
+                            on_click="ignore",  # keep the results on screen
+                            width='stretch',
+                        )
                     else:
                         st.info("💡 Install fpdf and add export_pdf.py to enable PDF report downloads")
 
+                    # Remember this request so the farmer can tell us what they chose
+                    st.session_state.last_recommendation = {
+                        "pincode": pin_code,
+                        "features": (n, p, k, temp, humidity, ph, rainfall),
+                        "crops": list(dict.fromkeys(
+                            [rec.get('name', 'Unknown Crop').lower() for rec in recommendations]
+                            + (list(label_encoder.classes_) if label_encoder is not None else [])
+                        )),
+                    }
+
+    # Farmer feedback feeds incremental retraining (update_model.py)
+    last_recommendation = st.session_state.get("last_recommendation")
+    if last_recommendation:
+        with st.form("crop_feedback_form"):
+            st.subheader("📝 Which crop did you choose?")
+            chosen_crop = st.selectbox(f"Crop you plan to grow on PIN {last_recommendation['pincode']}",
+                                       last_recommendation["crops"])
+            feedback_submitted = st.form_submit_button("💾 Save my choice")
+
+        if feedback_submitted:
+            try:
+                record_feedback(last_recommendation["features"], chosen_crop,
+                                pincode=last_recommendation["pincode"])
+                st.success(f"✅ Thanks! Your choice ({chosen_crop}) will help improve future recommendations.")
+            except Exception as e:
+                logger.exception("Saving feedback failed")
+                st.error(f"Could not save your feedback: {e}")
+
 # =========================
 # TAB 2: Crop Calendar
 # =========================
@@ -0,0 +1,261 @@
+# Shared result cache - pluggable backends so a result computed by one worker is reused by all
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+logger = logging.getLogger("krishimitra")
+
+# KRISHIMITRA_CACHE_URL: memory:// (per process, the default), sqlite:///path/to/cache.db (e.g. on
+# a volume shared by every worker) or redis://host:6379/0 (any Redis-protocol server; needs redis)
+DEFAULT_CACHE_URL = "memory://"
+
+# Part of every key; bump when the shape of a cached value changes
+FORMAT_VERSION = 1
+
+@lru_cache(maxsize=1)
+def _msgpack():
+    # Optional: values are msgpack when it's installed, compact JSON otherwise
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+def _plain(value):
+    # numpy scalars/arrays from the ranking
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Can't cache a {type(value).__name__}")
+
+def dumps(value):
+    """Serialize a value of plain types (tuples come back as lists); the first byte tags the format."""
+    msgpack = _msgpack()
+    if msgpack is not None:
+        return b"m" + msgpack.packb(value, default=_plain, use_bin_type=True)
+    return b"j" + json.dumps(value, default=_plain, separators=(",", ":")).encode("utf-8")
+
+def loads(data):
+    """Inverse of dumps; None for msgpack data on a worker without msgpack (a cache miss)."""
+    if data[:1] == b"m":
+        msgpack = _msgpack()
+        return msgpack.unpackb(data[1:], raw=False) if msgpack is not None else None
+    return json.loads(data[1:])
+
+def normalize(value):
+    """(value as a cache hit would return it, its serialized form); the value is passed
+    through unchanged, with data None, if it can't be serialized."""
+    try:
+        data = dumps(value)
+    except (TypeError, ValueError) as e:
+        logger.warning("Shared cache value not serializable: %s", e)
+        return value, None
+    return loads(data), data
+
+class MemoryBackend:
+    """Process-local LRU with expiry; the default, and a stand-in for Redis in tests."""
+
+    name = "memory"
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, data, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+class SQLiteBackend:
+    """Entries in one SQLite file that several processes can share (WAL mode)."""
+
+    name = "sqlite"
+
+    # Expired rows are swept every this many writes
+    PRUNE_EVERY = 500
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")  # readers never block the writing worker
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SQLITE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, data, ttl):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                         (key, sqlite3.Binary(data), time.time() + ttl))
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+class RedisBackend:
+    """Any Redis-protocol server (Redis, Valkey, KeyDB, ...); expiry is left to the server."""
+
+    name = "redis"
+
+    def __init__(self, url):
+        import redis  # optional dependency, only needed for this backend
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, data, ttl):
+        self._client.set(key, data, ex=max(1, int(ttl)))
+
+def backend_from_url(url):
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported cache URL {url!r}: use memory://, sqlite:///path or redis://host:port/db")
+
+class SharedCache:
+    """Namespaced, versioned values over a backend. Backend errors are logged and count as
+    misses, so an unavailable cache server slows requests down but never fails them."""
+
+    def __init__(self, backend, prefix="krishimitra"):
+        self.backend = backend
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()  # counters are bumped from every request thread
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _key(self, namespace, key, version):
+        digest = hashlib.sha1(json.dumps(key, default=_plain, separators=(",", ":")).encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{FORMAT_VERSION}:{namespace}:{version}:{digest}"
+
+    def get(self, namespace, key, version=""):
+        try:
+            data = self.backend.get(self._key(namespace, key, version))
+            value = loads(data) if data is not None else None
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Shared cache read failed (%s): %s", self.backend.name, e)
+            value = None
+        self._count("misses" if value is None else "hits")
+        return value
+
+    def set(self, namespace, key, value, ttl, version=""):
+        try:
+            data = dumps(value)
+        except (TypeError, ValueError) as e:
+            self._count("errors")
+            logger.warning("Shared cache value not serializable: %s", e)
+            return
+        self._write(namespace, key, data, ttl, version)
+
+    def _write(self, namespace, key, data, ttl, version):
+        try:
+            self.backend.set(self._key(namespace, key, version), data, ttl)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Shared cache write failed (%s): %s", self.backend.name, e)
+
+    def get_or_compute(self, namespace, key, compute, ttl, version=""):
+        """The cached value, else ``compute()`` stored for ``ttl`` seconds (None isn't stored).
+
+        A computed value is returned as it comes back from the cache (tuples become lists,
+        numpy values plain ones), so callers see the same types on a hit and a miss.
+        """
+        value = self.get(namespace, key, version)
+        if value is None:
+            value = compute()
+            if value is not None:
+                value, data = normalize(value)
+                if data is not None:
+                    self._write(namespace, key, data, ttl, version)
+        return value
+
+    def stats(self):
+        with self._lock:
+            hits, misses, errors = self.hits, self.misses, self.errors
+        total = hits + misses
+        return {
+            "backend": self.backend.name,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "errors": errors,
+            "format": "msgpack" if _msgpack() is not None else "json",
+        }
+
+@lru_cache(maxsize=1)
+def shared_cache():
+    """The process's SharedCache for KRISHIMITRA_CACHE_URL, falling back to memory:// if it can't be opened."""
+    # Read on first use, after the app has loaded .env
+    url = os.getenv("KRISHIMITRA_CACHE_URL", DEFAULT_CACHE_URL)
+    try:
+        backend = backend_from_url(url)
+    except Exception as e:
+        logger.warning("Shared cache %s unavailable (%s); using a per-process cache", url, e)
+        backend = MemoryBackend()
+    return SharedCache(backend)
+
+@lru_cache(maxsize=8)
+def _file_digest(path, mtime):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+def data_version(*paths):
+    """Short content hash of the given files (rehashed only when one changes); part of cache
+    keys so results computed against another dataset or model are never reused."""
+    parts = []
+    for path in paths:
+        try:
+            parts.append(_file_digest(path, os.path.getmtime(path)))
+        except OSError:
+            parts.append("missing")
+    return "-".join(parts)
@@ -0,0 +1,107 @@
+# Gridded monthly climate normals - offline "expected conditions" for a location and month
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+# Built by build_climatology.py: a (lat, lon, month, variable) float32 .npy cube plus a
+# .json sidecar with the grid origin, spacing and variable names
+CLIMATOLOGY_PATH = os.getenv("KRISHIMITRA_CLIMATOLOGY") or os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "data", "climatology.npy"))
+
+# Soil pH isn't climatic; scoring conditions built from the normals use the same
+# default as the live-weather path
+DEFAULT_PH = 6.5
+
+@lru_cache(maxsize=2)
+def load_climatology(path=CLIMATOLOGY_PATH, mtime=None):
+    """Memory-map the cube once per file version (pass the mtime to reload on change)."""
+    with open(os.path.splitext(path)[0] + ".json") as f:
+        meta = json.load(f)
+    # A plain ndarray view of the mapping: same pages, without np.memmap's per-slice overhead
+    cube = np.asarray(np.load(path, mmap_mode="r"))
+    if cube.ndim != 4 or cube.shape[2] != 12 or cube.shape[3] != len(meta["variables"]):
+        raise ValueError(f"{path}: expected a (lat, lon, 12, {len(meta['variables'])}) cube, got {cube.shape}")
+    return {
+        "cube": cube,
+        "lat0": float(meta["lat0"]),
+        "lon0": float(meta["lon0"]),
+        "step": float(meta["step"]),
+        "variables": tuple(meta["variables"]),
+    }
+
+def climatology(path=CLIMATOLOGY_PATH):
+    """The shipped climatology, or None when the file isn't there."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return load_climatology(path, mtime)
+
+def climate_normals(lat, lon, month=None, clim=None):
+    """{'temperature', 'humidity', 'rainfall'} normals for a location and month (1-12, default
+    this month), bilinearly interpolated; None outside the grid."""
+    clim = clim or climatology()
+    if clim is None or lat is None or lon is None:
+        return None
+    cube = clim["cube"]
+    fy = (lat - clim["lat0"]) / clim["step"]
+    fx = (lon - clim["lon0"]) / clim["step"]
+    if not (0 <= fy <= cube.shape[0] - 1 and 0 <= fx <= cube.shape[1] - 1):
+        return None
+
+    i, j = min(int(fy), cube.shape[0] - 2), min(int(fx), cube.shape[1] - 2)
+    ty, tx = fy - i, fx - j
+    # Weighted sum of the 4 surrounding grid points
+    block = cube[i:i + 2, j:j + 2, (month or datetime.now().month) - 1].reshape(4, -1)
+    weights = np.array([(1 - ty) * (1 - tx), (1 - ty) * tx, ty * (1 - tx), ty * tx], dtype=np.float32)
+    values = weights @ block
+    return {name: round(float(v), 2) for name, v in zip(clim["variables"], values)}
+
+def climate_normals_bulk(lats, lons, months, clim=None):
+    """Vectorized climate_normals: (n, variables) float32 array, NaN rows outside the grid."""
+    clim = clim or climatology()
+    lats, lons = np.asarray(lats, np.float64), np.asarray(lons, np.float64)
+    months = np.broadcast_to(np.asarray(months, np.int64), lats.shape)
+    if clim is None:
+        return np.full(lats.shape + (3,), np.nan, np.float32)
+    cube = clim["cube"]
+    fy = (lats - clim["lat0"]) / clim["step"]
+    fx = (lons - clim["lon0"]) / clim["step"]
+    inside = (fy >= 0) & (fy <= cube.shape[0] - 1) & (fx >= 0) & (fx <= cube.shape[1] - 1)
+
+    i = np.clip(np.floor(np.where(inside, fy, 0)).astype(np.int64), 0, cube.shape[0] - 2)
+    j = np.clip(np.floor(np.where(inside, fx, 0)).astype(np.int64), 0, cube.shape[1] - 2)
+    ty, tx = (np.where(inside, fy, 0) - i)[:, None], (np.where(inside, fx, 0) - j)[:, None]
+    m = months - 1
+    values = ((cube[i, j, m] * (1 - tx) + cube[i, j + 1, m] * tx) * (1 - ty)
+              + (cube[i + 1, j, m] * (1 - tx) + cube[i + 1, j + 1, m] * tx) * ty)
+    values = values.astype(np.float32)
+    values[~inside] = np.nan
+    return values
+
+def climate_conditions(lat, lon, month=None, ph=DEFAULT_PH):
+    """Scoring conditions (temperature, humidity, rainfall, ph) from the normals, or None."""
+    normals = climate_normals(lat, lon, month)
+    if normals is None:
+        return None
+    return {**normals, "ph": ph}
+
+def pincode_conditions(pincodes, month=None, ph=DEFAULT_PH):
+    """Scoring conditions for each pincode, looked up in one batch: this month's normals at its
+    location (gazetteer position, else state capital); scoring's pincode estimate as a last resort."""
+    from gazetteer import approximate_coordinates
+    from scoring import get_pincode_based_conditions
+
+    lat, lon = approximate_coordinates([str(p) for p in pincodes])
+    normals = climate_normals_bulk(lat, lon, month or datetime.now().month)
+    conditions = []
+    for pincode, (temperature, humidity, rainfall) in zip(pincodes, normals.tolist()):
+        if temperature != temperature:  # NaN: no location for the pincode, or outside the grid
+            conditions.append(get_pincode_based_conditions(str(pincode)))
+        else:
+            conditions.append({"temperature": round(temperature, 2), "humidity": round(humidity, 2),
+                               "rainfall": round(rainfall, 2), "ph": ph})
+    return conditions
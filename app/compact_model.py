@@ -0,0 +1,112 @@
+# Compact, quantized tree ensemble used as a lightweight stand-in for the full forest
+import numpy as np
+
+class CompactForest:
+    """Flattened tree ensemble with float16 thresholds and uint8 leaf probabilities.
+
+    Exposes the same ``classes_`` / ``predict`` / ``predict_proba`` surface as the
+    scikit-learn forest, so it can be saved in the usual {"model", "encoder"}
+    bundle and loaded by the app without any special casing.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes):
+        self.feature = feature          # uint8, leaves point at feature 0
+        self.threshold = threshold      # float16
+        self.left = left                # int32, leaves point at themselves
+        self.right = right              # int32, leaves point at themselves
+        self.value = value              # uint8 [n_nodes, n_classes], 255 == probability 1.0
+        self.roots = roots              # int32 root node index of each tree
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = 7
+
+    @classmethod
+    def from_sklearn(cls, ensemble, classes):
+        """Build from a fitted multi-output tree regressor trained on teacher probabilities."""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in ensemble.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int32) + offset
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.uint8))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold).astype(np.float16))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset).astype(np.int32))
+
+            # Regressor leaves hold the mean teacher probability vector: [n_nodes, n_outputs, 1]
+            leaf_proba = np.clip(tree.value[:, :, 0], 0.0, 1.0)
+            values.append(np.rint(leaf_proba * 255).astype(np.uint8))
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            classes=classes,
+        )
+
+    def __getstate__(self):
+        # Only the quantized arrays are persisted; the float32 views are rebuilt on load
+        state = self.__dict__.copy()
+        for key in ("_threshold32", "_children", "_nodes"):
+            state.pop(key, None)
+        return state
+
+    def _prepare(self):
+        if getattr(self, "_children", None) is None:
+            self._threshold32 = self.threshold.astype(np.float32)
+            self._children = np.stack([self.left, self.right], axis=1)
+            # Plain Python tuples walk a single row far faster than numpy gathers
+            self._nodes = list(zip(self.feature.tolist(), self._threshold32.tolist(),
+                                   self.left.tolist(), self.right.tolist()))
+
+    def _leaves_single(self, x):
+        nodes = self._nodes
+        leaves = []
+        for node in self.roots.tolist():
+            feature, threshold, left, right = nodes[node]
+            while left != node:
+                node = left if x[feature] <= threshold else right
+                feature, threshold, left, right = nodes[node]
+            leaves.append(node)
+        return leaves
+
+    def predict_proba(self, X):
+        self._prepare()
+        # Quantize the inputs the same way as the thresholds so splits stay consistent
+        X = np.asarray(X, dtype=np.float16).astype(np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        if X.shape[0] == 1:
+            proba = self.value[self._leaves_single(X[0].tolist())].sum(axis=0, dtype=np.float32)
+            return (proba / max(proba.sum(), 1.0))[None, :]
+
+        rows = np.arange(X.shape[0])[:, None]
+
+        node = np.broadcast_to(self.roots, (X.shape[0], self.roots.shape[0]))
+        for _ in range(self.max_depth):
+            go_right = X[rows, self.feature[node]] > self._threshold32[node]
+            node = self._children[node, go_right.view(np.uint8)]
+
+        proba = self.value[node].sum(axis=1, dtype=np.float32)
+        totals = proba.sum(axis=1, keepdims=True)
+        return proba / np.maximum(totals, 1.0)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def nbytes(self):
+        """Size of the packed node arrays in bytes."""
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left,
+                                      self.right, self.value, self.roots))
@@ -1,85 +1,174 @@
-from fpdf import FPDF
-import tempfile
-import os
+import hashlib
+import io
+import json
+import threading
 import textwrap
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 
-class CropReportPDF(FPDF):
-    def __init__(self):
-        super().__init__()
-        # Use built-in Arial font (supports basic Unicode)
-        self.set_font('Arial', '', 12)
+from telemetry import span
+
+# Rendered reports kept in memory, keyed on a hash of their content
+PDF_CACHE_SIZE = 32
+_pdf_cache = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+def pdf_available():
+    """True when fpdf2 is installed, checked without importing it."""
+    import importlib.util
+    return importlib.util.find_spec("fpdf") is not None
+
+@lru_cache(maxsize=1)
+def _report_class():
+    # fpdf is imported on the first report, not when the app starts
+    from fpdf import FPDF
+
+    class CropReportPDF(FPDF):
+        def __init__(self):
+            super().__init__()
+            # Use built-in Arial font (supports basic Unicode)
+            self.set_font('Arial', '', 12)
+
+    return CropReportPDF
+
+# Characters the core PDF fonts can't encode, substituted in one translate pass
+_PDF_CHARS = str.maketrans({
+    "₹": "Rs.",
+    "–": "-",
+    "—": "-",
+    "’": "'",
+    "‘": "'",
+    "“": '"',
+    "”": '"',
+    ",": ", ",  # helps splitting long lines
+    "•": "-",
+})
 
 def clean_text(text):
     if not isinstance(text, str):
         text = str(text)
-    return (
-        text.replace("₹", "Rs.")
-            .replace("–", "-")
-            .replace("—", "-")
-            .replace("’", "'")
-            .replace("‘", "'")
-            .replace("“", '"')
-            .replace("”", '"')
-            .replace(",", ", ")  # helps splitting long lines
-            .replace("•", "-")
-    )
+    return text.translate(_PDF_CHARS)
 
 def wrap_text(text, width=100):
     """Wrap long strings to avoid FPDF crashing on wide words."""
     return "\n".join(textwrap.wrap(text, width=width, break_long_words=True))
 
-def generate_crop_pdf(recommendations, land_area):
-    pdf = CropReportPDF()
+# Static report text, cleaned once at import
+REPORT_TITLE = clean_text("KrishiMitra AI - Crop Recommendations")
+TIPS_HEADING = clean_text("Best Practices:")
+WARNINGS_HEADING = clean_text("Important Warnings:")
+
+# The text of a crop entry that doesn't depend on the request - cleaned and wrapped once
+CropText = namedtuple("CropText", ["title", "harvest_time", "sowing_window", "demand", "tips", "warnings"])
+
+@lru_cache(maxsize=1024)
+def _wrapped_list(items, width=85):
+    """'- a, b, c' cleaned and wrapped for multi_cell; '' for an empty list."""
+    text = clean_text(', '.join(items))
+    return wrap_text(f"- {text}", width=width) if text else ""
+
+@lru_cache(maxsize=512)
+def _crop_text(name, harvest_time, sowing_window, demand, tips, warnings):
+    return CropText(
+        title=clean_text(name.title()),
+        harvest_time=clean_text(f"Harvest Time: {harvest_time} months"),
+        sowing_window=clean_text(f"Sowing Window: {sowing_window}"),
+        demand=clean_text(f"Market Demand: {demand}"),
+        tips=_wrapped_list(tips),
+        warnings=_wrapped_list(warnings),
+    )
+
+def report_key(recommendations, land_area, include_images=True):
+    """Stable hash of everything that ends up in a report."""
+    payload = json.dumps([recommendations, land_area, include_images], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def generate_crop_pdf(recommendations, land_area, include_images=True):
+    """Render the recommendations report and return the PDF as bytes.
+
+    Identical requests are served from an in-memory LRU instead of re-rendering.
+    """
+    key = report_key(recommendations, land_area, include_images)
+    with _pdf_cache_lock:
+        data = _pdf_cache.get(key)
+        if data is not None:
+            _pdf_cache.move_to_end(key)
+            return data
+
+    with span("pdf_render"):
+        data, _ = render_reports([(recommendations, land_area, None)], include_images)
+    with _pdf_cache_lock:
+        _pdf_cache[key] = data
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return data
+
+def render_reports(reports, include_images=True):
+    """Render (recommendations, land_area, heading) reports into one document.
+
+    Each report starts on a new page; ``heading`` (e.g. the farmer's name) may be
+    None. Returns (pdf_bytes, page_count). Not cached - see generate_crop_pdf.
+    """
+    pdf = _report_class()()
+    for recommendations, land_area, heading in reports:
+        _add_report(pdf, recommendations, land_area, include_images, heading)
+    return bytes(pdf.output()), pdf.pages_count
+
+def _add_report(pdf, recommendations, land_area, include_images, heading=None):
     pdf.add_page()
     
     # Header
     pdf.set_font('Arial', 'B', 16)
-    pdf.cell(200, 10, txt="KrishiMitra AI - Crop Recommendations", ln=True, align='C')
+    pdf.cell(200, 10, txt=REPORT_TITLE, ln=True, align='C')
     pdf.ln(5)
     
     # Date and land area
     from datetime import datetime
     pdf.set_font('Arial', '', 10)
+    if heading:
+        pdf.cell(0, 8, clean_text(heading), ln=True)
     pdf.cell(0, 8, f"Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", ln=True)
     pdf.cell(0, 8, f"Land Area: {land_area} acres", ln=True)
     pdf.ln(5)
 
     for idx, crop in enumerate(recommendations, 1):
+        text = _crop_text(crop['name'], crop['harvest_time'], crop['sowing_window'], crop['demand'],
+                          tuple(crop.get('tips', [])), tuple(crop.get('warnings', [])))
+
         # Crop name
         pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, clean_text(f"{idx}. {crop['name'].title()}"), ln=True)
+        pdf.cell(0, 10, f"{idx}. {text.title}", ln=True)
+
+        # Same cached thumbnail/placeholder bytes the app shows
+        if include_images:
+            from image_assets import crop_image_bytes
+            pdf.image(io.BytesIO(crop_image_bytes(crop['name'])), w=60)
+            pdf.ln(2)
         
-        # Financial information
+        # Financial information - the only per-request text
         pdf.set_font('Arial', '', 10)
-        pdf.cell(0, 6, clean_text(f"Expected ROI: Rs.{crop['roi']:,.0f}"), ln=True)
-        pdf.cell(0, 6, clean_text(f"Profit Potential: Rs.{crop['profit']:,.0f}"), ln=True)
-        pdf.cell(0, 6, clean_text(f"Investment Required: Rs.{crop['investment']:,.0f}"), ln=True)
+        pdf.cell(0, 6, f"Expected ROI: Rs.{crop['roi']:,.0f}", ln=True)
+        pdf.cell(0, 6, f"Profit Potential: Rs.{crop['profit']:,.0f}", ln=True)
+        pdf.cell(0, 6, f"Investment Required: Rs.{crop['investment']:,.0f}", ln=True)
         
         # Timing information
-        pdf.cell(0, 6, clean_text(f"Harvest Time: {crop['harvest_time']} months"), ln=True)
-        pdf.cell(0, 6, clean_text(f"Sowing Window: {crop['sowing_window']}"), ln=True)
-        pdf.cell(0, 6, clean_text(f"Market Demand: {crop['demand']}"), ln=True)
+        pdf.cell(0, 6, text.harvest_time, ln=True)
+        pdf.cell(0, 6, text.sowing_window, ln=True)
+        pdf.cell(0, 6, text.demand, ln=True)
         
         # Tips and warnings
-        tips = clean_text(', '.join(crop.get('tips', [])))
-        warnings = clean_text(', '.join(crop.get('warnings', [])))
-        
-        if tips:
+        if text.tips:
             pdf.ln(2)
             pdf.set_font('Arial', 'B', 10)
-            pdf.cell(0, 6, "Best Practices:", ln=True)
+            pdf.cell(0, 6, TIPS_HEADING, ln=True)
             pdf.set_font('Arial', '', 9)
-            pdf.multi_cell(190, 5, wrap_text(f"- {tips}", width=85))
+            pdf.multi_cell(190, 5, text.tips)
         
-        if warnings:
+        if text.warnings:
             pdf.ln(2)
             pdf.set_font('Arial', 'B', 10)
-            pdf.cell(0, 6, "Important Warnings:", ln=True)
+            pdf.cell(0, 6, WARNINGS_HEADING, ln=True)
             pdf.set_font('Arial', '', 9)
-            pdf.multi_cell(190, 5, wrap_text(f"- {warnings}", width=85))
+            pdf.multi_cell(190, 5, text.warnings)
         
         pdf.ln(8)  # Space between crops
-
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    pdf.output(tmp_file.name)
-    return tmp_file.name
@@ -0,0 +1,86 @@
+# Append-only store of farmer feedback used for incremental retraining
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_DB_PATH = os.getenv(
+    "KRISHIMITRA_FEEDBACK_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "feedback.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    pincode TEXT,
+    n REAL NOT NULL,
+    p REAL NOT NULL,
+    k REAL NOT NULL,
+    temperature REAL NOT NULL,
+    humidity REAL NOT NULL,
+    ph REAL NOT NULL,
+    rainfall REAL NOT NULL,
+    label TEXT NOT NULL
+)
+"""
+
+# One row, ("database_id", random uuid), written when the database is created
+META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+
+_lock = threading.Lock()
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path or DEFAULT_DB_PATH, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")  # readers (update_model.py) never block the app
+    conn.execute(SCHEMA)
+    conn.execute(META_SCHEMA)
+    return conn
+
+def record_feedback(features, chosen_crop, pincode=None, db_path=None):
+    """Append one submission: (N, P, K, temperature, humidity, ph, rainfall) and the crop chosen."""
+    if len(features) != 7:
+        raise ValueError("Feedback needs the 7 model features (N, P, K, temperature, humidity, ph, rainfall).")
+    row = (time.time(), pincode, *[float(v) for v in features], str(chosen_crop).lower())
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                cur = conn.execute(
+                    "INSERT INTO feedback (created_at, pincode, n, p, k, temperature, humidity, ph, rainfall, label) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+            return cur.lastrowid
+        finally:
+            conn.close()
+
+def fetch_feedback(since_id=0, db_path=None):
+    """Return (feature rows, labels, last id) for feedback recorded after ``since_id``."""
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT id, n, p, k, temperature, humidity, ph, rainfall, label FROM feedback "
+            "WHERE id > ? ORDER BY id",
+            (since_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if not rows:
+        return [], [], since_id
+    features = [list(r[1:8]) for r in rows]
+    labels = [r[8] for r in rows]
+    return features, labels, rows[-1][0]
+
+def database_id(db_path=None):
+    """Random id of this feedback database; a model stores it next to its feedback cursor,
+    so a cursor is never applied to a different (e.g. freshly created) database."""
+    conn = _connect(db_path)
+    try:
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('database_id', ?)", (uuid.uuid4().hex,))
+        return conn.execute("SELECT value FROM meta WHERE key = 'database_id'").fetchone()[0]
+    finally:
+        conn.close()
@@ -1,143 +1,27 @@
-# Fresh recommendation function - bypasses all caching
-import os
-import pandas as pd
-import numpy as np
-import requests
-import streamlit as st
-from datetime import datetime
+# Recommendations for a pincode - ranked per request, results shared through the result cache
+import logging
 
-def get_pincode_based_conditions(pincode):
-    """Generate fallback conditions based on pincode when API fails"""
-    if not pincode or not pincode.isdigit():
-        pincode = "110001"  # Default to Delhi
-    
-    pincode_num = int(pincode)
-    
-    # Create pincode-based variations for different regions
-    if pincode_num < 200000:  # North India
-        base_temp = 25 + (pincode_num % 15)  # 25-40°C
-        base_humidity = 50 + (pincode_num % 30)  # 50-80%
-        base_rainfall = 100 + (pincode_num % 200)  # 100-300mm
-        base_ph = 6.0 + (pincode_num % 20) / 10  # 6.0-8.0
-    elif pincode_num < 500000:  # West India
-        base_temp = 28 + (pincode_num % 12)  # 28-40°C
-        base_humidity = 40 + (pincode_num % 40)  # 40-80%
-        base_rainfall = 50 + (pincode_num % 150)  # 50-200mm
-        base_ph = 6.5 + (pincode_num % 15) / 10  # 6.5-8.0
-    elif pincode_num < 700000:  # South India
-        base_temp = 26 + (pincode_num % 10)  # 26-36°C
-        base_humidity = 60 + (pincode_num % 35)  # 60-95%
-        base_rainfall = 150 + (pincode_num % 250)  # 150-400mm
-        base_ph = 5.5 + (pincode_num % 25) / 10  # 5.5-8.0
-    else:  # East India
-        base_temp = 24 + (pincode_num % 14)  # 24-38°C
-        base_humidity = 55 + (pincode_num % 40)  # 55-95%
-        base_rainfall = 200 + (pincode_num % 300)  # 200-500mm
-        base_ph = 6.2 + (pincode_num % 18) / 10  # 6.2-8.0
-    
-    return {
-        'temperature': base_temp,
-        'humidity': base_humidity,
-        'rainfall': base_rainfall,
-        'ph': base_ph
-    }
+import climatology
+from cache_backend import data_version, shared_cache
+from scoring import CSV_PATH, load_crop_table, pincode_region, rank_crops
+from singleflight import SingleFlight
+from telemetry import span
 
-def get_fresh_crop_recommendations(pincode, land_area, budget):
-    """Get completely fresh crop recommendations - no caching"""
-    
-    print(f"[FRESH] Getting recommendations for PIN {pincode}")
-    
-    # Load the CSV dataset fresh
-    csv_path = os.path.join(os.path.dirname(__file__), "..", "Crop_recommendation.csv")
-    if not os.path.exists(csv_path):
-        csv_path = os.path.join(os.path.dirname(__file__), "Crop_recommendation.csv")
-    
-    try:
-        crop_df = pd.read_csv(csv_path)
-        print(f"[FRESH] Loaded {len(crop_df)} crop entries")
-    except Exception as e:
-        print(f"[FRESH] Error loading CSV: {e}")
-        return []
+logger = logging.getLogger("krishimitra")
 
-    if 'label' not in crop_df.columns:
-        return []
-    
-    # Get pincode conditions
-    pincode_conditions = get_pincode_based_conditions(pincode)
-    print(f"[FRESH] Conditions for {pincode}: {pincode_conditions}")
-    
-    def calculate_suitability_score(row):
-        """Calculate suitability - LOWER score is BETTER"""
-        # Percentage differences
-        temp_diff = abs(row['temperature'] - pincode_conditions['temperature']) / max(pincode_conditions['temperature'], 1) * 100
-        hum_diff = abs(row['humidity'] - pincode_conditions['humidity']) / max(pincode_conditions['humidity'], 1) * 100
-        rain_diff = abs(row['rainfall'] - pincode_conditions['rainfall']) / max(pincode_conditions['rainfall'], 1) * 100
-        ph_diff = abs(row['ph'] - pincode_conditions['ph']) / max(pincode_conditions['ph'], 1) * 100
-        
-        # Weighted score
-        base_score = (temp_diff * 4.0 + hum_diff * 3.0 + rain_diff * 3.0 + ph_diff * 2.0) / 12.0
-        
-        # Regional preferences
-        regional_bonus = 0
-        if pincode:
-            pincode_num = int(pincode) if pincode.isdigit() else 110001
-            crop_name = row['label'].lower()
-            
-            if pincode_num < 200000:  # North India
-                if crop_name in ['wheat', 'rice', 'maize', 'chickpea', 'lentil']:
-                    regional_bonus = -15
-                elif crop_name in ['cotton', 'sugarcane']:
-                    regional_bonus = -8
-                else:
-                    regional_bonus = 5
-                    
-            elif pincode_num < 500000:  # West India  
-                if crop_name in ['cotton', 'sugarcane', 'mungbean', 'blackgram']:
-                    regional_bonus = -15
-                elif crop_name in ['mango', 'grapes', 'pomegranate']:
-                    regional_bonus = -8
-                else:
-                    regional_bonus = 5
-                    
-            elif pincode_num < 700000:  # South India
-                if crop_name in ['rice', 'coconut', 'banana', 'coffee']:
-                    regional_bonus = -15
-                elif crop_name in ['papaya', 'orange', 'mango']:
-                    regional_bonus = -8
-                else:
-                    regional_bonus = 5
-                    
-            else:  # East India
-                if crop_name in ['rice', 'jute', 'lentil', 'chickpea']:
-                    regional_bonus = -15
-                elif crop_name in ['wheat', 'maize']:
-                    regional_bonus = -8
-                else:
-                    regional_bonus = 5
-        
-        return base_score + regional_bonus
-    
-    # Calculate scores
-    crop_df['suitability_score'] = crop_df.apply(calculate_suitability_score, axis=1)
-    
-    # Get best variety of each crop
-    best_crops = crop_df.groupby('label').apply(
-        lambda group: group.loc[group['suitability_score'].idxmin()]
-    ).reset_index(drop=True)
-    
-    # Sort by score (best first)
-    best_crops = best_crops.sort_values('suitability_score').head(10)
-    
-    print(f"[FRESH] Top 3 for PIN {pincode}:")
-    for i, (_, row) in enumerate(best_crops.head(3).iterrows(), 1):
-        print(f"[FRESH]   {i}. {row['label']}: Score {row['suitability_score']:.2f}")
-    
-    # Create recommendations
+# Identical requests arriving together (e.g. after an advisory broadcast) share one run
+RECOMMENDATION_FLIGHTS = SingleFlight()
+
+# Results only change with the dataset (part of the key), so this just bounds storage
+RECOMMENDATION_TTL = 24 * 3600
+
+def build_recommendations(best_crops, pincode, pincode_conditions, budget):
+    """Result dicts for the ranked crops (one per row of ``best_crops``)."""
     recommendations = []
     for _, row in best_crops.iterrows():
         crop_name = row['label']
         score = row['suitability_score']
-        
+    
         rec = {
             'name': crop_name,
             'roi': budget * 1.4,
@@ -157,8 +41,71 @@ def get_fresh_crop_recommendations(pincode, land_area, budget):
             'demand': 'High',
             'tips': [f"Suitable for PIN {pincode}", "Follow regional practices"],
             'warnings': ["Monitor weather conditions"],
-            'debug_score': score
+            'model_probability': row['model_proba'],
+            'debug_score': row['fused_score']
         }
         recommendations.append(rec)
-    
     return recommendations
+
+def get_fresh_crop_recommendations(pincode, land_area, budget, model_proba=None, weights=None, conditions=None):
+    """Rank crops for a pincode; uncached (coalesced_recommendations adds coalescing and the shared cache)
+
+    ``model_proba`` ({crop: probability}) is blended into the ranking with
+    ``weights`` (see scoring.DEFAULT_WEIGHTS); without it only the suitability
+    score and regional bonus are used. ``conditions`` ({temperature, humidity,
+    rainfall, ph}) are what the crops are scored against - pass live weather when
+    you have it; by default they're this month's climate normals for the pincode.
+    """
+    
+    try:
+        with span("dataset_load"):
+            crop_table = load_crop_table()
+    except Exception:
+        logger.exception("Error loading CSV")
+        return []
+    
+    # Live conditions from the caller, else climate normals (the pincode estimate only as a last resort)
+    pincode_conditions = conditions if conditions is not None else climatology.pincode_conditions([pincode])[0]
+    logger.debug("Conditions for %s: %s", pincode, pincode_conditions)
+    
+    # Score every variety, keep the best of each crop and sort (best first) in one pass
+    best_crops = rank_crops(
+        pincode_conditions,
+        model_proba=model_proba,
+        weights=weights,
+        top_k=10,
+        table=crop_table,
+        region=pincode_region(pincode),
+    )
+    
+    logger.debug("Top 3 for PIN %s: %s", pincode, list(best_crops['label'].head(3)))
+    
+    with span("build_results", pincode=pincode):
+        return build_recommendations(best_crops, pincode, pincode_conditions, budget)
+
+def coalesced_recommendations(pincode, land_area, budget, model_proba=None, weights=None, conditions=None):
+    """get_fresh_crop_recommendations, with concurrent identical requests waiting on one run
+    and results shared across worker processes through cache_backend.shared_cache().
+
+    Cached results are versioned by the dataset's content hash. The returned list is
+    shared by every caller that waited on it, so treat it as read-only.
+    """
+    # Rounded so nearby readings share an entry; the ranking uses the rounded values too,
+    # so a result depends only on its key, not on which caller happened to compute it
+    if conditions:
+        conditions = {k: round(v, 1) for k, v in conditions.items()}
+    key = (
+        str(pincode), land_area, budget,
+        sorted(model_proba.items()) if model_proba else None,
+        sorted(weights.items()) if weights else None,
+        sorted(conditions.items()) if conditions else None,
+    )
+
+    def compute():
+        # Empty results (e.g. the dataset failed to load) are returned but not cached
+        return shared_cache().get_or_compute(
+            "recommendations", key,
+            lambda: get_fresh_crop_recommendations(pincode, land_area, budget, model_proba, weights, conditions) or None,
+            ttl=RECOMMENDATION_TTL, version=data_version(CSV_PATH)) or []
+
+    return RECOMMENDATION_FLIGHTS.do(repr(key), compute)
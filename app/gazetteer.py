@@ -0,0 +1,95 @@
+# Offline pincode gazetteer - pincode -> coordinates, district and state without the network
+import logging
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from pincode_index import STATE_COORDS, UNKNOWN, classify_pincodes, pin_index, pincode_numbers
+
+logger = logging.getLogger("krishimitra")
+
+# Built by build_gazetteer.py: sorted uint32 "keys", float32 "lat"/"lon", and per-key
+# indexes into the "districts"/"states" name arrays
+GAZETTEER_PATH = os.getenv("KRISHIMITRA_GAZETTEER") or os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "data", "pincode_gazetteer.npz"))
+
+# India has ~19k pincodes; a much smaller gazetteer is the shipped city seed, so most
+# lookups will still go to the network geocoder
+FULL_COVERAGE = 10000
+BUILD_COMMAND = "python build_gazetteer.py all_india_pincode_directory.csv data/pincode_seed.csv"
+
+@lru_cache(maxsize=2)
+def load_gazetteer(path=GAZETTEER_PATH, mtime=None):
+    """Load the gazetteer arrays once per file version (pass the mtime to reload on change)."""
+    with np.load(path) as data:
+        gaz = {name: data[name] for name in data.files}
+    if np.any(np.diff(gaz["keys"].astype(np.int64)) <= 0):
+        raise ValueError(f"{path}: pincode keys must be sorted and unique")
+    for values in gaz.values():
+        values.setflags(write=False)
+    if len(gaz["keys"]) < FULL_COVERAGE:
+        logger.warning("Offline gazetteer %s has only %d pincodes; the rest are geocoded online. "
+                       "Build the full table with: %s", path, len(gaz["keys"]), BUILD_COMMAND)
+    else:
+        logger.info("Offline gazetteer: %d pincodes from %s", len(gaz["keys"]), path)
+    return gaz
+
+@lru_cache(maxsize=2)
+def _warn_missing(path):
+    logger.warning("Offline gazetteer %s not found; every pincode is geocoded online. Build it with: %s",
+                   path, BUILD_COMMAND)
+
+def gazetteer(path=GAZETTEER_PATH):
+    """The bundled gazetteer, or None when the file isn't there."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        _warn_missing(path)
+        return None
+    return load_gazetteer(path, mtime)
+
+def _positions(gaz, pincodes):
+    numbers = pincode_numbers(pincodes).astype(np.uint32)
+    keys = gaz["keys"]
+    pos = np.minimum(np.searchsorted(keys, numbers), len(keys) - 1)
+    found = (keys[pos] == numbers) & (numbers > 0)
+    return pos, found
+
+def lookup_coordinates(pincodes, gaz=None):
+    """Bulk lookup: (lat, lon, found) arrays, lat/lon NaN where a pincode isn't in the gazetteer."""
+    gaz = gaz or gazetteer()
+    shape = np.shape(pincodes)
+    if gaz is None or not len(gaz["keys"]):
+        return np.full(shape, np.nan, np.float32), np.full(shape, np.nan, np.float32), np.zeros(shape, bool)
+    pos, found = _positions(gaz, pincodes)
+    lat = np.where(found, gaz["lat"][pos], np.float32(np.nan))
+    lon = np.where(found, gaz["lon"][pos], np.float32(np.nan))
+    return lat, lon, found
+
+def approximate_coordinates(pincodes, gaz=None):
+    """Bulk (lat, lon): the gazetteer position, else the capital of the pincode's state; NaN if neither."""
+    lat, lon, found = lookup_coordinates(pincodes, gaz)
+    if found.all():
+        return lat, lon
+    states = pin_index()["states"]
+    capitals = np.array([STATE_COORDS[s] for s in states] + [(np.nan, np.nan)], dtype=np.float32)
+    state, _ = classify_pincodes(pincodes)
+    fallback = capitals[np.where(state == UNKNOWN, len(states), state)]
+    return np.where(found, lat, fallback[..., 0]), np.where(found, lon, fallback[..., 1])
+
+def locate(pincode, gaz=None):
+    """{'lat', 'lon', 'district', 'state'} for one pincode, or None if it isn't in the gazetteer."""
+    gaz = gaz or gazetteer()
+    if gaz is None or not len(gaz["keys"]):
+        return None
+    pos, found = _positions(gaz, [str(pincode)])
+    if not found[0]:
+        return None
+    i = pos[0]
+    return {
+        "lat": round(float(gaz["lat"][i]), 5),  # float32 holds ~1 m precision
+        "lon": round(float(gaz["lon"][i]), 5),
+        "district": str(gaz["districts"][gaz["district"][i]]),
+        "state": str(gaz["states"][gaz["state"][i]]),
+    }
@@ -0,0 +1,192 @@
+# Crop image lookup, verification, thumbnails and placeholder rendering
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+logger = logging.getLogger("krishimitra")
+
+IMAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "images"))
+# In order of preference when a crop has more than one file
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Longest edge of the thumbnails served to the UI (shown at width=300)
+THUMBNAIL_SIZE = int(os.getenv("KRISHIMITRA_THUMBNAIL_SIZE", "300"))
+THUMBNAIL_QUALITY = 85
+
+# data: encoded JPEG bytes, digest: sha1 of the source file (stable id for the bytes)
+Thumbnail = namedtuple("Thumbnail", ["data", "digest", "width", "height"])
+
+# images_dir -> (directory mtime, {normalized crop name: path})
+_index = {}
+_index_lock = threading.Lock()
+
+def _normalize(name):
+    return name.strip().lower().replace(' ', '_')
+
+def _scan(images_dir):
+    found = {}
+    rank = {ext: i for i, ext in enumerate(IMAGE_EXTENSIONS)}
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            ext = ext.lower()
+            if ext not in rank or not entry.is_file():
+                continue
+            key = _normalize(stem)
+            if key not in found or rank[ext] < rank[os.path.splitext(found[key])[1].lower()]:
+                found[key] = entry.path
+    return found
+
+def image_index(images_dir=IMAGES_DIR):
+    """Case-insensitive {crop name: image path} map from one directory scan.
+
+    Rescanned only when the directory's mtime changes (a file added, removed or
+    renamed), so lookups cost a single stat.
+    """
+    images_dir = str(images_dir)
+    try:
+        mtime = os.stat(images_dir).st_mtime
+    except OSError:
+        return {}
+    cached = _index.get(images_dir)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _index_lock:
+        cached = _index.get(images_dir)
+        if not cached or cached[0] != mtime:
+            cached = (mtime, _scan(images_dir))
+            _index[images_dir] = cached
+    return cached[1]
+
+def find_crop_image(crop_name, images_dir=IMAGES_DIR):
+    """Return the image path for a crop, or None if there is no file for it."""
+    return image_index(images_dir).get(_normalize(crop_name))
+
+def image_count(images_dir=IMAGES_DIR):
+    """Number of crops with an image file."""
+    return len(image_index(images_dir))
+
+def make_thumbnail(raw, size=THUMBNAIL_SIZE):
+    """Decode image bytes and return (jpeg_bytes, width, height) scaled to fit ``size``."""
+    from PIL import Image as PILImage
+    with PILImage.open(io.BytesIO(raw)) as img:
+        img.load()  # full decode - catches truncated files that verify() lets through
+        img = img.convert("RGB")
+        img.thumbnail((size, size))
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return out.getvalue(), img.width, img.height
+
+@lru_cache(maxsize=64)
+def _build_thumbnail(path, mtime, size):
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        data, width, height = make_thumbnail(raw, size)
+        return Thumbnail(data, hashlib.sha1(raw).hexdigest(), width, height)
+    except Exception as e:
+        logger.warning(f"Thumbnail error for {os.path.basename(path)}: {e}")
+        return None
+
+def get_thumbnail(path, size=THUMBNAIL_SIZE):
+    """Decoded, downsized JPEG bytes for an image, built once per file version; None if unreadable."""
+    return _build_thumbnail(str(path), os.path.getmtime(path), size)
+
+def crop_thumbnail(crop_name, images_dir=IMAGES_DIR, size=THUMBNAIL_SIZE):
+    """Thumbnail for a crop's image, or None when it has no usable image."""
+    path = find_crop_image(crop_name, images_dir)
+    return get_thumbnail(path, size) if path else None
+
+def inspect_image(path):
+    """Fully decode one image file; returns a report dict (safe to call from worker processes)."""
+    from PIL import Image as PILImage
+    report = {"file": os.path.basename(path), "ok": False, "error": None}
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        report["bytes"] = len(raw)
+        report["sha256"] = hashlib.sha256(raw).hexdigest()
+        with PILImage.open(io.BytesIO(raw)) as img:
+            img.verify()
+        with PILImage.open(io.BytesIO(raw)) as img:
+            img.load()
+            report["width"], report["height"] = img.size
+        report["ok"] = True
+    except Exception as e:
+        report["error"] = str(e)
+    return report
+
+# Colours and captions for generated placeholder images
+PLACEHOLDER_THEMES = {
+    'blackgram': {'bg': '#2F2F2F', 'primary': '#FFFFFF', 'secondary': '#D3D3D3', 'desc': 'High-protein black lentil'},
+    'chickpea': {'bg': '#F5F5DC', 'primary': '#8B4513', 'secondary': '#DAA520', 'desc': 'Nutritious chickpea variety'},
+    'cotton': {'bg': '#FFFFFF', 'primary': '#4682B4', 'secondary': '#87CEEB', 'desc': 'White fiber cash crop'},
+    'lentil': {'bg': '#CD853F', 'primary': '#FFFFFF', 'secondary': '#F5DEB3', 'desc': 'Essential pulse crop'},
+    'mango': {'bg': '#FFD700', 'primary': '#FF6B35', 'secondary': '#FFA500', 'desc': 'Tropical mango tree'},
+    'mothbeans': {'bg': '#FFF8DC', 'primary': '#6B4423', 'secondary': '#CD853F', 'desc': 'Drought-resistant beans'},
+    'mungbean': {'bg': '#F0FFF0', 'primary': '#006400', 'secondary': '#32CD32', 'desc': 'Green gram variety'},
+    'muskmelon': {'bg': '#FFFACD', 'primary': '#FFA500', 'secondary': '#FFD700', 'desc': 'Sweet melon fruit'},
+    'pigeonpeas': {'bg': '#F0F8FF', 'primary': '#4682B4', 'secondary': '#87CEEB', 'desc': 'Traditional pigeon peas'},
+}
+DEFAULT_PLACEHOLDER_THEME = {'bg': '#F0F8FF', 'primary': '#2E8B57', 'secondary': '#98FB98', 'desc': 'Agricultural crop variety'}
+
+def _font(size):
+    from PIL import ImageFont
+    for name in ("DejaVuSans-Bold.ttf", "arial.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 has a single fixed-size default font
+        return ImageFont.load_default()
+
+def render_placeholder(crop_name, size=(800, 600), fmt="JPEG"):
+    """Draw a themed placeholder card for a crop and return the encoded image bytes."""
+    from PIL import Image as PILImage, ImageDraw
+    width, height = size
+    theme = PLACEHOLDER_THEMES.get(crop_name.lower(), DEFAULT_PLACEHOLDER_THEME)
+    img = PILImage.new('RGB', size, theme['bg'])
+    draw = ImageDraw.Draw(img)
+
+    # Decorative circles, then centred name / subtitle / description / footer
+    step = max(width // 10, 1)
+    for i in range(0, width, step):
+        for j in range(0, height, step):
+            if (i + j) % (2 * step) == 0:
+                draw.ellipse([(i + step // 8, j + step // 8), (i + step * 3 // 8, j + step * 3 // 8)],
+                             outline=theme['secondary'], width=2)
+
+    lines = [
+        (crop_name.replace('_', ' ').title(), height * 5 // 12, height // 11, theme['primary']),
+        ("Agricultural Crop", height * 5 // 9, height // 19, theme['secondary']),
+        (theme['desc'], height * 5 // 8, height // 25, theme['primary']),
+        ("KrishiMitra AI • Crop Image", height * 13 // 15, height // 25, theme['secondary']),
+    ]
+    for text, y, font_size, color in lines:
+        font = _font(font_size)
+        left, _, right, _ = draw.textbbox((0, 0), text, font=font)
+        draw.text(((width - (right - left)) // 2, y), text, fill=color, font=font)
+    draw.rectangle([(15, 15), (width - 15, height - 15)], outline=theme['primary'], width=4)
+
+    out = io.BytesIO()
+    img.save(out, format=fmt, quality=90, optimize=True)
+    return out.getvalue()
+
+# Rendered at 2x the on-screen width (300px) so placeholders stay sharp
+PLACEHOLDER_SIZE = (600, 400)
+
+@lru_cache(maxsize=64)
+def crop_placeholder(crop_name, size=PLACEHOLDER_SIZE):
+    """PNG placeholder card for a crop, rendered once per process."""
+    return render_placeholder(crop_name, size, fmt="PNG")
+
+def crop_image_bytes(crop_name, images_dir=IMAGES_DIR):
+    """Image bytes to show for a crop: its cached thumbnail, or its cached placeholder."""
+    thumbnail = crop_thumbnail(crop_name, images_dir)
+    return thumbnail.data if thumbnail else crop_placeholder(crop_name.lower())
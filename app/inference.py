@@ -0,0 +1,114 @@
+# Model inference helpers with a bounded prediction cache
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from singleflight import SingleFlight
+
+# Feature order used during model training - must match train_model.py
+FEATURE_ORDER = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+
+# Decimal places kept per feature when building cache keys: N/P/K come from integer
+# sliders, pH from a 0.1-step slider, and weather is compared at the 0.1 resolution
+# used by the suitability scoring
+FEATURE_DECIMALS = (0, 0, 0, 1, 1, 1, 1)
+
+def quantize_features(values):
+    """Round a 7-feature vector to slider/scoring granularity so repeats share a key."""
+    return tuple(round(float(v), d) for v, d in zip(values, FEATURE_DECIMALS))
+
+def _predict_proba(model, key):
+    # Forests fitted on a DataFrame warn when given bare arrays, so keep the names
+    if hasattr(model, "feature_names_in_"):
+        import pandas as pd
+        X = pd.DataFrame([key], columns=FEATURE_ORDER)
+    else:
+        import numpy as np
+        X = np.asarray([key], dtype=np.float64)
+    return model.predict_proba(X)[0]
+
+class PredictionCache:
+    """Thread-safe LRU of class probabilities keyed on the quantized feature vector.
+
+    Concurrent misses for the same key wait on one prediction.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+
+    def predict_proba(self, model, values):
+        key = (id(model), quantize_features(values))
+        with self._lock:
+            proba = self._entries.get(key)
+            if proba is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return proba
+            self.misses += 1
+        return self._flights.do(key, self._predict, model, key)
+
+    def _predict(self, model, key):
+        proba = _predict_proba(model, key[1])
+        proba.setflags(write=False)  # shared between callers
+        with self._lock:
+            self._entries[key] = proba
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return proba
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "coalesced": self._flights.coalesced,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+PREDICTION_CACHE = PredictionCache(int(os.getenv("KRISHIMITRA_PREDICTION_CACHE_SIZE", "4096")))
+
+def predict_proba_cached(model, values):
+    """Class probabilities for one (N, P, K, temperature, humidity, ph, rainfall) vector."""
+    return PREDICTION_CACHE.predict_proba(model, values)
+
+def resolve_model_path():
+    """Model file to serve: crop_model.pkl, or the distilled crop_model_lite.pkl when
+    KRISHIMITRA_MODEL_VARIANT=lite. Looked up in app/ first, then the repo root."""
+    variant = os.getenv("KRISHIMITRA_MODEL_VARIANT", "full").lower()
+    filename = "crop_model_lite.pkl" if variant == "lite" else "crop_model.pkl"
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(app_dir, filename)
+    if not os.path.exists(path):
+        path = os.path.join(os.path.dirname(app_dir), filename)
+    return path
+
+@lru_cache(maxsize=2)
+def load_model_bundle(model_path, model_mtime=None):
+    """Unpickle a model bundle once per file version; shared by the app and warm-up."""
+    import joblib
+    bundle = joblib.load(model_path)
+    PREDICTION_CACHE.clear()
+    return bundle
+
+def proba_by_label(model, encoder, proba):
+    """Map a probability vector onto crop names, or None when no encoder is available."""
+    if encoder is None or proba is None:
+        return None
+    labels = encoder.inverse_transform(model.classes_)
+    return {str(label): float(p) for label, p in zip(labels, proba)}
@@ -0,0 +1,166 @@
+# Pincode classification - postal circle / state and agro-climatic zone by PIN prefix
+from functools import lru_cache
+
+import numpy as np
+
+# Planning Commission agro-climatic regions
+AGRO_CLIMATIC_ZONES = [
+    "Western Himalayan", "Eastern Himalayan", "Lower Gangetic Plains", "Middle Gangetic Plains",
+    "Upper Gangetic Plains", "Trans-Gangetic Plains", "Eastern Plateau and Hills",
+    "Central Plateau and Hills", "Western Plateau and Hills", "Southern Plateau and Hills",
+    "East Coast Plains and Hills", "West Coast Plains and Ghats", "Gujarat Plains and Hills",
+    "Western Dry Region", "Island Region",
+]
+
+# Postal zone by first PIN digit
+POSTAL_ZONES = {1: "Northern", 2: "Northern", 3: "Western", 4: "Western", 5: "Southern",
+                6: "Southern", 7: "Eastern", 8: "Eastern", 9: "Army Postal Service"}
+
+# State / UT -> (latitude, longitude) of its capital, used as a coarse location
+STATE_COORDS = {
+    "Delhi": (28.6139, 77.2090), "Haryana": (30.7333, 76.7794), "Punjab": (30.7333, 76.7794),
+    "Chandigarh": (30.7333, 76.7794), "Himachal Pradesh": (31.1048, 77.1734),
+    "Jammu and Kashmir": (34.0837, 74.7973), "Ladakh": (34.1526, 77.5771),
+    "Uttar Pradesh": (26.8467, 80.9462), "Uttarakhand": (30.3165, 78.0322),
+    "Rajasthan": (26.9124, 75.7873), "Gujarat": (23.0225, 72.5714), "Maharashtra": (19.0760, 72.8777),
+    "Goa": (15.4909, 73.8278), "Madhya Pradesh": (23.2599, 77.4126), "Chhattisgarh": (21.2514, 81.6296),
+    "Telangana": (17.3850, 78.4867), "Andhra Pradesh": (16.5062, 80.6480), "Karnataka": (12.9716, 77.5946),
+    "Tamil Nadu": (13.0827, 80.2707), "Kerala": (8.5241, 76.9366), "West Bengal": (22.5726, 88.3639),
+    "Sikkim": (27.3389, 88.6065), "Andaman and Nicobar Islands": (11.6234, 92.7265),
+    "Odisha": (20.2961, 85.8245), "Assam": (26.1445, 91.7362), "Arunachal Pradesh": (27.0844, 93.6053),
+    "Meghalaya": (25.5788, 91.8933), "Manipur": (24.8170, 93.9368), "Mizoram": (23.7271, 92.7176),
+    "Nagaland": (25.6751, 94.1086), "Tripura": (23.8315, 91.2868), "Bihar": (25.5941, 85.1376),
+    "Jharkhand": (23.3441, 85.3096),
+}
+
+# (first 3 PIN digits, state / circle, agro-climatic zone) - each range runs up to the
+# next entry's prefix. None marks unallotted ranges and the Army Postal Service.
+# Zones are assigned per state, so border districts may be approximate
+PIN_RANGES = [
+    ("100", None, None),
+    ("110", "Delhi", "Trans-Gangetic Plains"),
+    ("120", "Haryana", "Trans-Gangetic Plains"),
+    ("137", None, None),
+    ("140", "Punjab", "Trans-Gangetic Plains"),
+    ("160", "Chandigarh", "Trans-Gangetic Plains"),
+    ("161", None, None),
+    ("171", "Himachal Pradesh", "Western Himalayan"),
+    ("178", None, None),
+    ("180", "Jammu and Kashmir", "Western Himalayan"),
+    ("194", "Ladakh", "Western Himalayan"),
+    ("195", None, None),
+    ("201", "Uttar Pradesh", "Upper Gangetic Plains"),
+    ("221", "Uttar Pradesh", "Middle Gangetic Plains"),
+    ("230", "Uttar Pradesh", "Upper Gangetic Plains"),
+    ("246", "Uttarakhand", "Western Himalayan"),
+    ("250", "Uttar Pradesh", "Upper Gangetic Plains"),
+    ("262", "Uttarakhand", "Western Himalayan"),
+    ("264", "Uttar Pradesh", "Middle Gangetic Plains"),
+    ("286", None, None),
+    ("301", "Rajasthan", "Western Dry Region"),
+    ("346", None, None),
+    ("360", "Gujarat", "Gujarat Plains and Hills"),
+    ("397", None, None),
+    ("400", "Maharashtra", "Western Plateau and Hills"),
+    ("403", "Goa", "West Coast Plains and Ghats"),
+    ("404", "Maharashtra", "Western Plateau and Hills"),
+    ("446", None, None),
+    ("450", "Madhya Pradesh", "Central Plateau and Hills"),
+    ("489", None, None),
+    ("490", "Chhattisgarh", "Eastern Plateau and Hills"),
+    ("498", None, None),
+    ("500", "Telangana", "Southern Plateau and Hills"),
+    ("510", None, None),
+    ("515", "Andhra Pradesh", "East Coast Plains and Hills"),
+    ("536", None, None),
+    ("560", "Karnataka", "Southern Plateau and Hills"),
+    ("592", None, None),
+    ("600", "Tamil Nadu", "East Coast Plains and Hills"),
+    ("644", None, None),
+    ("670", "Kerala", "West Coast Plains and Ghats"),
+    ("696", None, None),
+    ("700", "West Bengal", "Lower Gangetic Plains"),
+    ("737", "Sikkim", "Eastern Himalayan"),
+    ("738", "West Bengal", "Lower Gangetic Plains"),
+    ("744", "Andaman and Nicobar Islands", "Island Region"),
+    ("745", None, None),
+    ("751", "Odisha", "East Coast Plains and Hills"),
+    ("771", None, None),
+    ("781", "Assam", "Eastern Himalayan"),
+    ("789", None, None),
+    ("790", "Arunachal Pradesh", "Eastern Himalayan"),
+    ("793", "Meghalaya", "Eastern Himalayan"),
+    ("795", "Manipur", "Eastern Himalayan"),
+    ("796", "Mizoram", "Eastern Himalayan"),
+    ("797", "Nagaland", "Eastern Himalayan"),
+    ("799", "Tripura", "Eastern Himalayan"),
+    ("800", "Bihar", "Middle Gangetic Plains"),
+    ("813", "Jharkhand", "Eastern Plateau and Hills"),
+    ("817", "Bihar", "Middle Gangetic Plains"),
+    ("822", "Jharkhand", "Eastern Plateau and Hills"),
+    ("823", "Bihar", "Middle Gangetic Plains"),
+    ("825", "Jharkhand", "Eastern Plateau and Hills"),
+    ("836", None, None),
+    ("841", "Bihar", "Middle Gangetic Plains"),
+    ("856", None, None),
+]
+
+UNKNOWN = -1
+
+@lru_cache(maxsize=1)
+def pin_index():
+    """PIN_RANGES compiled to sorted lower bounds plus per-range state and zone codes."""
+    states = sorted({state for _, state, _ in PIN_RANGES if state})
+    bounds = np.array([int(prefix) * 1000 for prefix, _, _ in PIN_RANGES], dtype=np.uint32)
+    if np.any(np.diff(bounds.astype(np.int64)) <= 0):
+        raise ValueError("PIN_RANGES must be sorted by prefix without duplicates")
+    index = {
+        "bounds": bounds,
+        "states": states,
+        "state": np.array([states.index(s) if s else UNKNOWN for _, s, _ in PIN_RANGES], dtype=np.int16),
+        "zone": np.array([AGRO_CLIMATIC_ZONES.index(z) if z else UNKNOWN for _, _, z in PIN_RANGES],
+                         dtype=np.int8),
+    }
+    for values in index.values():
+        if isinstance(values, np.ndarray):
+            values.setflags(write=False)
+    return index
+
+def pincode_numbers(pincodes):
+    """Pincodes (strings or ints) as an int64 array; anything that isn't a 6-digit PIN becomes 0."""
+    values = np.asarray(pincodes)
+    if values.dtype.kind in "iu":
+        numbers = values.astype(np.int64)
+    else:
+        # Read the digits straight from the UCS-4 code points: a 7th character means too long
+        codes = values.astype(str).astype("U7").view(np.uint32).reshape(values.shape + (7,))
+        digits = codes[..., :6].astype(np.int64) - ord("0")
+        valid = (codes[..., 6] == 0) & np.all((digits >= 0) & (digits <= 9), axis=-1)
+        numbers = np.where(valid, digits @ (10 ** np.arange(5, -1, -1)), 0)
+    numbers[(numbers < 100000) | (numbers > 999999)] = 0
+    return numbers
+
+def classify_pincodes(pincodes):
+    """Vectorized lookup: (state codes, agro-climatic zone codes), UNKNOWN (-1) where unallotted.
+
+    Codes index pin_index()["states"] and AGRO_CLIMATIC_ZONES. One searchsorted over the
+    range bounds, so millions of pincodes classify in well under a second.
+    """
+    index = pin_index()
+    numbers = pincode_numbers(pincodes)
+    slot = np.searchsorted(index["bounds"], numbers, side="right") - 1
+    known = slot >= 0
+    slot = np.where(known, slot, 0)
+    state = np.where(known, index["state"][slot], UNKNOWN)
+    zone = np.where(known, index["zone"][slot], UNKNOWN)
+    return state, zone
+
+def lookup_pincode(pincode):
+    """{'state', 'agro_zone', 'postal_zone'} for one pincode; None for anything unknown."""
+    state, zone = classify_pincodes([str(pincode)])
+    number = int(pincode_numbers([str(pincode)])[0])
+    return {
+        "state": pin_index()["states"][state[0]] if state[0] != UNKNOWN else None,
+        "agro_zone": AGRO_CLIMATIC_ZONES[zone[0]] if zone[0] != UNKNOWN else None,
+        "postal_zone": POSTAL_ZONES.get(number // 100000) if number else None,
+    }
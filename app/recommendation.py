@@ -1,55 +1,50 @@
 
 
 # Crop recommendation logic with OpenWeather API integration
-import os
+import logging
+
 import pandas as pd
 import numpy as np
-import requests
 import streamlit as st
 from datetime import datetime
 
+from climatology import climate_conditions
+from gazetteer import locate
+from image_assets import find_crop_image
+from pincode_index import STATE_COORDS, lookup_pincode
+from scoring import get_pincode_based_conditions, load_crop_table, pincode_region, rank_crops, region_info
+from telemetry import span
+from weather_cache import cached_weather
+
+logger = logging.getLogger("krishimitra")
+
+# Fallback location per scoring.REGIONS entry, for PINs outside the allotted ranges
+REGION_CENTRES = [
+    (30.7333, 76.7794),  # North India: Chandigarh
+    (19.0760, 72.8777),  # West India: Mumbai
+    (12.9716, 77.5946),  # South India: Bangalore
+    (22.5726, 88.3639),  # East India: Kolkata
+]
+
 def get_lat_lon(pincode):
-    """Get latitude and longitude from pincode using a simple mapping"""
-    # Simple pincode to coordinates mapping for major Indian cities
-    pincode_coords = {
-        "110001": (28.6139, 77.2090),  # Delhi
-        "400001": (19.0760, 72.8777),  # Mumbai
-        "600001": (13.0827, 80.2707),  # Chennai
-        "700001": (22.5726, 88.3639),  # Kolkata
-        "560001": (12.9716, 77.5946),  # Bangalore
-        "380001": (23.0225, 72.5714),  # Ahmedabad
-        "500001": (17.3850, 78.4867),  # Hyderabad
-        "411001": (18.5204, 73.8567),  # Pune
-        "302001": (26.9124, 75.7873),  # Jaipur
-        "110017": (28.5355, 77.3910),  # Gurgaon
-        "400051": (19.2183, 72.9781),  # Thane
-        "600034": (13.0827, 80.2707),  # Chennai
-        "700091": (22.5726, 88.3639),  # Kolkata
-        "560025": (12.9716, 77.5946),  # Bangalore
-        "380015": (23.0225, 72.5714),  # Ahmedabad
-        "500032": (17.3850, 78.4867),  # Hyderabad
-        "411005": (18.5204, 73.8567),  # Pune
-        "302016": (26.9124, 75.7873),  # Jaipur
-    }
-    
-    # If exact pincode not found, use regional mapping
-    if pincode in pincode_coords:
-        return pincode_coords[pincode]
-    
-    # Regional fallback based on pincode ranges
-    pincode_num = int(pincode) if pincode.isdigit() else 110001
-    
-    if pincode_num < 200000:  # North India
-        return (30.7333, 76.7794)  # Chandigarh
-    elif pincode_num < 400000:  # West India
-        return (19.0760, 72.8777)  # Mumbai
-    elif pincode_num < 600000:  # South India
-        return (12.9716, 77.5946)  # Bangalore
-    else:  # East India
-        return (22.5726, 88.3639)  # Kolkata
+    """Get latitude and longitude for a pincode offline: gazetteer, then state capital, then region"""
+    location = locate(pincode) if pincode else None
+    if location:
+        return location["lat"], location["lon"]
+    logger.debug("PIN %s isn't in the offline gazetteer; using its state capital or region centre", pincode)
+    state = lookup_pincode(pincode)["state"]
+    if state:
+        return STATE_COORDS[state]
+    return REGION_CENTRES[pincode_region(pincode or "110001")]
 
 def get_weather_data(lat, lon, api_key):
-    """Get weather data from OpenWeather API"""
+    """Get weather data from OpenWeather API, shared by every pincode in the same geohash tile"""
+    return cached_weather(lat, lon, lambda tile_lat, tile_lon: fetch_current_weather(tile_lat, tile_lon, api_key),
+                          kind="current")
+
+def fetch_current_weather(lat, lon, api_key):
+    """One current-weather call, or None on failure"""
+    import requests
     try:
         url = f"http://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=metric"
         response = requests.get(url, timeout=10)
@@ -63,48 +58,12 @@ def get_weather_data(lat, lon, api_key):
                 'description': data['weather'][0]['description']
             }
         else:
-            print(f"Weather API error: {response.status_code}")
+            logger.warning("Weather API error: %s", response.status_code)
         return None
     except Exception as e:
-        print(f"Failed to fetch weather data: {str(e)}")
+        logger.warning("Failed to fetch weather data: %s", e)
         return None
 
-def get_pincode_based_conditions(pincode):
-    """Generate fallback conditions based on pincode when API fails"""
-    if not pincode or not pincode.isdigit():
-        pincode = "110001"  # Default to Delhi
-    
-    pincode_num = int(pincode)
-    
-    # Create pincode-based variations for different regions
-    if pincode_num < 200000:  # North India
-        base_temp = 25 + (pincode_num % 15)  # 25-40°C
-        base_humidity = 50 + (pincode_num % 30)  # 50-80%
-        base_rainfall = 100 + (pincode_num % 200)  # 100-300mm
-        base_ph = 6.0 + (pincode_num % 20) / 10  # 6.0-8.0
-    elif pincode_num < 400000:  # West India
-        base_temp = 28 + (pincode_num % 12)  # 28-40°C
-        base_humidity = 40 + (pincode_num % 40)  # 40-80%
-        base_rainfall = 50 + (pincode_num % 150)  # 50-200mm
-        base_ph = 6.5 + (pincode_num % 15) / 10  # 6.5-8.0
-    elif pincode_num < 600000:  # South India
-        base_temp = 26 + (pincode_num % 10)  # 26-36°C
-        base_humidity = 60 + (pincode_num % 35)  # 60-95%
-        base_rainfall = 150 + (pincode_num % 250)  # 150-400mm
-        base_ph = 5.5 + (pincode_num % 25) / 10  # 5.5-8.0
-    else:  # East India
-        base_temp = 24 + (pincode_num % 14)  # 24-38°C
-        base_humidity = 55 + (pincode_num % 40)  # 55-95%
-        base_rainfall = 200 + (pincode_num % 300)  # 200-500mm
-        base_ph = 6.2 + (pincode_num % 18) / 10  # 6.2-8.0
-    
-    return {
-        'temperature': base_temp,
-        'humidity': base_humidity,
-        'rainfall': base_rainfall,
-        'ph': base_ph
-    }
-
 def calculate_resilience_score(crop, pincode_conditions):
     """Calculate resilience based on crop and pincode conditions"""
     resilience_base = {
@@ -163,41 +122,31 @@ def get_sowing_window(crop, pincode_conditions):
             return f"Best sowing time: {datetime.now().strftime('%B')}-{datetime.now().replace(month=end).strftime('%B')}"
     return "Best sowing time: Next suitable season (check local calendar)"
 
-def get_crop_recommendations(model_prediction, land_area, budget, pincode=None, api_key=None):
-    """Get crop recommendations based on CSV dataset and real weather data from OpenWeather API"""
-    
-    # Clear debug: Print what we received
-    print(f"[DEBUG] === NEW RECOMMENDATION REQUEST ===")
-    print(f"[DEBUG] Pincode received: {pincode}")
-    print(f"[DEBUG] Model prediction: {model_prediction}")
-    print(f"[DEBUG] Budget: {budget}, Land: {land_area}")
-    
-    # IMPORTANT: Check if we're in pure pincode mode
-    pure_pincode_mode = (model_prediction == "PINCODE_BASED")
-    if pure_pincode_mode:
-        print(f"[DEBUG] PURE PINCODE MODE: Ignoring ML model, using only pincode {pincode}")
+def get_crop_recommendations(model_proba, land_area, budget, pincode=None, api_key=None, weights=None):
+    """Get crop recommendations based on CSV dataset and real weather data from OpenWeather API
+
+    ``model_proba`` is the model's {crop: probability} mapping (or None). It is
+    blended with the suitability score and regional bonus in a single ranking pass.
+    """
     
-    # Load the CSV dataset
-    csv_path = os.path.join(os.path.dirname(__file__), "..", "Crop_recommendation.csv")
-    if not os.path.exists(csv_path):
-        csv_path = os.path.join(os.path.dirname(__file__), "Crop_recommendation.csv")
+    logger.debug("Recommendation request: pincode=%s model_proba=%s budget=%s land=%s",
+                 pincode, model_proba is not None, budget, land_area)
     
+    # Load the CSV dataset (cached after the first call)
     try:
-        crop_df = pd.read_csv(csv_path)
-    except Exception as e:
-        print(f"Error loading CSV: {e}")
-        return []
-
-    # Ensure 'label' column exists
-    if 'label' not in crop_df.columns:
-        print("Error: CSV must have a 'label' column for crop names.")
+        with span("dataset_load"):
+            crop_table = load_crop_table()
+    except Exception:
+        logger.exception("Error loading CSV")
         return []
     
     # Try to get real weather data first
     weather_data = None
     if api_key and pincode:
-        lat, lon = get_lat_lon(pincode)
-        weather_data = get_weather_data(lat, lon, api_key)
+        with span("geocode", pincode=pincode):
+            lat, lon = get_lat_lon(pincode)
+        with span("weather", pincode=pincode):
+            weather_data = get_weather_data(lat, lon, api_key)
     
     # Use real weather data if available, otherwise fallback to pincode-based conditions
     if weather_data:
@@ -207,107 +156,33 @@ def get_crop_recommendations(model_prediction, land_area, budget, pincode=None,
             'rainfall': weather_data['rainfall'],
             'ph': 6.5  # Default pH since weather API doesn't provide this
         }
-        print(f"[DEBUG] Real weather data for {pincode}: {pincode_conditions}")
+        logger.debug("Real weather data for %s: %s", pincode, pincode_conditions)
     else:
-        pincode_conditions = get_pincode_based_conditions(pincode)
-        print(f"[DEBUG] Estimated conditions for {pincode}: {pincode_conditions}")
+        # Offline: this month's climate normals at the pincode's location, else the pincode estimate
+        pincode_conditions = climate_conditions(*get_lat_lon(pincode)) if pincode else None
+        if pincode_conditions:
+            logger.debug("Climate normals for %s: %s", pincode, pincode_conditions)
+        else:
+            pincode_conditions = get_pincode_based_conditions(pincode)
+            logger.debug("Estimated conditions for %s: %s", pincode, pincode_conditions)
 
-    def calculate_crop_suitability_score(row):
-        """Calculate how well a crop suits the pincode conditions - LOWER score is BETTER"""
-        # Calculate percentage differences (normalized scoring)
-        temp_diff = abs(row['temperature'] - pincode_conditions['temperature']) / max(pincode_conditions['temperature'], 1) * 100
-        hum_diff = abs(row['humidity'] - pincode_conditions['humidity']) / max(pincode_conditions['humidity'], 1) * 100
-        rain_diff = abs(row['rainfall'] - pincode_conditions['rainfall']) / max(pincode_conditions['rainfall'], 1) * 100
-        ph_diff = abs(row['ph'] - pincode_conditions['ph']) / max(pincode_conditions['ph'], 1) * 100
-        
-        # Weight factors - higher weight means more importance
-        temp_weight = 4.0    # Temperature is most critical
-        hum_weight = 3.0     # Humidity is very important
-        rain_weight = 3.0    # Rainfall is very important  
-        ph_weight = 2.0      # pH is important but less critical
-        
-        # Calculate weighted score
-        base_score = (temp_diff * temp_weight + hum_diff * hum_weight + 
-                     rain_diff * rain_weight + ph_diff * ph_weight) / (temp_weight + hum_weight + rain_weight + ph_weight)
-        
-        # Add regional preference bonus (negative = better match)
-        regional_bonus = 0
-        if pincode:
-            pincode_num = int(pincode) if pincode.isdigit() else 110001
-            crop_name = row['label'].lower()
-            
-            # Strong regional preferences - these crops are ideal for these regions
-            if pincode_num < 200000:  # North India (000001-199999)
-                if crop_name in ['wheat', 'rice', 'maize', 'chickpea', 'lentil', 'mustard', 'barley']:
-                    regional_bonus = -15  # Strong preference
-                elif crop_name in ['cotton', 'sugarcane', 'potato', 'onion']:
-                    regional_bonus = -8   # Good preference
-                elif crop_name in ['mango', 'apple', 'grapes']:
-                    regional_bonus = -3   # Moderate preference
-                else:
-                    regional_bonus = 5    # Less suitable
-                    
-            elif pincode_num < 500000:  # West India (200000-499999) - FIXED to include 400xxx
-                if crop_name in ['cotton', 'sugarcane', 'groundnut', 'mungbean', 'blackgram']:
-                    regional_bonus = -15  # Strong preference
-                elif crop_name in ['mango', 'grapes', 'pomegranate', 'watermelon', 'muskmelon']:
-                    regional_bonus = -8   # Good preference
-                elif crop_name in ['rice', 'wheat', 'maize']:
-                    regional_bonus = -3   # Moderate preference
-                else:
-                    regional_bonus = 5    # Less suitable
-                    
-            elif pincode_num < 700000:  # South India (500000-699999) - FIXED range
-                if crop_name in ['rice', 'coconut', 'banana', 'coffee']:
-                    regional_bonus = -15  # Strong preference
-                elif crop_name in ['papaya', 'orange', 'mango', 'sugarcane']:
-                    regional_bonus = -8   # Good preference
-                elif crop_name in ['maize', 'cotton', 'chickpea']:
-                    regional_bonus = -3   # Moderate preference
-                else:
-                    regional_bonus = 5    # Less suitable
-                    
-            else:  # East India (700000+) - FIXED range
-                if crop_name in ['rice', 'jute', 'potato', 'lentil', 'chickpea']:
-                    regional_bonus = -15  # Strong preference
-                elif crop_name in ['wheat', 'maize', 'sugarcane', 'banana']:
-                    regional_bonus = -8   # Good preference
-                elif crop_name in ['mango', 'coconut']:
-                    regional_bonus = -3   # Moderate preference
-                else:
-                    regional_bonus = 5    # Less suitable
-        
-        final_score = base_score + regional_bonus
-        return final_score
+    # Score every variety, keep the most suitable of each crop and sort best first.
+    # Limit to top 15 for better performance
+    top_crops = rank_crops(
+        pincode_conditions,
+        model_proba=model_proba,
+        weights=weights,
+        top_k=15,
+        table=crop_table,
+        region=pincode_region(pincode),
+    )
     
-    # Calculate suitability scores for all crop entries in the dataset
-    crop_df['suitability_score'] = crop_df.apply(calculate_crop_suitability_score, axis=1)
+    if logger.isEnabledFor(logging.DEBUG):
+        for _, row in top_crops.head(10).iterrows():
+            logger.debug("PIN %s: %s score %.2f (temp %.1f°C, humidity %.1f%%, rain %.1fmm, pH %.1f)",
+                         pincode, row['label'], row['fused_score'], row['temperature'],
+                         row['humidity'], row['rainfall'], row['ph'])
     
-    # Group by crop label and get the BEST (lowest score) entry for each crop
-    # This finds the most suitable variety of each crop for the given conditions
-    best_crop_varieties = crop_df.groupby('label').apply(
-        lambda group: group.loc[group['suitability_score'].idxmin()]
-    ).reset_index(drop=True)
-    
-    # Sort crops by suitability score (best matches first)
-    best_crop_varieties = best_crop_varieties.sort_values('suitability_score')
-    
-    # Select top crops for recommendations (limit to top 15 for better performance)
-    top_crops = best_crop_varieties.head(15)
-    
-    print(f"[DEBUG] Top 15 crops for PIN {pincode}:")
-    for _, row in top_crops.head(10).iterrows():
-        print(f"  {row['label']}: Score {row['suitability_score']:.2f} (Temp: {row['temperature']:.1f}°C, Humidity: {row['humidity']:.1f}%, Rain: {row['rainfall']:.1f}mm, pH: {row['ph']:.1f})")
-    
-    # Map crop label to image path if exists
-    image_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "images"))
-    def get_crop_image(label):
-        for ext in [".jpg", ".jpeg", ".png", ".webp"]:
-            img_path = os.path.join(image_dir, f"{label.lower()}{ext}")
-            if os.path.exists(img_path):
-                return img_path
-        return None
-
     def get_critical_months(sowing_window):
         # Try to extract months from sowing_window string
         import re
@@ -322,25 +197,16 @@ def get_crop_recommendations(model_prediction, land_area, budget, pincode=None,
     recommendations = []
     
     # Get regional information based on pincode
-    def get_regional_info(pincode):
-        if not pincode or not pincode.isdigit():
-            return "Unknown Region", "General recommendations"
-        
-        pincode_num = int(pincode)
-        if pincode_num < 200000:  # 000001-199999
-            return "North India", "Wheat, Rice, Sugarcane, Cotton are popular in this region"
-        elif pincode_num < 500000:  # 200000-499999 (FIXED: West India includes 400xxx)
-            return "West India", "Cotton, Sugarcane, Groundnut, Mango, Grapes are commonly grown here"
-        elif pincode_num < 700000:  # 500000-699999 (South India)
-            return "South India", "Rice, Coconut, Banana, Coffee thrive in this climate"
-        else:  # 700000+ (East India)
-            return "East India", "Rice, Jute, Potato, Mustard are traditional crops here"
-    
-    region_name, region_info = get_regional_info(pincode)
+    region_name, region_crops = region_info(pincode)
     
     # Show pincode-based conditions and regional information
     st.info(f"🌤️ Conditions for PIN {pincode}: Temperature {pincode_conditions['temperature']:.1f}°C, Humidity {pincode_conditions['humidity']:.1f}%, Rainfall {pincode_conditions['rainfall']:.1f}mm, pH {pincode_conditions['ph']:.1f}")
-    st.info(f"📍 Region: {region_name} - {region_info}")
+    location = lookup_pincode(pincode)
+    if location["state"]:
+        region_name_shown = f"{region_name} ({location['state']}, {location['agro_zone']} zone)"
+    else:
+        region_name_shown = region_name
+    st.info(f"📍 Region: {region_name_shown} - {region_crops}")
     
     # Enhanced crop tips and warnings based on regions
     def get_crop_tips(crop_name, region_name):
@@ -422,62 +288,64 @@ def get_crop_recommendations(model_prediction, land_area, budget, pincode=None,
         return warnings[:4]  # Limit to 4 warnings
     
     # Generate recommendations for top crops
-    for _, row in top_crops.head(10).iterrows():
-        crop_name = row['label']
-        investment = budget * 0.8
-        roi = calculate_roi(crop_name, budget, land_area)
-        profit = roi - investment
-        sowing_window = get_sowing_window(crop_name, pincode_conditions)
-        critical_months = get_critical_months(sowing_window)
+    with span("build_results", pincode=pincode):
+        for _, row in top_crops.head(10).iterrows():
+            crop_name = row['label']
+            investment = budget * 0.8
+            roi = calculate_roi(crop_name, budget, land_area)
+            profit = roi - investment
+            sowing_window = get_sowing_window(crop_name, pincode_conditions)
+            critical_months = get_critical_months(sowing_window)
         
-        # Determine suitability level based on score
-        score = row['suitability_score']
-        if score <= 5:
-            suitability = "Excellent"
-        elif score <= 15:
-            suitability = "Very Good"
-        elif score <= 25:
-            suitability = "Good"
-        elif score <= 40:
-            suitability = "Moderate"
-        else:
-            suitability = "Fair"
+            # Determine suitability level based on score
+            score = row['suitability_score']
+            if score <= 5:
+                suitability = "Excellent"
+            elif score <= 15:
+                suitability = "Very Good"
+            elif score <= 25:
+                suitability = "Good"
+            elif score <= 40:
+                suitability = "Moderate"
+            else:
+                suitability = "Fair"
         
-        rec = {
-            'name': crop_name,
-            'roi': roi,
-            'profit': profit,
-            'resilience': calculate_resilience_score(crop_name, pincode_conditions),
-            'investment': investment,
-            'harvest_time': 4,
-            'sowing_window': sowing_window,
-            'critical_months': critical_months,
-            'weather_impact': {
-                "Temperature": f"{row['temperature']:.1f}°C (crop needs) vs {pincode_conditions['temperature']:.1f}°C (your area)",
-                "Humidity": f"{row['humidity']:.1f}% (crop needs) vs {pincode_conditions['humidity']:.1f}% (your area)",
-                "Rainfall": f"{row['rainfall']:.1f}mm (crop needs) vs {pincode_conditions['rainfall']:.1f}mm (your area)",
-                "pH": f"{row['ph']:.1f} (crop needs) vs {pincode_conditions['ph']:.1f} (your area)",
-                "Suitability": f"{suitability} (Score: {score:.1f})"
-            },
-            'price_trend': 1.0,
-            'demand': 'High',
-            'land_preparation': ["General preparation"],
-            'water_requirements': ["General watering"],
-            'fertilizer_schedule': ["General fertilizer"],
-            'tips': get_crop_tips(crop_name, region_name),
-            'warnings': get_crop_warnings(crop_name, region_name),
-            'local_resources': ["General resources"],
-            'weather_forecast': pd.DataFrame(
-                np.random.randn(7, 2),
-                columns=['temperature', 'rainfall']
-            ),
-            'image': get_crop_image(crop_name),
-            'debug_score': score
-        }
-        recommendations.append(rec)
+            rec = {
+                'name': crop_name,
+                'roi': roi,
+                'profit': profit,
+                'resilience': calculate_resilience_score(crop_name, pincode_conditions),
+                'investment': investment,
+                'harvest_time': 4,
+                'sowing_window': sowing_window,
+                'critical_months': critical_months,
+                'weather_impact': {
+                    "Temperature": f"{row['temperature']:.1f}°C (crop needs) vs {pincode_conditions['temperature']:.1f}°C (your area)",
+                    "Humidity": f"{row['humidity']:.1f}% (crop needs) vs {pincode_conditions['humidity']:.1f}% (your area)",
+                    "Rainfall": f"{row['rainfall']:.1f}mm (crop needs) vs {pincode_conditions['rainfall']:.1f}mm (your area)",
+                    "pH": f"{row['ph']:.1f} (crop needs) vs {pincode_conditions['ph']:.1f} (your area)",
+                    "Suitability": f"{suitability} (Score: {score:.1f})"
+                },
+                'price_trend': 1.0,
+                'demand': 'High',
+                'land_preparation': ["General preparation"],
+                'water_requirements': ["General watering"],
+                'fertilizer_schedule': ["General fertilizer"],
+                'tips': get_crop_tips(crop_name, region_name),
+                'warnings': get_crop_warnings(crop_name, region_name),
+                'local_resources': ["General resources"],
+                'weather_forecast': pd.DataFrame(
+                    np.random.randn(7, 2),
+                    columns=['temperature', 'rainfall']
+                ),
+                'image': find_crop_image(crop_name),
+                'model_probability': row['model_proba'],
+                'debug_score': row['fused_score']
+            }
+            recommendations.append(rec)
     
     if not recommendations:
-        print("[DEBUG] No crops found. Showing top 3 closest crops.")
+        logger.debug("No crops found. Showing top 3 closest crops.")
         for _, row in top_crops.head(3).iterrows():
             crop_name = row['label']
             investment = budget * 0.8
@@ -511,7 +379,7 @@ def get_crop_recommendations(model_prediction, land_area, budget, pincode=None,
                     np.random.randn(7, 2),
                     columns=['temperature', 'rainfall']
                 ),
-                'image': get_crop_image(crop_name)
+                'image': find_crop_image(crop_name)
             }
             recommendations.append(rec)
 
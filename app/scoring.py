@@ -0,0 +1,216 @@
+# Fused crop ranking - suitability, regional preference and model probability in one pass
+import bisect
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from pincode_index import pincode_numbers
+from telemetry import span
+
+CSV_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Crop_recommendation.csv"))
+if not os.path.exists(CSV_PATH):
+    CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Crop_recommendation.csv")
+
+# Condition columns compared against the location (weighted 4/3/3/2 in suitability_scores:
+# temperature is most critical, pH least)
+CONDITION_COLUMNS = ["temperature", "humidity", "rainfall", "ph"]
+
+# Blend weights: suitability and regional bonus are in score points (lower is better),
+# "model" is the number of points a 100% confident model prediction is worth
+DEFAULT_WEIGHTS = {"suitability": 1.0, "regional": 1.0, "model": 20.0}
+
+def parse_weights(spec):
+    """Parse "suitability=1,regional=1,model=20" into a weights dict."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in (spec or "").split(","):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            name = name.strip()
+            if name not in DEFAULT_WEIGHTS:
+                raise ValueError(f"Unknown ranker weight '{name}'. Expected one of {sorted(DEFAULT_WEIGHTS)}.")
+            weights[name] = float(value)
+    return weights
+
+RANKER_WEIGHTS = parse_weights(os.getenv("KRISHIMITRA_RANKER_WEIGHTS"))
+
+# Regions by first PIN digit range: (key, display name, exclusive upper bound, typical crops).
+# The last region takes every PIN above the previous bound
+REGIONS = [
+    ("north", "North India", 200000, "Wheat, Rice, Sugarcane, Cotton are popular in this region"),
+    ("west", "West India", 500000, "Cotton, Sugarcane, Groundnut, Mango, Grapes are commonly grown here"),
+    ("south", "South India", 700000, "Rice, Coconut, Banana, Coffee thrive in this climate"),
+    ("east", "East India", None, "Rice, Jute, Potato, Mustard are traditional crops here"),
+]
+REGION_KEYS = [key for key, _, _, _ in REGIONS]
+_REGION_BOUNDS = [upper for _, _, upper, _ in REGIONS[:-1]]
+NO_REGION = len(REGIONS)  # no pincode given: no regional bonus
+
+# Regional preference bonus in score points (negative = better match) per region; crops a
+# region doesn't list get OTHER_CROP_BONUS. One table for every path (interactive, fresh, batch)
+REGION_RULES = {
+    "north": {-15: ['wheat', 'rice', 'maize', 'chickpea', 'lentil', 'mustard', 'barley'],
+              -8: ['cotton', 'sugarcane', 'potato', 'onion'],
+              -3: ['mango', 'apple', 'grapes']},
+    "west": {-15: ['cotton', 'sugarcane', 'groundnut', 'mungbean', 'blackgram'],
+             -8: ['mango', 'grapes', 'pomegranate', 'watermelon', 'muskmelon'],
+             -3: ['rice', 'wheat', 'maize']},
+    "south": {-15: ['rice', 'coconut', 'banana', 'coffee'],
+              -8: ['papaya', 'orange', 'mango', 'sugarcane'],
+              -3: ['maize', 'cotton', 'chickpea']},
+    "east": {-15: ['rice', 'jute', 'potato', 'lentil', 'chickpea'],
+             -8: ['wheat', 'maize', 'sugarcane', 'banana'],
+             -3: ['mango', 'coconut']},
+}
+OTHER_CROP_BONUS = 5
+
+def _pincode_number(pincode):
+    return int(pincode) if pincode and pincode.isdigit() else 110001  # Default to Delhi
+
+def _region_index(pincode_num):
+    return bisect.bisect_right(_REGION_BOUNDS, pincode_num)
+
+def pincode_region(pincode):
+    """Index into REGIONS for a pincode (NO_REGION when none is given)."""
+    if not pincode:
+        return NO_REGION
+    return _region_index(_pincode_number(pincode))
+
+def pincode_regions(pincodes):
+    """pincode_region for a whole batch in one searchsorted; unparseable PINs count as Delhi."""
+    numbers = pincode_numbers(pincodes)
+    return np.searchsorted(_REGION_BOUNDS, np.where(numbers == 0, 110001, numbers), side="right")
+
+def region_info(pincode):
+    """(display name, typical crops) for a pincode's region."""
+    if not pincode or not pincode.isdigit():
+        return "Unknown Region", "General recommendations"
+    _, name, _, crops = REGIONS[pincode_region(pincode)]
+    return name, crops
+
+def get_pincode_based_conditions(pincode):
+    """Estimated growing conditions for a pincode, used when no weather data is available"""
+    pincode_num = _pincode_number(pincode)
+    region = REGION_KEYS[_region_index(pincode_num)]
+
+    # Create pincode-based variations for different regions
+    if region == "north":
+        base_temp = 25 + (pincode_num % 15)  # 25-40°C
+        base_humidity = 50 + (pincode_num % 30)  # 50-80%
+        base_rainfall = 100 + (pincode_num % 200)  # 100-300mm
+        base_ph = 6.0 + (pincode_num % 20) / 10  # 6.0-8.0
+    elif region == "west":
+        base_temp = 28 + (pincode_num % 12)  # 28-40°C
+        base_humidity = 40 + (pincode_num % 40)  # 40-80%
+        base_rainfall = 50 + (pincode_num % 150)  # 50-200mm
+        base_ph = 6.5 + (pincode_num % 15) / 10  # 6.5-8.0
+    elif region == "south":
+        base_temp = 26 + (pincode_num % 10)  # 26-36°C
+        base_humidity = 60 + (pincode_num % 35)  # 60-95%
+        base_rainfall = 150 + (pincode_num % 250)  # 150-400mm
+        base_ph = 5.5 + (pincode_num % 25) / 10  # 5.5-8.0
+    else:
+        base_temp = 24 + (pincode_num % 14)  # 24-38°C
+        base_humidity = 55 + (pincode_num % 40)  # 55-95%
+        base_rainfall = 200 + (pincode_num % 300)  # 200-500mm
+        base_ph = 6.2 + (pincode_num % 18) / 10  # 6.2-8.0
+
+    return {
+        'temperature': base_temp,
+        'humidity': base_humidity,
+        'rainfall': base_rainfall,
+        'ph': base_ph
+    }
+
+@lru_cache(maxsize=16)
+def _compile_region_rules(labels):
+    matrix = np.zeros((len(REGIONS) + 1, len(labels)))  # last row: NO_REGION
+    column = {label.lower(): i for i, label in enumerate(labels)}
+    for r, key in enumerate(REGION_KEYS):
+        matrix[r] = OTHER_CROP_BONUS
+        # Weakest tier first, so a crop listed twice keeps its strongest bonus like the old if/elif chain
+        for bonus, crops in sorted(REGION_RULES[key].items(), reverse=True):
+            for crop in crops:
+                if crop in column:
+                    matrix[r, column[crop]] = bonus
+    matrix.setflags(write=False)
+    return matrix
+
+def region_bonus_matrix(table):
+    """Dense (region x crop) bonus matrix for the table's crop order, compiled once per crop list."""
+    return _compile_region_rules(tuple(table["labels"]))
+
+@lru_cache(maxsize=4)
+def load_crop_table(csv_path=CSV_PATH):
+    """Load the dataset once, grouped by crop so per-crop reductions are contiguous."""
+    df = pd.read_csv(csv_path)
+    if 'label' not in df.columns:
+        raise ValueError("CSV must have a 'label' column for crop names.")
+
+    # Stable sort keeps each crop's rows in file order, so ties resolve like idxmin
+    df = df.sort_values("label", kind="stable").reset_index(drop=True)
+    labels, starts, counts = np.unique(df["label"].to_numpy(), return_index=True, return_counts=True)
+    return {
+        "frame": df,
+        "labels": labels,
+        "starts": starts,
+        "group": np.repeat(np.arange(len(labels)), counts),
+        "conditions": df[CONDITION_COLUMNS].to_numpy(dtype=np.float64),
+    }
+
+def suitability_scores(table, conditions):
+    """Weighted percentage difference of every dataset row from the location - LOWER is BETTER."""
+    target = np.array([conditions[c] for c in CONDITION_COLUMNS], dtype=np.float64)
+    diff = np.abs(table["conditions"] - target) / np.maximum(target, 1) * 100
+    return (diff[:, 0] * 4.0 + diff[:, 1] * 3.0 + diff[:, 2] * 3.0 + diff[:, 3] * 2.0) / 12.0
+
+def _per_crop(values, labels):
+    """Align an optional {crop: value} mapping with the table's crop order."""
+    if values is None:
+        return np.zeros(len(labels))
+    lookup = {str(k).lower(): float(v) for k, v in values.items()}
+    return np.array([lookup.get(label.lower(), 0.0) for label in labels])
+
+def rank_crops(conditions, regional_bonus=None, model_proba=None, weights=None, top_k=None, table=None,
+               region=None):
+    """Rank crops by a weighted blend of best-variety suitability, regional bonus and model probability.
+
+    ``regional_bonus`` and ``model_proba`` are {crop: value} mappings; either may be
+    omitted. Alternatively pass ``region`` (see pincode_region) to take the bonus from
+    the compiled REGION_RULES table. Returns the best-matching dataset row of each crop, with
+    ``suitability_score`` (suitability + regional bonus, as before), ``regional_bonus``,
+    ``model_proba`` and ``fused_score`` columns, sorted best first.
+    """
+    table = table or load_crop_table()
+    weights = weights or RANKER_WEIGHTS
+    labels = table["labels"]
+
+    if region is not None:
+        bonus = region_bonus_matrix(table)[region]
+    else:
+        bonus = _per_crop(regional_bonus, labels)
+    proba = _per_crop(model_proba, labels)
+
+    # One vectorized pass: weighted row scores, per-crop minimum and its first row
+    with span("scoring"):
+        base = suitability_scores(table, conditions)
+        row_scores = weights["suitability"] * base + weights["regional"] * bonus[table["group"]]
+    with span("group_min"):
+        best = np.minimum.reduceat(row_scores, table["starts"])
+        at_min = np.flatnonzero(row_scores == best[table["group"]])
+        _, first = np.unique(table["group"][at_min], return_index=True)
+        best_rows = at_min[first]
+
+    with span("top_k"):
+        fused = best - weights["model"] * proba
+        order = np.argsort(fused, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+
+        ranked = table["frame"].iloc[best_rows[order]].reset_index(drop=True)
+        ranked["suitability_score"] = base[best_rows[order]] + bonus[order]
+        ranked["regional_bonus"] = bonus[order]
+        ranked["model_proba"] = proba[order]
+        ranked["fused_score"] = fused[order]
+    return ranked
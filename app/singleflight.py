@@ -0,0 +1,55 @@
+# Request coalescing - concurrent calls with the same key share one in-flight computation
+import threading
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Process-wide duplicate suppression: while a call for ``key`` is running, other
+    callers with that key wait for it and get the same result (or exception).
+
+    Nothing is kept once the call finishes - pair it with a cache for reuse over time.
+    The result object is shared between callers, so they must treat it as read-only.
+    """
+
+    def __init__(self):
+        self.calls = 0      # computations actually run
+        self.coalesced = 0  # callers served by someone else's computation
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
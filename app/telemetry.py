@@ -0,0 +1,93 @@
+# Stage timing spans with in-process latency percentiles
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Child of the app logger; span records carry `stage` and `duration_ms` attributes
+# for structured formatters and are emitted at DEBUG to keep INFO output quiet
+logger = logging.getLogger("krishimitra.timing")
+
+# Samples kept per stage for percentiles (uniform reservoir, so memory stays bounded)
+RESERVOIR_SIZE = int(os.getenv("KRISHIMITRA_TIMING_SAMPLES", "1024"))
+QUANTILES = (0.5, 0.95, 0.99)
+
+class StageTimings:
+    """Thread-safe per-stage duration aggregates: count, total, max and a sample reservoir."""
+
+    def __init__(self, reservoir_size=RESERVOIR_SIZE):
+        self.reservoir_size = reservoir_size
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+
+    def record(self, stage, duration_ms):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "samples": []}
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            samples = stats["samples"]
+            if len(samples) < self.reservoir_size:
+                samples.append(duration_ms)
+            else:
+                slot = self._rng.randrange(stats["count"])
+                if slot < self.reservoir_size:
+                    samples[slot] = duration_ms
+
+    def snapshot(self):
+        """{stage: {count, mean_ms, max_ms, p50_ms, p95_ms, p99_ms}} in first-seen order."""
+        with self._lock:
+            stages = {name: dict(s, samples=sorted(s["samples"])) for name, s in self._stages.items()}
+        result = {}
+        for name, s in stages.items():
+            row = {"count": s["count"], "mean_ms": s["total_ms"] / s["count"], "max_ms": s["max_ms"]}
+            for q in QUANTILES:
+                row[f"p{int(q * 100)}_ms"] = _quantile(s["samples"], q)
+            result[name] = row
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+def _quantile(sorted_samples, q):
+    # Nearest-rank percentile
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(q * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+TIMINGS = StageTimings()
+
+@contextmanager
+def span(stage, **fields):
+    """Time a pipeline stage: ``with span("scoring", pincode=pin): ...``"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        TIMINGS.record(stage, duration_ms)
+        if logger.isEnabledFor(logging.DEBUG):
+            detail = "".join(f" {k}={v}" for k, v in fields.items())
+            logger.debug("stage=%s duration_ms=%.3f%s", stage, duration_ms, detail,
+                         extra={"stage": stage, "duration_ms": duration_ms, **fields})
+
+def render_metrics_text(timings=TIMINGS):
+    """Prometheus-style text dump of the stage timings."""
+    lines = [
+        "# HELP krishimitra_stage_duration_ms Recommendation pipeline stage durations",
+        "# TYPE krishimitra_stage_duration_ms summary",
+    ]
+    for stage, row in timings.snapshot().items():
+        for q in QUANTILES:
+            lines.append(f'krishimitra_stage_duration_ms{{stage="{stage}",quantile="{q}"}} '
+                         f'{row[f"p{int(q * 100)}_ms"]:.3f}')
+        lines.append(f'krishimitra_stage_duration_ms_sum{{stage="{stage}"}} {row["mean_ms"] * row["count"]:.3f}')
+        lines.append(f'krishimitra_stage_duration_ms_count{{stage="{stage}"}} {row["count"]}')
+    return "\n".join(lines) + "\n"
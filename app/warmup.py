@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Startup warm-up and readiness probe for the Streamlit server.
+
+    python app/warmup.py serve [streamlit options]   # warm up in-process, then serve
+    python app/warmup.py check [--port PORT]          # readiness probe: exit 0 only when warm and serving
+
+`serve` preloads the heavy imports, dataset, gazetteer and climatology, model,
+crop knowledge base and image thumbnails in the same process that then runs
+Streamlit, so the first session reuses them. The readiness file (one per port)
+is written once Streamlit's health endpoint answers. Point the load balancer's
+readiness probe at `check`, which also requires the health endpoint to answer.
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger("krishimitra")
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+DEFAULT_PORT = 8501
+# Seconds serve() waits for Streamlit's health endpoint before giving up on marking ready
+HEALTH_WAIT = 120
+
+def ready_file(port=DEFAULT_PORT):
+    """The readiness file for the server on ``port`` (KRISHIMITRA_READY_FILE overrides it)."""
+    return os.getenv("KRISHIMITRA_READY_FILE") or os.path.join(tempfile.gettempdir(), f"krishimitra-{port}.ready")
+
+def health_url(port=DEFAULT_PORT, address="localhost", base_path=""):
+    base_path = base_path.strip("/")
+    return f"http://{address}:{port}/{base_path + '/' if base_path else ''}_stcore/health"
+
+def _streamlit_option(streamlit_args, name, default=None):
+    # "--server.port 8502" or "--server.port=8502", else STREAMLIT_SERVER_PORT
+    flag = f"--{name}"
+    for i, arg in enumerate(streamlit_args):
+        if arg == flag and i + 1 < len(streamlit_args):
+            return streamlit_args[i + 1]
+        if arg.startswith(flag + "="):
+            return arg[len(flag) + 1:]
+    return os.getenv("STREAMLIT_" + name.upper().replace(".", "_"), default)
+
+def _timed(timings, stage, fn):
+    start = time.perf_counter()
+    result = fn()
+    timings[stage] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+def _import_heavy_modules():
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import requests  # noqa: F401
+    import streamlit  # noqa: F401
+    import streamlit_option_menu  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+
+def _load_knowledge_base():
+    import recommendation  # noqa: F401  crop tips, warnings, ROI and sowing tables
+    import fresh_recommendations  # noqa: F401
+    try:
+        import export_pdf  # noqa: F401
+    except ImportError:
+        pass  # PDF export is optional
+
+def _load_location_data():
+    from climatology import climatology
+    from gazetteer import gazetteer
+    from pincode_index import pin_index
+    pin_index()
+    climatology()
+    return gazetteer()
+
+def _build_thumbnails():
+    from image_assets import crop_thumbnail
+    from scoring import load_crop_table
+    return sum(1 for label in load_crop_table()["labels"] if crop_thumbnail(label))
+
+def _synthetic_recommendation(bundle):
+    from fresh_recommendations import get_fresh_crop_recommendations
+    from inference import predict_proba_cached, proba_by_label
+
+    model_scores = None
+    if isinstance(bundle, dict) and "model" in bundle:
+        model = bundle["model"]
+        proba = predict_proba_cached(model, (50, 50, 50, 25.0, 70.0, 6.5, 100.0))
+        model_scores = proba_by_label(model, bundle.get("encoder"), proba)
+    return get_fresh_crop_recommendations("110001", 1.0, 50000, model_proba=model_scores)
+
+def warm_up():
+    """Preload everything the first request would otherwise pay for; returns stage timings (ms)."""
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    from inference import load_model_bundle, resolve_model_path
+    from scoring import load_crop_table
+
+    timings = {}
+    _timed(timings, "imports", _import_heavy_modules)
+    _timed(timings, "dataset", load_crop_table)
+    _timed(timings, "location_data", _load_location_data)
+
+    bundle = None
+    model_path = resolve_model_path()
+    if os.path.exists(model_path):
+        bundle = _timed(timings, "model", lambda: load_model_bundle(model_path, os.path.getmtime(model_path)))
+    else:
+        logger.warning("Warm-up: model file not found at %s", model_path)
+
+    _timed(timings, "knowledge_base", _load_knowledge_base)
+    _timed(timings, "images", _build_thumbnails)
+    _timed(timings, "synthetic_recommendation", lambda: _synthetic_recommendation(bundle))
+    logger.info("Warm-up complete: %s", timings)
+    return timings
+
+def mark_ready(timings, path):
+    """Write the readiness file atomically; removed again when the process exits."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"pid": os.getpid(), "ready_at": time.time(), "timings_ms": timings}, f)
+    os.replace(tmp_path, path)
+    atexit.register(clear_ready, path)
+
+def clear_ready(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def answers(url, timeout=2.0):
+    """True when ``url`` returns 200."""
+    import requests
+    try:
+        return requests.get(url, timeout=timeout).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+def is_ready(path, url=None):
+    """True when a live, warmed-up server owns the readiness file (and answers ``url``, if given)."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+        os.kill(int(state["pid"]), 0)
+    except (OSError, ValueError, KeyError):
+        return False
+    return not url or answers(url)
+
+def _mark_ready_when_serving(timings, path, url, wait=HEALTH_WAIT):
+    # Runs beside Streamlit: the server binds its port only after serve() hands over
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if answers(url, timeout=1.0):
+            mark_ready(timings, path)
+            logger.info("Ready: %s answers, wrote %s", url, path)
+            return True
+        time.sleep(0.5)
+    logger.error("Streamlit didn't answer %s within %ds; not marking ready", url, wait)
+    return False
+
+def serve(streamlit_args):
+    """Warm up, then hand this same process over to Streamlit; ready once its health endpoint answers."""
+    port = _streamlit_option(streamlit_args, "server.port", DEFAULT_PORT)
+    address = _streamlit_option(streamlit_args, "server.address") or "localhost"
+    url = health_url(port, "localhost" if address in ("0.0.0.0", "::") else address,
+                     _streamlit_option(streamlit_args, "server.baseUrlPath", ""))
+    path = ready_file(port)
+    # Only this server's (port's) file: other instances on the host keep theirs
+    clear_ready(path)
+    timings = warm_up()
+    threading.Thread(target=_mark_ready_when_serving, args=(timings, path, url),
+                     name="ready-marker", daemon=True).start()
+
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", APP_PATH, *streamlit_args]
+    return stcli.main()
+
+def main():
+    parser = argparse.ArgumentParser(description="KrishiMitra warm-up and readiness probe")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve", help="warm up, then run the Streamlit app in this process")
+    check = sub.add_parser("check", help="exit 0 when the server is warm and serving")
+    check.add_argument("--port", type=int, default=DEFAULT_PORT, help="port of the server to probe")
+    check.add_argument("--url", default=None,
+                       help="health URL that must return 200 (default: http://localhost:PORT/_stcore/health)")
+    args, extra = parser.parse_known_args()
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO)
+        return serve(extra)
+    return 0 if is_ready(ready_file(args.port), url=args.url or health_url(args.port)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+# Weather tile cache - nearby coordinates share one upstream fetch per geohash tile and TTL
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from cache_backend import normalize, shared_cache
+from singleflight import SingleFlight
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Geohash length of a tile: 4 ~ 39 x 20 km, 5 ~ 4.9 x 4.9 km, 6 ~ 1.2 x 0.6 km
+TILE_PRECISION = int(os.getenv("KRISHIMITRA_WEATHER_TILE_PRECISION", "5"))
+
+# OpenWeather refreshes forecasts every few hours, so an hour-old tile is still current
+WEATHER_TTL = float(os.getenv("KRISHIMITRA_WEATHER_TTL", "3600"))
+
+def _bits(precision):
+    # Geohash interleaves longitude and latitude bits, longitude first
+    total = 5 * precision
+    return (total + 1) // 2, total // 2
+
+def geohash(lat, lon, precision=TILE_PRECISION):
+    """Geohash of the tile containing (lat, lon); plain Python, so single lookups never load numpy."""
+    if not 1 <= precision <= 12:
+        raise ValueError(f"geohash precision must be 1-12, got {precision}")
+    lon_bits, lat_bits = _bits(precision)
+    lat = min(max(float(lat), -90.0), 90.0)
+    lon = min(max(float(lon), -180.0), 180.0)
+    # Same cell indexing as tile_codes, so both always agree
+    x = min(int((lon + 180.0) / 360.0 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    y = min(int((lat + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+
+    code = 0
+    for bit in range(5 * precision):
+        axis, shift = (x, lon_bits - 1 - bit // 2) if bit % 2 == 0 else (y, lat_bits - 1 - bit // 2)
+        code = (code << 1) | ((axis >> shift) & 1)
+    return "".join(_BASE32[(code >> 5 * i) & 31] for i in range(precision - 1, -1, -1))
+
+def tile_codes(lats, lons, precision=TILE_PRECISION):
+    """Vectorized geohash as int64 codes (5 bits per character) - cheap to sort and group."""
+    import numpy as np  # only batch callers pay for numpy
+    if not 1 <= precision <= 12:
+        raise ValueError(f"geohash precision must be 1-12, got {precision}")
+    lon_bits, lat_bits = _bits(precision)
+    lats = np.clip(np.asarray(lats, np.float64), -90.0, 90.0)
+    lons = np.clip(np.asarray(lons, np.float64), -180.0, 180.0)
+    # Cell index along each axis; the top edge belongs to the last cell
+    x = np.minimum(((lons + 180.0) / 360.0 * (1 << lon_bits)).astype(np.int64), (1 << lon_bits) - 1)
+    y = np.minimum(((lats + 90.0) / 180.0 * (1 << lat_bits)).astype(np.int64), (1 << lat_bits) - 1)
+
+    code = np.zeros(x.shape, np.int64)
+    for bit in range(5 * precision):
+        axis, shift = (x, lon_bits - 1 - bit // 2) if bit % 2 == 0 else (y, lat_bits - 1 - bit // 2)
+        code = (code << 1) | ((axis >> shift) & 1)
+    return code
+
+def code_strings(codes, precision=TILE_PRECISION):
+    """tile_codes back to geohash strings."""
+    import numpy as np
+    codes = np.asarray(codes, np.int64)
+    shifts = 5 * np.arange(precision - 1, -1, -1)
+    chars = np.frombuffer(_BASE32.encode("utf-32-le"), np.uint32)[(codes[..., None] >> shifts) & 31]
+    return np.ascontiguousarray(chars).view(f"U{precision}").reshape(codes.shape)
+
+def geohash_bulk(lats, lons, precision=TILE_PRECISION):
+    """Vectorized geohash: an array of tile strings, one per coordinate."""
+    return code_strings(tile_codes(lats, lons, precision), precision)
+
+def tile_centre(tile):
+    """(lat, lon) at the centre of a geohash tile."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    bit = 0
+    for char in tile:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            span = lon_range if bit % 2 == 0 else lat_range
+            mid = (span[0] + span[1]) / 2
+            span[0 if (value >> shift) & 1 else 1] = mid
+            bit += 1
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+def group_by_tile(lats, lons, precision=TILE_PRECISION):
+    """(unique tiles, index of each coordinate's tile) - a batch sweep fetches once per tile."""
+    import numpy as np
+    codes, inverse = np.unique(tile_codes(lats, lons, precision), return_inverse=True)
+    return code_strings(codes, precision), inverse
+
+class WeatherTileCache:
+    """Thread-safe LRU of weather results keyed on (kind, geohash tile), each kept for ``ttl`` seconds.
+
+    ``fetch(lat, lon)`` is called at the tile centre, so every coordinate in a tile gets
+    the same answer whichever one asked first. Failed fetches (None) aren't cached.
+    Requests are counted per key and the last fetch per kind is kept, so a prefetcher
+    (weather_prefetch.py) can refresh the busiest tiles before they expire. Concurrent
+    misses for one tile wait on a single fetch, and fetches are shared with other worker
+    processes through cache_backend.shared_cache().
+    """
+
+    def __init__(self, precision=TILE_PRECISION, ttl=WEATHER_TTL, maxsize=8192):
+        self.precision = precision
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._requests = Counter()
+        self._fetchers = {}
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+
+    def key(self, lat, lon, kind="forecast"):
+        return kind, geohash(lat, lon, self.precision)
+
+    def get(self, lat, lon, fetch, kind="forecast"):
+        key = self.key(lat, lon, kind)
+        with self._lock:
+            self._requests[key] += 1
+            self._fetchers[kind] = fetch
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self._flights.do(key, self._fetch, key, fetch)
+
+    def _fetch(self, key, fetch, min_ttl=0.0):
+        # Another worker may already have fetched this tile; take its result for the time it has left
+        shared = shared_cache().get("weather", key)
+        if shared is not None:
+            remaining = self.ttl - (time.time() - shared["fetched_at"])
+            if remaining > min_ttl:
+                self.put(key, shared["value"], remaining)
+                return shared["value"]
+
+        value = fetch(*tile_centre(key[1]))
+        if value is not None:
+            # As a shared hit would return it (e.g. a tuple as a list), so callers see one type
+            value = normalize(value)[0]
+            self.put(key, value)
+            shared_cache().set("weather", key, {"value": value, "fetched_at": time.time()}, self.ttl)
+        return value
+
+    def refresh(self, key, min_ttl=0.0, fetch=None):
+        """Re-fetch one (kind, tile) key with ``fetch``, else its kind's last fetch; True when it
+        was stored. A shared result from another worker is used only if it's good for ``min_ttl`` seconds."""
+        if fetch is None:
+            with self._lock:
+                fetch = self._fetchers.get(key[0])
+        return fetch is not None and self._flights.do(key, self._fetch, key, fetch, min_ttl) is not None
+
+    def expires_in(self, key):
+        """Seconds until a key's entry expires; None when it isn't cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else entry[0] - time.monotonic()
+
+    def take_requests(self):
+        """Request counts per key since the last call (the prefetcher's request log)."""
+        with self._lock:
+            requests, self._requests = self._requests, Counter()
+        return requests
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "coalesced": self._flights.coalesced,
+                "size": len(self._entries),
+                "precision": self.precision,
+                "ttl": self.ttl,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._requests.clear()
+            self.hits = 0
+            self.misses = 0
+
+WEATHER_CACHE = WeatherTileCache(maxsize=int(os.getenv("KRISHIMITRA_WEATHER_CACHE_SIZE", "8192")))
+
+def cached_weather(lat, lon, fetch, kind="forecast"):
+    """``fetch(lat, lon)`` through the shared tile cache; ``kind`` separates different endpoints."""
+    return WEATHER_CACHE.get(lat, lon, fetch, kind)
+
+def weather_for_points(lats, lons, fetch, kind="forecast"):
+    """Weather for many coordinates with at most one fetch per distinct tile (fewer when cached).
+
+    Returns a list aligned with the input; None where the tile's fetch failed.
+    """
+    import numpy as np
+    lats, lons = np.asarray(lats, np.float64), np.asarray(lons, np.float64)
+    tiles, inverse = group_by_tile(lats, lons, WEATHER_CACHE.precision)
+    by_tile = []
+    for tile in tiles:
+        lat, lon = tile_centre(tile)
+        by_tile.append(WEATHER_CACHE.get(lat, lon, fetch, kind))
+    return [by_tile[i] for i in inverse.ravel()]
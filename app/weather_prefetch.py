@@ -0,0 +1,158 @@
+# Background weather prefetch - keeps the busiest tiles fresh so their visitors never wait on the API
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from telemetry import span
+from weather_cache import WEATHER_CACHE
+
+logger = logging.getLogger("krishimitra")
+
+# Upstream calls the prefetcher may spend per rolling hour; 0 disables it
+PREFETCH_BUDGET = int(os.getenv("KRISHIMITRA_WEATHER_PREFETCH_BUDGET", "300"))
+# Most-requested tiles kept warm, and how often the scheduler wakes up (seconds)
+PREFETCH_TILES = int(os.getenv("KRISHIMITRA_WEATHER_PREFETCH_TILES", "300"))
+PREFETCH_INTERVAL = float(os.getenv("KRISHIMITRA_WEATHER_PREFETCH_INTERVAL", "60"))
+# Demand decays by half over this many seconds, so yesterday's rush stops counting
+DEMAND_HALF_LIFE = 3 * 3600
+
+class WeatherPrefetcher:
+    """Refreshes the hottest tiles of a WeatherTileCache shortly before they expire.
+
+    Demand is learned from the cache's own request counts, exponentially decayed.
+    Each tick refreshes the top ``tiles`` keys that are missing or expire within
+    ``lead_time``, hottest first, never exceeding ``budget`` fetches per rolling hour.
+    A key whose refresh failed is skipped for ``lead_time``, doubling with each further
+    failure up to the cache TTL, so a dead tile can't drain the budget tick after tick.
+
+    ``fetchers`` ({kind: fetch(lat, lon)}) are used for the background refreshes; they
+    must not touch Streamlit, which has no script context on this thread. Kinds without
+    one reuse the last fetch the cache was given.
+    """
+
+    def __init__(self, cache=WEATHER_CACHE, budget=PREFETCH_BUDGET, tiles=PREFETCH_TILES,
+                 interval=PREFETCH_INTERVAL, lead_time=None, half_life=DEMAND_HALF_LIFE, fetchers=None):
+        self.cache = cache
+        self.fetchers = dict(fetchers or {})
+        self.budget = budget
+        self.tiles = tiles
+        self.interval = interval
+        # Refresh at least one tick ahead of expiry, with some slack for slow fetches
+        self.lead_time = lead_time if lead_time is not None else min(cache.ttl / 2, 2 * interval)
+        self.half_life = half_life
+        self.refreshed = 0
+        self.failed = 0
+        self._demand = {}
+        self._failures = {}  # key -> (consecutive failures, monotonic time of the last one)
+        self._calls = deque()  # monotonic times of fetches in the last hour
+        self._last_tick = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _learn(self, now):
+        decay = 0.5 ** ((now - self._last_tick) / self.half_life)
+        self._last_tick = now
+        demand = {key: score * decay for key, score in self._demand.items() if score * decay >= 0.01}
+        for key, count in self.cache.take_requests().items():
+            demand[key] = demand.get(key, 0.0) + count
+        self._demand = demand
+        self._failures = {key: failure for key, failure in self._failures.items() if key in demand}
+
+    def _remaining_budget(self, now):
+        while self._calls and self._calls[0] <= now - 3600:
+            self._calls.popleft()
+        return self.budget - len(self._calls)
+
+    def _backing_off(self, key, now):
+        failure = self._failures.get(key)
+        if failure is None:
+            return False
+        count, failed_at = failure
+        return now - failed_at < min(self.lead_time * 2 ** (count - 1), self.cache.ttl)
+
+    def due(self):
+        """Hot keys that need a refresh now, hottest first (before budget is applied)."""
+        hottest = sorted(self._demand, key=self._demand.get, reverse=True)[:self.tiles]
+        now = time.monotonic()
+        due = []
+        for key in hottest:
+            if self._backing_off(key, now):
+                continue
+            remaining = self.cache.expires_in(key)
+            if remaining is None or remaining <= self.lead_time:
+                due.append(key)
+        return due
+
+    def tick(self):
+        """Learn from new requests and refresh what's due; returns the number of fetches made."""
+        with self._lock, span("weather_prefetch"):
+            now = time.monotonic()
+            self._learn(now)
+            fetched = 0
+            for key in self.due():
+                if self._remaining_budget(time.monotonic()) <= 0:
+                    break
+                self._calls.append(time.monotonic())
+                fetched += 1
+                try:
+                    ok = self.cache.refresh(key, min_ttl=self.lead_time, fetch=self.fetchers.get(key[0]))
+                except Exception:
+                    logger.exception("Weather prefetch failed for %s", key)
+                    ok = False
+                if ok:
+                    self.refreshed += 1
+                    self._failures.pop(key, None)
+                else:
+                    self.failed += 1
+                    count = self._failures.get(key, (0, 0.0))[0]
+                    self._failures[key] = (count + 1, time.monotonic())
+            return fetched
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Weather prefetch tick failed")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="weather-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        # Read without the tick lock so the admin view never waits on a refresh in progress
+        hour_ago = time.monotonic() - 3600
+        return {
+            "tracked_tiles": len(self._demand),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "failing_tiles": len(self._failures),
+            "calls_last_hour": sum(1 for t in list(self._calls) if t > hour_ago),
+            "budget": self.budget,
+        }
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+def start_prefetcher(fetchers=None):
+    """Start the shared prefetcher once per process; None when the budget is 0.
+    ``fetchers`` are the Streamlit-free fetch functions per kind (see WeatherPrefetcher)."""
+    global _prefetcher
+    if PREFETCH_BUDGET <= 0:
+        return None
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = WeatherPrefetcher(fetchers=fetchers).start()
+            logger.info("Weather prefetch started: top %d tiles, %d calls/hour", PREFETCH_TILES, PREFETCH_BUDGET)
+        return _prefetcher
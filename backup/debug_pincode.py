@@ -31,7 +31,7 @@ def test_pincode_recommendations():
         try:
             # Get fresh recommendations
             recommendations = get_crop_recommendations(
-                model_prediction="PINCODE_BASED",
+                model_proba=None,
                 land_area=1.0,
                 budget=50000,
                 pincode=pincode,
@@ -67,9 +67,9 @@ if st.button("🌱 Get Recommendations", type="primary"):
         with st.spinner(f"Getting recommendations for PIN {pincode}..."):
             
             try:
-                # Get recommendations using PINCODE_BASED mode
+                # Get recommendations without model probabilities (location only)
                 recommendations = get_crop_recommendations(
-                    model_prediction="PINCODE_BASED",  # Pure pincode mode
+                    model_proba=None,  # No ML blend
                     land_area=land_area,
                     budget=budget,
                     pincode=pincode,
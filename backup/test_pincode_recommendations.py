@@ -14,7 +14,7 @@ def test_pincode_recommendations():
     """Test different pincodes to show they give different recommendations"""
     
     # Test parameters
-    model_prediction = "rice"
+    model_proba = None  # location-only ranking
     land_area = 1.0
     budget = 50000
     
@@ -41,7 +41,7 @@ def test_pincode_recommendations():
         
         try:
             recommendations = get_crop_recommendations(
-                model_prediction, land_area, budget, 
+                model_proba, land_area, budget, 
                 pincode=pincode, api_key=None
             )
             
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Golden-result check: the vectorised ranking against the original row-wise scorer.
+
+    python benchmarks/golden_equivalence.py                      # every 3-digit PIN prefix
+    python benchmarks/golden_equivalence.py --samples 3 --prefix-digits 3
+    python benchmarks/golden_equivalence.py --prefix-digits 2    # quick run
+
+The oracle below is a frozen copy of the scorer the app shipped with -
+``recommendation.calculate_crop_suitability_score`` - applied row by row with
+DataFrame.apply. It is deliberately not imported from app/ so that a rewrite of
+the app code can't change the reference as well. The fresh path's own scorer
+had shorter regional bonus lists; those were merged into this one table, so
+both paths are checked against it.
+
+For every PIN (``--samples`` seeded suffixes per prefix) both paths are ranked
+and must give the same top-K crops in the same order, with scores equal within
+--tolerance; crops whose scores tie within the tolerance may swap places. The
+fresh path is also run for every budget in --budgets and its result dicts are
+checked against the original formulas. Throughput of both sides is reported.
+Exits non-zero on any mismatch.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from fresh_recommendations import get_fresh_crop_recommendations  # noqa: E402
+from scoring import (CSV_PATH, DEFAULT_WEIGHTS, get_pincode_based_conditions, load_crop_table,  # noqa: E402
+                     pincode_region, rank_crops)
+
+SEED = 20240601
+BUDGETS = (0, 10_000, 50_000, 250_000, 1_000_000)
+
+# ---------------------------------------------------------------------------
+# Frozen legacy reference (conditions, scorer, result dicts) - do not "fix" these
+# ---------------------------------------------------------------------------
+
+def legacy_conditions(pincode, west_limit=500000, south_limit=700000):
+    """get_pincode_based_conditions; fresh used 500000/700000, the interactive path 400000/600000."""
+    if not pincode or not pincode.isdigit():
+        pincode = "110001"
+    pincode_num = int(pincode)
+    if pincode_num < 200000:
+        return {'temperature': 25 + (pincode_num % 15), 'humidity': 50 + (pincode_num % 30),
+                'rainfall': 100 + (pincode_num % 200), 'ph': 6.0 + (pincode_num % 20) / 10}
+    elif pincode_num < west_limit:
+        return {'temperature': 28 + (pincode_num % 12), 'humidity': 40 + (pincode_num % 40),
+                'rainfall': 50 + (pincode_num % 150), 'ph': 6.5 + (pincode_num % 15) / 10}
+    elif pincode_num < south_limit:
+        return {'temperature': 26 + (pincode_num % 10), 'humidity': 60 + (pincode_num % 35),
+                'rainfall': 150 + (pincode_num % 250), 'ph': 5.5 + (pincode_num % 25) / 10}
+    return {'temperature': 24 + (pincode_num % 14), 'humidity': 55 + (pincode_num % 40),
+            'rainfall': 200 + (pincode_num % 300), 'ph': 6.2 + (pincode_num % 18) / 10}
+
+def _base_score(row, c):
+    temp_diff = abs(row['temperature'] - c['temperature']) / max(c['temperature'], 1) * 100
+    hum_diff = abs(row['humidity'] - c['humidity']) / max(c['humidity'], 1) * 100
+    rain_diff = abs(row['rainfall'] - c['rainfall']) / max(c['rainfall'], 1) * 100
+    ph_diff = abs(row['ph'] - c['ph']) / max(c['ph'], 1) * 100
+    return (temp_diff * 4.0 + hum_diff * 3.0 + rain_diff * 3.0 + ph_diff * 2.0) / 12.0
+
+def legacy_interactive_score(row, pincode, c):
+    """recommendation.calculate_crop_suitability_score"""
+    regional_bonus = 0
+    if pincode:
+        pincode_num = int(pincode) if pincode.isdigit() else 110001
+        crop_name = row['label'].lower()
+        if pincode_num < 200000:
+            if crop_name in ['wheat', 'rice', 'maize', 'chickpea', 'lentil', 'mustard', 'barley']:
+                regional_bonus = -15
+            elif crop_name in ['cotton', 'sugarcane', 'potato', 'onion']:
+                regional_bonus = -8
+            elif crop_name in ['mango', 'apple', 'grapes']:
+                regional_bonus = -3
+            else:
+                regional_bonus = 5
+        elif pincode_num < 500000:
+            if crop_name in ['cotton', 'sugarcane', 'groundnut', 'mungbean', 'blackgram']:
+                regional_bonus = -15
+            elif crop_name in ['mango', 'grapes', 'pomegranate', 'watermelon', 'muskmelon']:
+                regional_bonus = -8
+            elif crop_name in ['rice', 'wheat', 'maize']:
+                regional_bonus = -3
+            else:
+                regional_bonus = 5
+        elif pincode_num < 700000:
+            if crop_name in ['rice', 'coconut', 'banana', 'coffee']:
+                regional_bonus = -15
+            elif crop_name in ['papaya', 'orange', 'mango', 'sugarcane']:
+                regional_bonus = -8
+            elif crop_name in ['maize', 'cotton', 'chickpea']:
+                regional_bonus = -3
+            else:
+                regional_bonus = 5
+        else:
+            if crop_name in ['rice', 'jute', 'potato', 'lentil', 'chickpea']:
+                regional_bonus = -15
+            elif crop_name in ['wheat', 'maize', 'sugarcane', 'banana']:
+                regional_bonus = -8
+            elif crop_name in ['mango', 'coconut']:
+                regional_bonus = -3
+            else:
+                regional_bonus = 5
+    return _base_score(row, c) + regional_bonus
+
+def legacy_rank(crop_df, pincode, score_fn, conditions):
+    """Every crop's best variety, sorted best first (the original groupby/idxmin/sort_values)."""
+    crop_df = crop_df.copy()
+    crop_df['suitability_score'] = crop_df.apply(lambda row: score_fn(row, pincode, conditions), axis=1)
+    # groupby().apply(idxmin) as originally written no longer runs on pandas 3; same rows
+    best = crop_df.loc[crop_df.groupby('label')['suitability_score'].idxmin()]
+    return best.sort_values('suitability_score').reset_index(drop=True)
+
+def legacy_fresh_result(row, pincode, conditions, budget):
+    """The fields of a fresh result dict that don't depend on the ranking internals."""
+    return {
+        'name': row['label'],
+        'roi': budget * 1.4,
+        'profit': budget * 0.8,
+        'investment': budget * 0.8,
+        'weather_impact': {
+            'Temperature': f"{row['temperature']:.1f}°C (crop) vs {conditions['temperature']:.1f}°C (area)",
+            'Humidity': f"{row['humidity']:.1f}% (crop) vs {conditions['humidity']:.1f}% (area)",
+            'Rainfall': f"{row['rainfall']:.1f}mm (crop) vs {conditions['rainfall']:.1f}mm (area)",
+        },
+        'tips': [f"Suitable for PIN {pincode}", "Follow regional practices"],
+    }
+
+# ---------------------------------------------------------------------------
+
+def pincodes(prefix_digits, samples, seed=SEED):
+    """``samples`` seeded 6-digit PINs under every prefix of ``prefix_digits`` digits (first digit 1-9)."""
+    rng = np.random.default_rng(seed)
+    suffix_digits = 6 - prefix_digits
+    result = []
+    for prefix in range(10 ** (prefix_digits - 1), 10 ** prefix_digits):
+        for suffix in rng.choice(10 ** suffix_digits, size=samples, replace=False):
+            result.append(f"{prefix}{suffix:0{suffix_digits}d}")
+    return result
+
+def ranking_mismatch(expected, names, scores, top_k, tol):
+    """None if ``names``/``scores`` match the top ``top_k`` of the legacy ranking ``expected``."""
+    exp_names = list(expected['label'][:top_k])
+    exp_scores = expected['suitability_score'].to_numpy()[:top_k]
+    if len(names) != len(exp_names):
+        return f"got {len(names)} crops, expected {len(exp_names)}"
+    if not np.allclose(scores, exp_scores, rtol=0, atol=tol):
+        worst = int(np.argmax(np.abs(np.asarray(scores) - exp_scores)))
+        return f"score #{worst + 1} {names[worst]}={scores[worst]:.6f}, expected {exp_names[worst]}={exp_scores[worst]:.6f}"
+    legacy_score = dict(zip(expected['label'], expected['suitability_score']))
+    for i, (name, exp_name) in enumerate(zip(names, exp_names)):
+        # A different crop is fine only if it ties with the expected one
+        if name != exp_name and abs(legacy_score.get(name, np.inf) - exp_scores[i]) > tol:
+            return f"rank #{i + 1} is {name}, expected {exp_name}"
+    return None
+
+def check_fresh(crop_df, pins, budgets, tol, failures):
+    oracle_s = engine_s = 0.0
+    for pin in pins:
+        start = time.perf_counter()
+        conditions = legacy_conditions(pin)
+        # The fresh path's shorter bonus lists were merged into the interactive path's
+        # table (scoring.REGION_RULES) on purpose, so both paths rank against that scorer
+        expected = legacy_rank(crop_df, pin, legacy_interactive_score, conditions)
+        oracle_s += time.perf_counter() - start
+
+        for budget in budgets:
+            start = time.perf_counter()
+            recs = get_fresh_crop_recommendations(pin, 1.0, budget, weights=DEFAULT_WEIGHTS,
+                                                  conditions=dict(conditions))
+            engine_s += time.perf_counter() - start
+
+            problem = ranking_mismatch(expected, [r['name'] for r in recs], [r['debug_score'] for r in recs], 10, tol)
+            if problem is None:
+                for (_, row), rec in zip(expected.iterrows(), recs):
+                    want = legacy_fresh_result(row, pin, conditions, budget)
+                    got = {k: rec[k] for k in want}
+                    got['weather_impact'] = {k: rec['weather_impact'][k] for k in want['weather_impact']}
+                    if got != want:
+                        problem = f"{rec['name']} result differs: {got} != {want}"
+                        break
+            if problem:
+                failures.append(("fresh", pin, budget, problem))
+    return oracle_s, engine_s / len(budgets)
+
+def check_interactive(crop_df, pins, tol, failures):
+    # The interactive ranking doesn't depend on the budget (it only feeds the ROI figures),
+    # so it is compared once per PIN through the same rank_crops call get_crop_recommendations
+    # makes with estimated conditions (the legacy scorer had no climatology to compare against)
+    table = load_crop_table()
+    oracle_s = engine_s = 0.0
+    for pin in pins:
+        start = time.perf_counter()
+        # The interactive path's 400000/600000 condition boundaries were unified with the
+        # 500000/700000 region boundaries in scoring.get_pincode_based_conditions on purpose
+        expected = legacy_rank(crop_df, pin, legacy_interactive_score, legacy_conditions(pin))
+        oracle_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        ranked = rank_crops(get_pincode_based_conditions(pin), region=pincode_region(pin),
+                            weights=DEFAULT_WEIGHTS, top_k=15, table=table)
+        engine_s += time.perf_counter() - start
+
+        problem = ranking_mismatch(expected, list(ranked['label']), list(ranked['fused_score']), 15, tol)
+        if problem:
+            failures.append(("interactive", pin, None, problem))
+    return oracle_s, engine_s
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the optimised ranking against the legacy row-wise scorer")
+    parser.add_argument("--prefix-digits", type=int, default=3, choices=(1, 2, 3, 4),
+                        help="PIN prefix length to enumerate (default: 3, i.e. 100-999)")
+    parser.add_argument("--samples", type=int, default=1, help="seeded PINs per prefix")
+    parser.add_argument("--budgets", default=",".join(str(b) for b in BUDGETS))
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="absolute score tolerance")
+    parser.add_argument("--path", choices=("fresh", "interactive", "both"), default="both")
+    args = parser.parse_args()
+
+    pins = pincodes(args.prefix_digits, args.samples)
+    budgets = [float(b) for b in args.budgets.split(",")]
+    crop_df = pd.read_csv(CSV_PATH)
+    print(f"⏳ {len(pins)} PINs x {len(budgets)} budgets against {len(crop_df)} dataset rows ...")
+
+    failures = []
+    throughput = {}
+    if args.path in ("fresh", "both"):
+        throughput["fresh"] = check_fresh(crop_df, pins, budgets, args.tolerance, failures)
+    if args.path in ("interactive", "both"):
+        throughput["interactive"] = check_interactive(crop_df, pins, args.tolerance, failures)
+
+    print(f"\n{'path':<12} {'legacy PINs/s':>14} {'optimised PINs/s':>17} {'speedup':>8}")
+    for path, (oracle_s, engine_s) in throughput.items():
+        print(f"{path:<12} {len(pins) / oracle_s:>14.1f} {len(pins) / engine_s:>17.1f} {oracle_s / engine_s:>7.0f}x")
+
+    if failures:
+        print(f"\n❌ {len(failures)} mismatch(es)")
+        for path, pin, budget, problem in failures[:20]:
+            print(f"  {path} PIN {pin}" + (f" budget {budget:,.0f}" if budget is not None else "") + f": {problem}")
+        return 1
+    print(f"\n✅ Rankings identical to the legacy scorer for all {len(pins)} PINs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the recommendation hot path.
+
+    python benchmarks/run_benchmarks.py                          # all sizes, print a table
+    python benchmarks/run_benchmarks.py --sizes 2k,200k --output results.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+
+Covers dataset load, scoring for 1/100/10k pincodes, the per-crop group-min,
+result dict construction, PDF render, bulk pincode classification, climate
+normals lookup, weather tile grouping and model predict. Scoring runs against
+fixed synthetic datasets of 2k, 200k and 2M rows, generated deterministically
+from the real dataset's per-crop statistics and cached under benchmarks/data/.
+
+Results are written as JSON for tracking across commits; --compare exits
+non-zero when any benchmark is slower than the baseline by more than
+--tolerance (default 1.5x). Refresh the checked-in baseline with
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from fresh_recommendations import build_recommendations  # noqa: E402
+from scoring import (CSV_PATH, get_pincode_based_conditions, load_crop_table, pincode_region,  # noqa: E402
+                     rank_crops, suitability_scores)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SIZES = {"2k": 2_000, "200k": 200_000, "2M": 2_000_000}
+PINCODE_COUNTS = (1, 100, 10_000)
+SEED = 20240601
+
+# Skip scoring combinations above this many row evaluations (rows x pincodes)
+MAX_SCORING_WORK = 2e7
+
+def synthetic_dataset(rows, seed=SEED):
+    """Deterministic dataset with the real columns, drawn from each crop's mean/std."""
+    path = os.path.join(DATA_DIR, f"crops_{rows}_{seed}.csv")
+    if os.path.exists(path):
+        return path
+
+    real = pd.read_csv(CSV_PATH)
+    stats = real.groupby("label").agg(["mean", "std"])
+    labels = stats.index.to_numpy()
+    rng = np.random.default_rng(seed)
+    label_idx = rng.integers(0, len(labels), rows)
+
+    frame = {}
+    for column in real.columns.drop("label"):
+        mean = stats[(column, "mean")].to_numpy()[label_idx]
+        std = stats[(column, "std")].to_numpy()[label_idx]
+        frame[column] = np.round(np.abs(rng.normal(mean, std)), 6)
+    frame["label"] = labels[label_idx]
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    pd.DataFrame(frame).to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+def synthetic_pincodes(count, seed=SEED):
+    rng = np.random.default_rng(seed)
+    return [str(p) for p in rng.integers(110001, 855118, count)]
+
+def measure(fn, min_time=0.5, max_runs=200, min_runs=3):
+    """Call ``fn`` repeatedly; return timing stats in milliseconds per call."""
+    fn()  # warm-up
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < min_runs or (len(times) < max_runs and time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": len(times),
+        "min_ms": min(times),
+        "median_ms": statistics.median(times),
+        "mean_ms": statistics.fmean(times),
+    }
+
+def bench_dataset(name, path, results):
+    load = load_crop_table.__wrapped__  # bypass the lru_cache
+    results[f"dataset_load[{name}]"] = measure(lambda: load(path), min_time=0.2, max_runs=20)
+    table = load(path)
+
+    conditions = get_pincode_based_conditions("110001")
+    results[f"suitability_scores[{name}]"] = measure(lambda: suitability_scores(table, conditions))
+
+    # Per-crop minimum on precomputed row scores (the reduceat + first-argmin step)
+    row_scores = suitability_scores(table, conditions)
+    group, starts = table["group"], table["starts"]
+
+    def group_min():
+        best = np.minimum.reduceat(row_scores, starts)
+        at_min = np.flatnonzero(row_scores == best[group])
+        _, first = np.unique(group[at_min], return_index=True)
+        return at_min[first]
+    results[f"group_min[{name}]"] = measure(group_min)
+
+    for count in PINCODE_COUNTS:
+        if len(table["frame"]) * count > MAX_SCORING_WORK:
+            continue
+        pincodes = synthetic_pincodes(count)
+        prepared = [(get_pincode_based_conditions(p), pincode_region(p)) for p in pincodes]
+
+        def score_all():
+            for conditions, region in prepared:
+                rank_crops(conditions, region=region, top_k=10, table=table)
+        stats = measure(score_all, min_time=0.5, max_runs=50 if count < 10_000 else 3, min_runs=1)
+        stats["pincodes_per_s"] = count / (stats["median_ms"] / 1000)
+        results[f"rank_crops[{name},pincodes={count}]"] = stats
+
+def bench_results_and_pdf(results):
+    table = load_crop_table()
+    conditions = get_pincode_based_conditions("110001")
+    best = rank_crops(conditions, region=pincode_region("110001"), top_k=10, table=table)
+    results["build_recommendations[top10]"] = measure(
+        lambda: build_recommendations(best, "110001", conditions, 50000))
+
+    try:
+        from export_pdf import pdf_available, render_reports
+    except ImportError:
+        return
+    if pdf_available():
+        recs = build_recommendations(best, "110001", conditions, 50000)
+        results["pdf_render[10 crops]"] = measure(lambda: render_reports([(recs, 1.0, None)], False),
+                                                  min_time=1.0, max_runs=30)
+        results["pdf_render[10 crops,images]"] = measure(lambda: render_reports([(recs, 1.0, None)], True),
+                                                         min_time=1.0, max_runs=30)
+
+def bench_pincodes(results):
+    from pincode_index import classify_pincodes
+    from scoring import pincode_regions
+
+    numbers = np.random.default_rng(SEED).integers(110001, 855118, 1_000_000)
+    strings = numbers.astype(str)
+    for name, fn in (("classify_pincodes[1M ints]", lambda: classify_pincodes(numbers)),
+                     ("classify_pincodes[1M strings]", lambda: classify_pincodes(strings)),
+                     ("pincode_regions[1M strings]", lambda: pincode_regions(strings))):
+        stats = measure(fn, min_time=0.5, max_runs=20)
+        stats["pincodes_per_s"] = len(numbers) / (stats["median_ms"] / 1000)
+        results[name] = stats
+
+def bench_climatology(results):
+    from climatology import climate_normals, climate_normals_bulk, climatology
+
+    if climatology() is None:
+        return
+    rng = np.random.default_rng(SEED)
+    lats, lons = rng.uniform(8, 34, 1_000_000), rng.uniform(70, 95, 1_000_000)
+    months = rng.integers(1, 13, 1_000_000)
+    results["climate_normals[1 point]"] = measure(lambda: climate_normals(22.3, 80.1, 6))
+    stats = measure(lambda: climate_normals_bulk(lats, lons, months), min_time=0.5, max_runs=10)
+    stats["points_per_s"] = len(lats) / (stats["median_ms"] / 1000)
+    results["climate_normals_bulk[1M points]"] = stats
+
+def bench_weather_tiles(results):
+    from weather_cache import group_by_tile
+
+    rng = np.random.default_rng(SEED)
+    lats, lons = rng.uniform(8, 34, 1_000_000), rng.uniform(70, 95, 1_000_000)
+    stats = measure(lambda: group_by_tile(lats, lons), min_time=0.5, max_runs=10)
+    stats["points_per_s"] = len(lats) / (stats["median_ms"] / 1000)
+    results["weather_tiles[1M points]"] = stats
+
+def bench_models(results):
+    from inference import FEATURE_ORDER
+
+    rng = np.random.default_rng(SEED)
+    real = pd.read_csv(CSV_PATH)
+    batch = real[FEATURE_ORDER].sample(1000, replace=True, random_state=SEED).to_numpy()
+    batch = batch + rng.normal(0, 0.5, batch.shape)
+
+    for variant in ("crop_model.pkl", "crop_model_lite.pkl"):
+        path = os.path.join(ROOT, variant)
+        if not os.path.exists(path):
+            path = os.path.join(ROOT, "app", variant)
+        if not os.path.exists(path):
+            continue
+        import joblib
+        model = joblib.load(path)["model"]
+        make = (lambda X: pd.DataFrame(X, columns=FEATURE_ORDER)) if hasattr(model, "feature_names_in_") else (lambda X: X)
+        single, many = make(batch[:1]), make(batch)
+        results[f"model_predict[{variant},1 row]"] = measure(lambda: model.predict_proba(single))
+        results[f"model_predict[{variant},1000 rows]"] = measure(lambda: model.predict_proba(many))
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'benchmark':<52} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        ratio = stats["median_ms"] / baseline[name]["median_ms"]
+        flag = "  ❌" if ratio > tolerance else ""
+        print(f"{name:<52} {baseline[name]['median_ms']:>9.3f}ms {stats['median_ms']:>9.3f}ms {ratio:>6.2f}x{flag}")
+        if ratio > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommendation hot-path benchmarks")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"dataset sizes to run ({', '.join(SIZES)})")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="max allowed slowdown vs baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.sizes.split(","):
+        name = name.strip()
+        if name not in SIZES:
+            parser.error(f"unknown size {name!r}; choose from {', '.join(SIZES)}")
+        print(f"⏳ {name} rows ...")
+        bench_dataset(name, synthetic_dataset(SIZES[name]), results)
+    bench_results_and_pdf(results)
+    bench_pincodes(results)
+    bench_climatology(results)
+    bench_weather_tiles(results)
+    bench_models(results)
+
+    print(f"\n{'benchmark':<52} {'median':>10} {'min':>10} {'runs':>5}")
+    for name, stats in results.items():
+        print(f"{name:<52} {stats['median_ms']:>9.3f}ms {stats['min_ms']:>9.3f}ms {stats['runs']:>5}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) slower than {args.tolerance}x baseline")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Build the gridded monthly climatology used as the offline weather fallback (app/climatology.py).
+
+    python build_climatology.py                                  # from data/climate_stations.csv
+    python build_climatology.py stations.csv --resolution 0.25 --neighbours 6
+
+The source is a CSV of station normals with one row per station and month:
+station, lat, lon, month (1-12), temperature (mean, °C), humidity (mean RH, %)
+and rainfall (monthly total, mm). Every grid point over India is filled by
+inverse-distance weighting of its nearest stations (great-circle distance).
+
+The output is a float32 cube of shape (lat, lon, month, variable), saved as
+.npy so the app can memory-map it, plus a .json sidecar with the grid origin,
+spacing and variable names.
+
+The shipped data/climate_stations.csv holds approximate long-term normals for
+38 Indian cities. Build from a denser station set or a reanalysis export for
+better coverage.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIONS_CSV = os.path.join(ROOT, "data", "climate_stations.csv")
+OUTPUT = os.path.join(ROOT, "data", "climatology.npy")
+
+VARIABLES = ("temperature", "humidity", "rainfall")
+LAT_RANGE = (6.0, 37.5)
+LON_RANGE = (68.0, 97.5)
+EARTH_RADIUS_KM = 6371.0
+
+# The seed stations are a few degrees apart, so a finer grid adds size without detail
+RESOLUTION = 0.5
+
+def read_stations(path):
+    """(station coordinates [n, 2], normals [n, 12, len(VARIABLES)], names) from the long-format CSV."""
+    df = pd.read_csv(path)
+    missing = {"station", "lat", "lon", "month", *VARIABLES} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+
+    df = df.sort_values(["station", "month"])
+    incomplete = df.groupby("station")["month"].apply(lambda m: sorted(m) != list(range(1, 13)))
+    if incomplete.any():
+        raise ValueError(f"{path}: stations without exactly months 1-12: {', '.join(incomplete[incomplete].index)}")
+
+    names = df["station"].unique()
+    coords = df.groupby("station", sort=False)[["lat", "lon"]].first().loc[names].to_numpy(np.float64)
+    normals = df[list(VARIABLES)].to_numpy(np.float64).reshape(len(names), 12, len(VARIABLES))
+    return coords, normals, list(names)
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def idw_grid(coords, normals, resolution, neighbours, power):
+    """Inverse-distance-weighted cube of shape (lat, lon, 12, variables)."""
+    lats = np.arange(LAT_RANGE[0], LAT_RANGE[1] + resolution / 2, resolution)
+    lons = np.arange(LON_RANGE[0], LON_RANGE[1] + resolution / 2, resolution)
+    grid_lat, grid_lon = np.meshgrid(lats, lons, indexing="ij")
+
+    # Distance from every grid point to every station: (points, stations)
+    dist = _haversine_km(grid_lat.reshape(-1, 1), grid_lon.reshape(-1, 1), coords[:, 0], coords[:, 1])
+    k = min(neighbours, len(coords))
+    nearest = np.argsort(dist, axis=1)[:, :k]
+    d = np.take_along_axis(dist, nearest, axis=1)
+
+    # A grid point on top of a station takes that station's values
+    weights = 1.0 / np.maximum(d, 1e-6) ** power
+    weights /= weights.sum(axis=1, keepdims=True)
+    flat = normals.reshape(len(coords), -1)                      # (stations, 12 * variables)
+    values = np.einsum("pk,pkv->pv", weights, flat[nearest])     # (points, 12 * variables)
+    return values.reshape(len(lats), len(lons), 12, len(VARIABLES)).astype(np.float32)
+
+def write_climatology(cube, output, meta):
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    tmp_path = output + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, cube)
+    os.replace(tmp_path, output)
+
+    meta_path = os.path.splitext(output)[0] + ".json"
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+    return meta_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the gridded monthly climatology")
+    parser.add_argument("stations", nargs="?", default=STATIONS_CSV)
+    parser.add_argument("--output", default=OUTPUT, help="the .npy cube; a .json sidecar is written next to it")
+    parser.add_argument("--resolution", type=float, default=RESOLUTION, help="grid spacing in degrees")
+    parser.add_argument("--neighbours", type=int, default=8, help="stations blended into each grid point")
+    parser.add_argument("--power", type=float, default=2.0, help="inverse-distance exponent")
+    args = parser.parse_args()
+
+    coords, normals, names = read_stations(args.stations)
+    print(f"🌡️ {len(names)} stations from {args.stations}")
+    cube = idw_grid(coords, normals, args.resolution, args.neighbours, args.power)
+    meta = {
+        "lat0": LAT_RANGE[0],
+        "lon0": LON_RANGE[0],
+        "step": args.resolution,
+        "shape": list(cube.shape),
+        "variables": list(VARIABLES),
+        "source": os.path.basename(args.stations),
+        "stations": len(names),
+        "method": f"IDW, {args.neighbours} nearest stations, power {args.power}",
+    }
+    meta_path = write_climatology(cube, args.output, meta)
+    print(f"✅ {cube.shape[0]}x{cube.shape[1]} grid at {args.resolution}° -> {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.0f} KB) + {meta_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
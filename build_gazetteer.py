@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Build the offline pincode gazetteer used for geocoding (app/gazetteer.py).
+
+    python build_gazetteer.py                                   # from data/pincode_seed.csv
+    python build_gazetteer.py all_india_pincode_directory.csv data/pincode_seed.csv
+
+Sources are CSVs with pincode, latitude, longitude, district and state columns -
+either the seed file shipped in data/ or the All India Pincode Directory
+published on data.gov.in (one row per post office; its Pincode, Latitude,
+Longitude, District and StateName columns are recognised). Rows without usable
+coordinates are dropped, and post offices sharing a pincode are merged into
+their median position and most common district/state. When sources disagree
+the later file wins.
+
+The output is a compressed .npz with the pincodes as sorted uint32 keys,
+float32 lat/lon, and district/state indexes into name tables.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SEED_CSV = os.path.join(ROOT, "data", "pincode_seed.csv")
+OUTPUT = os.path.join(ROOT, "data", "pincode_gazetteer.npz")
+
+COLUMN_ALIASES = {
+    "pincode": "pincode", "pin": "pincode", "pin_code": "pincode",
+    "latitude": "lat", "lat": "lat",
+    "longitude": "lon", "lon": "lon", "long": "lon",
+    "district": "district", "districtname": "district", "district_name": "district",
+    "state": "state", "statename": "state", "state_name": "state",
+}
+
+# Anything outside this box is a data-entry error (swapped or truncated coordinates)
+INDIA_BOUNDS = {"lat": (6.0, 37.5), "lon": (68.0, 97.5)}
+
+def read_source(path):
+    """One source CSV normalised to pincode/lat/lon/district/state, invalid rows dropped."""
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig", encoding_errors="replace")
+    df = df.rename(columns=lambda c: COLUMN_ALIASES.get(c.strip().lower(), c.strip().lower()))
+    missing = {"pincode", "lat", "lon"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+    for column in ("district", "state"):
+        if column not in df.columns:
+            df[column] = ""
+
+    df = df[["pincode", "lat", "lon", "district", "state"]].copy()
+    df["pincode"] = pd.to_numeric(df["pincode"].str.strip(), errors="coerce")
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
+    df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
+    ok = df["pincode"].between(100000, 999999)
+    for column, (low, high) in INDIA_BOUNDS.items():
+        ok &= df[column].between(low, high)
+    df = df[ok]
+    df["district"] = df["district"].fillna("").str.strip().str.title()
+    df["state"] = df["state"].fillna("").str.strip().str.title().str.replace(" And ", " and ")
+    return df.astype({"pincode": np.int64})
+
+def _most_common(values):
+    counts = values[values != ""].value_counts()
+    return counts.index[0] if len(counts) else ""
+
+def build(sources):
+    """Merge the sources into one row per pincode, sorted by pincode."""
+    frames = []
+    for priority, path in enumerate(sources):
+        df = read_source(path)
+        df["priority"] = priority
+        frames.append(df)
+        print(f"  {path}: {len(df)} usable rows")
+    df = pd.concat(frames, ignore_index=True)
+
+    # Keep only each pincode's rows from the last source that has it
+    df = df[df["priority"] == df.groupby("pincode")["priority"].transform("max")]
+    grouped = df.groupby("pincode", sort=True)
+    return pd.DataFrame({
+        "lat": grouped["lat"].median(),
+        "lon": grouped["lon"].median(),
+        "district": grouped["district"].agg(_most_common),
+        "state": grouped["state"].agg(_most_common),
+    })
+
+def write_gazetteer(table, output):
+    districts, district_idx = np.unique(table["district"].to_numpy(dtype=str), return_inverse=True)
+    states, state_idx = np.unique(table["state"].to_numpy(dtype=str), return_inverse=True)
+    arrays = {
+        "keys": table.index.to_numpy().astype(np.uint32),
+        "lat": table["lat"].to_numpy(dtype=np.float32),
+        "lon": table["lon"].to_numpy(dtype=np.float32),
+        "district": district_idx.astype(np.uint16),
+        "state": state_idx.astype(np.uint8),
+        "districts": districts,
+        "states": states,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    tmp_path = output + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, output)
+    return arrays
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline pincode gazetteer")
+    parser.add_argument("sources", nargs="*", default=[SEED_CSV], help="CSV files, later ones take precedence")
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args()
+
+    print(f"📮 Reading {len(args.sources)} source(s)")
+    table = build(args.sources)
+    if table.empty:
+        print("❌ No usable rows")
+        return 1
+    arrays = write_gazetteer(table, args.output)
+    print(f"✅ {len(arrays['keys'])} pincodes, {len(arrays['districts'])} districts, "
+          f"{len(arrays['states'])} states -> {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Bulk PDF reports - one crop recommendation report per farmer, e.g. for a village.
+
+    python bulk_reports.py farmers.csv --output village_reports.zip
+    python bulk_reports.py farmers.csv --output village_reports.pdf    # one merged PDF
+
+The CSV needs pincode, land_area (or land) and budget columns. Optional:
+farmer (or name) for the report heading and file name, and the soil readings
+N, P, K and ph - when all four are present and a model is available, its
+probabilities are blended into each farmer's ranking.
+
+Recommendations are computed in the main process (model predictions in one
+batch); PDFs are rendered across a process pool whose workers load the report
+template and crop images once and reuse them for every document.
+"""
+
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from export_pdf import render_reports  # noqa: E402
+
+COLUMN_ALIASES = {"land": "land_area", "name": "farmer", "pin": "pincode", "pin_code": "pincode"}
+SOIL_COLUMNS = ["N", "P", "K", "ph"]
+
+def read_farmers(csv_path):
+    """Rows of the farmers CSV with normalised column names."""
+    farmers = []
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        for i, row in enumerate(csv.DictReader(f), 1):
+            row = {COLUMN_ALIASES.get(k.strip(), k.strip()): (v or "").strip() for k, v in row.items() if k}
+            missing = [c for c in ("pincode", "land_area", "budget") if not row.get(c)]
+            if missing:
+                raise ValueError(f"Row {i}: missing {', '.join(missing)}")
+            row.setdefault("farmer", "")
+            row["farmer"] = row["farmer"] or f"farmer_{i}"
+            farmers.append(row)
+    return farmers
+
+def _conditions(farmers):
+    """Scoring conditions per farmer, looked up in one batch: this month's climate normals at the
+    pincode's location (see climatology.pincode_conditions), with the farmer's soil pH when given."""
+    from climatology import pincode_conditions
+
+    conditions = pincode_conditions([f["pincode"] for f in farmers], month=time.localtime().tm_mon)
+    return [{**c, "ph": float(f["ph"])} if f.get("ph") else c for f, c in zip(farmers, conditions)]
+
+def _model_scores(farmers, conditions):
+    """Model probabilities for every farmer with soil readings, predicted in one batch."""
+    from inference import FEATURE_ORDER, load_model_bundle, proba_by_label, resolve_model_path
+
+    with_soil = [(f, c) for f, c in zip(farmers, conditions) if all(f.get(col) for col in SOIL_COLUMNS)]
+    model_path = resolve_model_path()
+    if not with_soil or not os.path.exists(model_path):
+        return {}
+
+    bundle = load_model_bundle(model_path, os.path.getmtime(model_path))
+    model, encoder = bundle["model"], bundle.get("encoder")
+    rows = []
+    for f, c in with_soil:
+        values = {"N": f["N"], "P": f["P"], "K": f["K"], **c}
+        rows.append([float(values[c]) for c in FEATURE_ORDER])
+
+    if hasattr(model, "feature_names_in_"):
+        import pandas as pd
+        rows = pd.DataFrame(rows, columns=FEATURE_ORDER)
+    probas = model.predict_proba(rows)
+    return {id(f): proba_by_label(model, encoder, p) for (f, _), p in zip(with_soil, probas)}
+
+def batch_recommendations(farmers):
+    """[(recommendations, land_area, heading)] for every farmer, in input order."""
+    from fresh_recommendations import get_fresh_crop_recommendations
+
+    conditions = _conditions(farmers)
+    scores = _model_scores(farmers, conditions)
+    reports = []
+    for f, c in zip(farmers, conditions):
+        land_area, budget = float(f["land_area"]), float(f["budget"])
+        recs = get_fresh_crop_recommendations(f["pincode"], land_area, budget,
+                                              model_proba=scores.get(id(f)), conditions=c)
+        reports.append((recs, land_area, f"Farmer: {f['farmer']}  |  PIN: {f['pincode']}"))
+    return reports
+
+def _init_worker():
+    # Once per process: build the report class and decode every crop image, so
+    # each document reuses them instead of paying for them again
+    from export_pdf import _report_class
+    from image_assets import crop_image_bytes
+    from scoring import load_crop_table
+    _report_class()
+    for label in load_crop_table()["labels"]:
+        crop_image_bytes(label)
+
+def _merge_pdfs(parts):
+    """Concatenate PDF documents (needs the optional pypdf package)."""
+    from pypdf import PdfReader, PdfWriter
+    writer = PdfWriter()
+    for data in parts:
+        writer.append(PdfReader(io.BytesIO(data)))
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+def _file_name(farmer, pincode, used):
+    base = re.sub(r"[^A-Za-z0-9_-]+", "_", farmer).strip("_") or "farmer"
+    name = f"{base}_{pincode}.pdf"
+    n = 2
+    while name in used:
+        name = f"{base}_{pincode}_{n}.pdf"
+        n += 1
+    used.add(name)
+    return name
+
+def main():
+    parser = argparse.ArgumentParser(description="Render crop recommendation PDFs for many farmers")
+    parser.add_argument("farmers_csv")
+    parser.add_argument("--output", default="farmer_reports.zip",
+                        help="a .zip of per-farmer PDFs, or a .pdf to merge every report into one document")
+    parser.add_argument("--workers", type=int, default=0, help="render processes (default: one per CPU)")
+    parser.add_argument("--no-images", action="store_true", help="leave crop images out of the reports")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    farmers = read_farmers(args.farmers_csv)
+    if not farmers:
+        print(f"❌ No farmers in {args.farmers_csv}")
+        return 1
+    reports = batch_recommendations(farmers)
+    recommend_s = time.perf_counter() - start
+    print(f"🌾 Recommendations for {len(farmers)} farmers in {recommend_s:.1f}s")
+
+    include_images = not args.no_images
+    workers = args.workers or os.cpu_count() or 1
+    merge = args.output.lower().endswith(".pdf")
+
+    # fpdf cannot append existing PDFs: with pypdf installed a merged report is rendered
+    # in one chunk per worker and concatenated, otherwise by a single worker
+    import importlib.util
+    if merge and importlib.util.find_spec("pypdf") is None:
+        workers = 1
+
+    render_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        if merge:
+            size = -(-len(reports) // workers)
+            jobs = [pool.submit(render_reports, reports[i:i + size], include_images)
+                    for i in range(0, len(reports), size)]
+            parts = [job.result() for job in jobs]
+            pages = sum(n for _, n in parts)
+            data = parts[0][0] if len(parts) == 1 else _merge_pdfs([d for d, _ in parts])
+            with open(args.output, "wb") as f:
+                f.write(data)
+        else:
+            pages = 0
+            used = set()
+            jobs = [pool.submit(render_reports, [r], include_images) for r in reports]
+            with zipfile.ZipFile(args.output, "w", zipfile.ZIP_STORED) as zf:  # PDFs are already compressed
+                for f, job in zip(farmers, jobs):
+                    data, n = job.result()
+                    zf.writestr(_file_name(f["farmer"], f["pincode"], used), data)
+                    pages += n
+    render_s = time.perf_counter() - render_start
+
+    print(f"📄 Rendered {len(reports)} reports ({pages} pages) in {render_s:.1f}s "
+          f"- {pages / render_s:.1f} pages/s with {workers} worker(s)")
+    print(f"✅ Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
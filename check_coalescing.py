@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Check of request coalescing for recommendations (app/fresh_recommendations.py).
+
+    python check_coalescing.py
+
+Fires identical coalesced_recommendations() calls from several threads at once,
+with the ranking slowed down so they overlap, and verifies:
+  - the ranking runs once and every caller gets the same result
+  - callers whose conditions round to the same key get a result ranked on the
+    rounded conditions, whoever computed it
+  - an exception raised by the computing caller reaches every waiting caller
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+import fresh_recommendations  # noqa: E402
+
+THREADS = 8
+
+class SlowRanking:
+    """Wraps the real ranking: records each call's conditions and holds it long enough to overlap."""
+
+    def __init__(self, fail=False):
+        self.real = fresh_recommendations.get_fresh_crop_recommendations
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, pincode, land_area, budget, model_proba=None, weights=None, conditions=None):
+        self.calls.append(conditions)
+        time.sleep(0.3)
+        if self.fail:
+            raise RuntimeError("ranking failed")
+        return self.real(pincode, land_area, budget, model_proba, weights, conditions)
+
+def concurrently(ranking, calls):
+    """Run each (args, kwargs) of ``calls`` in its own thread, all released together."""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def run(i, args, kwargs):
+        barrier.wait()
+        try:
+            results[i] = fresh_recommendations.coalesced_recommendations(*args, **kwargs)
+        except Exception as e:
+            results[i] = e
+
+    fresh_recommendations.get_fresh_crop_recommendations = ranking
+    try:
+        threads = [threading.Thread(target=run, args=(i, *call)) for i, call in enumerate(calls)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        fresh_recommendations.get_fresh_crop_recommendations = ranking.real
+    return results
+
+def run_checks():
+    checks = []
+    conditions = {"temperature": 27.0, "humidity": 65.0, "rainfall": 120.0, "ph": 6.5}
+
+    # Distinct budgets per check keep the shared result cache from answering instead
+    ranking = SlowRanking()
+    results = concurrently(ranking, [(("110001", 1.0, 41000), {"conditions": conditions})] * THREADS)
+    checks.append(("identical requests: ranked once, same result for all",
+                   len(ranking.calls) == 1 and bool(results[0])
+                   and all(r is results[0] for r in results)))
+
+    ranking = SlowRanking()
+    nearby = [{**conditions, "temperature": 27.0 + i * 0.005} for i in range(THREADS)]
+    results = concurrently(ranking, [(("110001", 1.0, 42000), {"conditions": c}) for c in nearby])
+    expected = fresh_recommendations.get_fresh_crop_recommendations("110001", 1.0, 42000, conditions=conditions)
+    checks.append(("nearby conditions: ranked once on the rounded values",
+                   ranking.calls == [conditions] and all(r == expected for r in results)))
+
+    ranking = SlowRanking(fail=True)
+    results = concurrently(ranking, [(("110001", 1.0, 43000), {"conditions": conditions})] * THREADS)
+    checks.append(("failing ranking: the exception reaches every caller",
+                   len(ranking.calls) == 1
+                   and all(isinstance(r, RuntimeError) and str(r) == "ranking failed" for r in results)))
+    return checks
+
+def main():
+    checks = run_checks()
+    for name, ok in checks:
+        print(f"  {'✅' if ok else '❌'} {name}")
+    failed = [name for name, ok in checks if not ok]
+    print(f"❌ {len(failed)} coalescing check(s) failed" if failed else "✅ Coalescing OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
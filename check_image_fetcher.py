@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Offline check of the crop image fetcher (refresh_crop_images.py) against a local HTTP stub.
+
+    python check_image_fetcher.py
+
+Serves a generated JPEG with an ETag, answers conditional requests with 304 and
+serves a corrupt body on a second path, then runs refresh_images() into a
+temporary directory and verifies:
+  - a first run downloads the image and records it in the manifest
+  - a second run sends If-None-Match and gets 304 without rewriting the file
+  - a corrupt body fails and leaves the existing file in place
+  - --force on one crop re-downloads it and keeps the other crops' manifest entries
+"""
+
+import io
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from refresh_crop_images import MANIFEST_NAME, file_sha256, load_manifest, refresh_images
+
+ETAG = '"stub-v1"'
+
+def _jpeg():
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 24), (46, 139, 87)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+class StubHandler(BaseHTTPRequestHandler):
+    image = b""
+    requests = []  # (path, If-None-Match) per request
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path.startswith("/corrupt"):
+            body = b"\xff\xd8 this is not a jpeg"
+        elif self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        else:
+            body = self.image
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def run_checks(base_url, images_dir):
+    checks = []
+    urls = {"rice": f"{base_url}/rice.jpg", "wheat": f"{base_url}/wheat.jpg"}
+
+    results = refresh_images(urls, images_dir, workers=2, min_interval=0)
+    manifest = load_manifest(images_dir)
+    checks.append(("200: downloaded and recorded",
+                   all(results[c][0] == "downloaded" for c in urls)
+                   and manifest["rice"]["etag"] == ETAG
+                   and manifest["rice"]["sha256"] == file_sha256(Path(images_dir) / "rice.jpg")))
+
+    StubHandler.requests.clear()
+    mtime = (Path(images_dir) / "rice.jpg").stat().st_mtime_ns
+    results = refresh_images(urls, images_dir, workers=2, min_interval=0)
+    checks.append(("304: conditional request, file untouched",
+                   all(results[c][0] == "not_modified" for c in urls)
+                   and all(etag == ETAG for _, etag in StubHandler.requests)
+                   and (Path(images_dir) / "rice.jpg").stat().st_mtime_ns == mtime))
+
+    before = file_sha256(Path(images_dir) / "rice.jpg")
+    results = refresh_images({"rice": f"{base_url}/corrupt/rice.jpg"}, images_dir, min_interval=0)
+    checks.append(("corrupt body: failed, existing file kept",
+                   results["rice"][0] == "failed" and file_sha256(Path(images_dir) / "rice.jpg") == before
+                   and not list(Path(images_dir).glob(".*.tmp"))))
+
+    StubHandler.requests.clear()
+    results = refresh_images({"rice": urls["rice"]}, images_dir, min_interval=0, force=True)
+    manifest = load_manifest(images_dir)
+    checks.append(("--force on a subset: unconditional, other entries kept",
+                   results["rice"][0] in ("downloaded", "unchanged")
+                   and StubHandler.requests == [("/rice.jpg", None)]
+                   and set(manifest) == {"rice", "wheat"}))
+    return checks
+
+def main():
+    StubHandler.image = _jpeg()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as images_dir:
+            checks = run_checks(f"http://127.0.0.1:{server.server_port}", images_dir)
+            assert (Path(images_dir) / MANIFEST_NAME).exists()
+    finally:
+        server.shutdown()
+
+    for name, ok in checks:
+        print(f"  {'✅' if ok else '❌'} {name}")
+    failed = [name for name, ok in checks if not ok]
+    print(f"❌ {len(failed)} image fetcher check(s) failed" if failed else "✅ Image fetcher OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the Streamlit app's cold start.
+
+Executes app/app.py in bare mode under `python -X importtime`, sums the
+top-level import cost and fails when it exceeds the budget or when a module
+that should only load on demand (model, PDF and imaging libraries) is pulled
+in at startup. Modules Streamlit itself imports are measured separately and
+not counted as regressions.
+
+    python check_import_time.py --budget-ms 1500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(ROOT, "app", "app.py")
+
+# Loaded lazily on first use - importing any of these at startup is a regression
+DEFERRED_MODULES = ["sklearn", "joblib", "fpdf", "PIL", "plotly", "matplotlib", "seaborn", "xgboost", "geopy"]
+
+# What the framework loads on its own, before any app code runs
+FRAMEWORK_IMPORTS = "import streamlit, streamlit_option_menu"
+
+def measure_imports(*args):
+    """Run python -X importtime with ``args``; return {module: cumulative_us} for every import."""
+    env = dict(os.environ)
+    env.setdefault("OPENWEATHER_API_KEY", "import-time-check")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|", 2)
+        modules[name[1:].rstrip()] = int(cumulative_us)
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when app startup imports exceed the budget")
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="maximum total top-level import time in milliseconds")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    modules = measure_imports(APP_PATH)
+    if not modules:
+        print("❌ No import timings captured - did app/app.py fail to run?")
+        return 2
+
+    # Top-level entries have no leading indentation in the module column
+    top_level = {name.strip(): us for name, us in modules.items() if not name.startswith("  ")}
+    total_ms = sum(top_level.values()) / 1000
+    loaded = {name.strip().split(".")[0] for name in modules}
+    framework = {name.strip().split(".")[0] for name in measure_imports("-c", FRAMEWORK_IMPORTS)}
+
+    print(f"📦 Startup imports: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"   {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [name for name in DEFERRED_MODULES if name in loaded and name not in framework]
+    if eager:
+        print(f"❌ Imported at startup but should be deferred: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ Over budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ Import budget OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
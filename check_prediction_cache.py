@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Check of the model prediction cache (app/inference.py).
+
+    python check_prediction_cache.py
+
+Trains a tiny forest on random data (no crop_model.pkl needed), saves it to a
+temporary bundle and verifies:
+  - inputs that quantize to the same vector are a hit
+  - the least recently used entry is evicted at maxsize
+  - loading a new version of the model file (changed mtime) invalidates the cache
+  - returned probability arrays are read-only
+"""
+
+import os
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from inference import PREDICTION_CACHE, PredictionCache, load_model_bundle, predict_proba_cached  # noqa: E402
+
+FEATURES = (90, 42, 43, 20.88, 82.0, 6.5, 202.94)
+
+def tiny_model(seed=0):
+    rng = np.random.default_rng(seed)
+    model = RandomForestClassifier(n_estimators=3, random_state=seed)
+    return model.fit(rng.uniform(0, 100, (60, 7)), rng.integers(0, 3, 60))
+
+def run_checks(model_path):
+    checks = []
+    model = tiny_model()
+
+    cache = PredictionCache(maxsize=2)
+    first = cache.predict_proba(model, FEATURES)
+    # 20.88 -> 20.9 and 202.94 -> 202.9 at the cache's 0.1 resolution
+    again = cache.predict_proba(model, (90.2, 42, 43, 20.91, 82.04, 6.5, 202.9))
+    checks.append(("quantized-equal inputs: hit, same array",
+                   again is first and cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1))
+
+    checks.append(("returned array is read-only", not first.flags.writeable and _write_fails(first)))
+
+    second = (10, 20, 30, 25.0, 60.0, 7.0, 100.0)
+    third = (50, 50, 50, 30.0, 70.0, 6.0, 150.0)
+    cache.predict_proba(model, second)
+    cache.predict_proba(model, FEATURES)  # FEATURES is now the most recent, second the LRU
+    cache.predict_proba(model, third)
+    misses = cache.stats()["misses"]
+    cache.predict_proba(model, FEATURES)
+    cache.predict_proba(model, second)
+    checks.append(("LRU eviction at maxsize",
+                   cache.stats()["size"] == 2 and cache.stats()["misses"] == misses + 1))
+
+    joblib.dump({"model": model, "encoder": None}, model_path)
+    mtime = os.path.getmtime(model_path)
+    bundle = load_model_bundle(model_path, mtime)
+    predict_proba_cached(bundle["model"], FEATURES)
+    cached = PREDICTION_CACHE.stats()["size"]
+    joblib.dump({"model": tiny_model(seed=1), "encoder": None}, model_path)
+    os.utime(model_path, (mtime + 10, mtime + 10))
+    reloaded = load_model_bundle(model_path, os.path.getmtime(model_path))
+    misses = PREDICTION_CACHE.stats()["misses"]
+    proba = predict_proba_cached(reloaded["model"], FEATURES)
+    checks.append(("new model version: cache cleared, prediction from the new model",
+                   cached == 1 and reloaded is not bundle and PREDICTION_CACHE.stats()["misses"] == misses + 1
+                   and np.array_equal(proba, reloaded["model"].predict_proba([FEATURES])[0])))
+    return checks
+
+def _write_fails(array):
+    try:
+        array[0] = 1.0
+    except ValueError:
+        return True
+    return False
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        checks = run_checks(os.path.join(tmp, "crop_model.pkl"))
+
+    for name, ok in checks:
+        print(f"  {'✅' if ok else '❌'} {name}")
+    failed = [name for name, ok in checks if not ok]
+    print(f"❌ {len(failed)} prediction cache check(s) failed" if failed else "✅ Prediction cache OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Offline check of the shared result cache (app/cache_backend.py).
+
+    python check_shared_cache.py
+
+Runs SharedCache over the in-memory and SQLite backends (the SQLite file is
+opened by two caches, as two workers would) and verifies:
+  - a hit after a miss returns the same value, with the same types, without recomputing
+  - entries expire after their TTL
+  - a new version (e.g. a changed dataset) is a miss
+  - a failing backend counts as an error and a miss, and never raises
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from cache_backend import MemoryBackend, SharedCache, SQLiteBackend  # noqa: E402
+
+class FailingBackend:
+    name = "failing"
+
+    def get(self, key):
+        raise ConnectionError("cache server unreachable")
+
+    def set(self, key, data, ttl):
+        raise ConnectionError("cache server unreachable")
+
+class Compute:
+    """A compute function that counts its calls and returns tuples and numpy values."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+def run_checks(name, writer, reader):
+    checks = []
+    value = {"crop": "rice", "scores": (np.float64(0.75), np.int64(3)), "tips": ("a", "b")}
+
+    compute = Compute(value)
+    miss = writer.get_or_compute("recommendations", ("110001", 1.0), compute, ttl=60, version="v1")
+    hit = reader.get_or_compute("recommendations", ("110001", 1.0), compute, ttl=60, version="v1")
+    checks.append((f"{name}: hit after a miss, same value and types, computed once",
+                   compute.calls == 1 and miss == hit == {"crop": "rice", "scores": [0.75, 3], "tips": ["a", "b"]}
+                   and [type(v) for v in miss["scores"]] == [type(v) for v in hit["scores"]] == [float, int]))
+
+    compute = Compute([1, 2])
+    writer.get_or_compute("weather", "tile", compute, ttl=0.2, version="v1")
+    time.sleep(0.3)
+    reader.get_or_compute("weather", "tile", compute, ttl=0.2, version="v1")
+    checks.append((f"{name}: expired after its TTL", compute.calls == 2))
+
+    compute = Compute([1, 2])
+    writer.get_or_compute("recommendations", "key", compute, ttl=60, version="v1")
+    reader.get_or_compute("recommendations", "key", compute, ttl=60, version="v2")
+    checks.append((f"{name}: new version is a miss", compute.calls == 2))
+    return checks
+
+def check_failing_backend():
+    cache = SharedCache(FailingBackend())
+    compute = Compute((1, 2))
+    try:
+        value = cache.get_or_compute("recommendations", "key", compute, ttl=60)
+    except Exception:
+        return [("failing backend: no exception", False)]
+    stats = cache.stats()
+    return [("failing backend: computed, counted as an error and a miss, no exception",
+             value == [1, 2] and compute.calls == 1 and stats["misses"] == 1 and stats["hits"] == 0
+             and stats["errors"] == 2)]
+
+def main():
+    logging.getLogger("krishimitra").setLevel(logging.ERROR)  # the failing backend logs warnings
+
+    memory = SharedCache(MemoryBackend())
+    checks = run_checks("memory", memory, memory)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        checks += run_checks("sqlite", SharedCache(SQLiteBackend(path)), SharedCache(SQLiteBackend(path)))
+    checks += check_failing_backend()
+
+    for name, ok in checks:
+        print(f"  {'✅' if ok else '❌'} {name}")
+    failed = [name for name, ok in checks if not ok]
+    print(f"❌ {len(failed)} shared cache check(s) failed" if failed else "✅ Shared cache OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
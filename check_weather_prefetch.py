@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Check of the background weather prefetcher (app/weather_prefetch.py).
+
+    python check_weather_prefetch.py
+
+Drives WeatherPrefetcher.tick() by hand against a private WeatherTileCache and
+verifies:
+  - refreshes use the prefetcher's own fetch function, not the foreground one
+  - a tile whose refresh fails is skipped until its backoff (lead_time) has passed
+  - the backoff doubles after a second failure
+  - a successful refresh clears the backoff
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from weather_cache import WeatherTileCache  # noqa: E402
+from weather_prefetch import WeatherPrefetcher  # noqa: E402
+
+LEAD_TIME = 0.3
+
+class Fetch:
+    """Counts calls; returns ``value`` (None is a failed fetch)."""
+
+    def __init__(self, value=None):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self, lat, lon):
+        self.calls += 1
+        return self.value
+
+def run_checks():
+    checks = []
+    # A kind of its own keeps results in the process's shared cache from answering
+    kind = f"check-{os.getpid()}-{time.time()}"
+    cache = WeatherTileCache(ttl=10 * LEAD_TIME)
+    foreground, background = Fetch(), Fetch()
+    cache.get(28.61, 77.21, foreground, kind)  # one request makes the tile hot (and fails)
+    prefetcher = WeatherPrefetcher(cache=cache, budget=100, interval=LEAD_TIME, lead_time=LEAD_TIME,
+                                   fetchers={kind: background})
+
+    first = prefetcher.tick()
+    checks.append(("refresh uses the prefetcher's fetch",
+                   first == 1 and background.calls == 1 and foreground.calls == 1))
+
+    skipped = [prefetcher.tick() for _ in range(5)]
+    checks.append(("failing tile skipped during its backoff",
+                   skipped == [0] * 5 and background.calls == 1 and prefetcher.stats()["calls_last_hour"] == 1))
+
+    time.sleep(LEAD_TIME * 1.2)
+    retried = prefetcher.tick()
+    time.sleep(LEAD_TIME * 1.2)  # past one lead_time, inside the doubled backoff
+    doubled = prefetcher.tick()
+    checks.append(("retried after lead_time, then backoff doubles",
+                   retried == 1 and doubled == 0 and background.calls == 2))
+
+    background.value = (25.0, 60.0, 3.0)
+    time.sleep(LEAD_TIME * 1.4)  # past the doubled backoff
+    refreshed = prefetcher.tick()
+    stats = prefetcher.stats()
+    checks.append(("success clears the backoff",
+                   refreshed == 1 and stats["refreshed"] == 1 and stats["failing_tiles"] == 0
+                   and cache.expires_in(cache.key(28.61, 77.21, kind)) is not None))
+    return checks
+
+def main():
+    checks = run_checks()
+    for name, ok in checks:
+        print(f"  {'✅' if ok else '❌'} {name}")
+    failed = [name for name, ok in checks if not ok]
+    print(f"❌ {len(failed)} weather prefetch check(s) failed" if failed else "✅ Weather prefetch OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Distill the full crop forest (crop_model.pkl) into a compact, quantized student
+model (crop_model_lite.pkl) for low-latency inference.
+
+Run train_model.py first, then:
+    python distill_model.py
+Serve it with KRISHIMITRA_MODEL_VARIANT=lite.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from compact_model import CompactForest  # noqa: E402
+
+FEATURES = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+
+def augment(X, copies, rng):
+    """Jitter the training rows so the student sees the teacher's decision boundaries."""
+    scale = X.std(axis=0) * 0.05
+    noisy = [X + rng.normal(0.0, scale, size=X.shape) for _ in range(copies)]
+    return np.vstack([X] + noisy)
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill crop_model.pkl into a compact student")
+    parser.add_argument("--teacher", default="crop_model.pkl")
+    parser.add_argument("--output", default="crop_model_lite.pkl")
+    parser.add_argument("--data", default="Crop_recommendation.csv")
+    parser.add_argument("--trees", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--augment", type=int, default=10, help="jittered copies of each training row")
+    args = parser.parse_args()
+
+    bundle = joblib.load(args.teacher)
+    teacher, encoder = bundle["model"], bundle["encoder"]
+
+    # 1. Same split as train_model.py so agreement is measured on unseen rows
+    df = pd.read_csv(args.data)
+    X = df[FEATURES].to_numpy(dtype=np.float64)
+    y = encoder.transform(df["label"])
+    X_train, X_test, _, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # 2. Soft targets from the teacher on real + jittered rows
+    rng = np.random.default_rng(42)
+    X_distill = augment(X_train, args.augment, rng)
+    soft_targets = teacher.predict_proba(pd.DataFrame(X_distill, columns=FEATURES))
+
+    # 3. Fit a small depth-capped forest against predict_proba and pack it
+    student_fit = RandomForestRegressor(
+        n_estimators=args.trees, max_depth=args.depth, random_state=42, n_jobs=-1
+    )
+    student_fit.fit(X_distill, soft_targets)
+    student = CompactForest.from_sklearn(student_fit, teacher.classes_)
+
+    # 4. Report agreement with the teacher
+    X_test_df = pd.DataFrame(X_test, columns=FEATURES)
+    teacher_pred = teacher.predict(X_test_df)
+    student_pred = student.predict(X_test)
+    agreement = float(np.mean(teacher_pred == student_pred))
+
+    teacher_top3 = np.argsort(-teacher.predict_proba(X_test_df), axis=1)[:, :3]
+    student_top1 = np.argmax(student.predict_proba(X_test), axis=1)
+    top3_agreement = float(np.mean([s in t for s, t in zip(student_top1, teacher_top3)]))
+
+    # 5. Single-row latency, which is what the app pays per request
+    sample = X_test[:1]
+    for _ in range(100):
+        student.predict_proba(sample)
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        student.predict_proba(sample)
+    latency_us = (time.perf_counter() - start) / runs * 1e6
+
+    joblib.dump({"model": student, "encoder": encoder}, args.output, compress=3)
+
+    print(f"✅ Student saved as {args.output}")
+    print(f"   Trees: {args.trees}, max depth: {student.max_depth}, nodes: {len(student.feature)}")
+    print(f"   Teacher agreement (top-1): {agreement:.2%}")
+    print(f"   Student top-1 within teacher top-3: {top3_agreement:.2%}")
+    print(f"   Packed arrays: {student.nbytes() / 1024:.1f} KB, artifact: {os.path.getsize(args.output) / 1024:.1f} KB")
+    print(f"   Single prediction latency: {latency_us:.1f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+krishimitra-assets - crop image maintenance
+
+    python krishimitra_assets.py verify [--fix]             # decode every image, report missing/corrupt
+    python krishimitra_assets.py fetch [crop ...]           # download images (see refresh_crop_images.py)
+    python krishimitra_assets.py placeholder [crop ...]     # render placeholders for crops without images
+    python krishimitra_assets.py thumbnail [--size 300]     # write downsized copies to images/thumbnails/
+
+PIL work (verification, placeholder rendering, thumbnails) runs in a process
+pool across all crops. Every command prints a summary and can write a JSON
+report with --report.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "app"))
+from image_assets import IMAGES_DIR, image_index, inspect_image, make_thumbnail, render_placeholder  # noqa: E402
+from refresh_crop_images import CROP_SPECIFIC_URLS, atomic_write, refresh_images  # noqa: E402
+
+CORRUPTED_DIR = ".corrupted"
+
+def required_crops(csv_path=ROOT / "Crop_recommendation.csv"):
+    """Crop labels the app can recommend, read without loading pandas."""
+    import csv
+    with open(csv_path, newline="") as f:
+        return sorted({row["label"] for row in csv.DictReader(f)})
+
+def _pool(workers):
+    return ProcessPoolExecutor(max_workers=workers or None)
+
+def _write_placeholders(crops, images_dir, workers):
+    with _pool(workers) as pool:
+        rendered = pool.map(render_placeholder, crops)
+        for crop, data in zip(crops, rendered):
+            atomic_write(Path(images_dir) / f"{crop}.jpg", data)
+    return [f"{crop}.jpg" for crop in crops]
+
+def _thumbnail_file(path, size):
+    try:
+        with open(path, "rb") as f:
+            return make_thumbnail(f.read(), size)
+    except Exception:
+        return None  # unreadable - `verify` reports why
+
+def cmd_verify(args):
+    index = image_index(args.images_dir)
+    paths = sorted(index.values())
+    with _pool(args.workers) as pool:
+        files = list(pool.map(inspect_image, paths, chunksize=4))
+
+    corrupt = [r["file"] for r in files if not r["ok"]]
+    missing = [c for c in required_crops() if c.lower() not in index]
+    report = {"images": len(files), "corrupt": corrupt, "missing": missing, "files": files}
+
+    if args.fix and (corrupt or missing):
+        # Keep corrupt originals out of the image index instead of deleting them
+        backup_dir = Path(args.images_dir) / CORRUPTED_DIR
+        backup_dir.mkdir(exist_ok=True)
+        for name in corrupt:
+            shutil.move(str(Path(args.images_dir) / name), str(backup_dir / name))
+        crops = [os.path.splitext(name)[0].lower() for name in corrupt] + missing
+        report["regenerated"] = _write_placeholders(crops, args.images_dir, args.workers)
+
+    for r in files:
+        print(f"  {'✅' if r['ok'] else '❌'} {r['file']}" + ("" if r["ok"] else f" - {r['error']}"))
+    print(f"📊 {len(files) - len(corrupt)}/{len(files)} images valid, {len(missing)} required crops missing")
+    return report, bool(corrupt or missing) and not args.fix
+
+def cmd_fetch(args):
+    urls = {c: u for c, u in CROP_SPECIFIC_URLS.items() if not args.crops or c in args.crops}
+    results = refresh_images(urls, args.images_dir, workers=args.fetch_workers,
+                             min_interval=args.min_interval, force=args.force)
+    failed = [c for c, (status, _) in results.items() if status == "failed"]
+    for crop, (status, message) in results.items():
+        print(f"  {'❌' if status == 'failed' else '✅'} {crop}: {status} ({message})")
+    return {"results": {c: {"status": s, "message": m} for c, (s, m) in results.items()}, "failed": failed}, bool(failed)
+
+def cmd_placeholder(args):
+    index = image_index(args.images_dir)
+    crops = args.crops or required_crops()
+    if not args.force:
+        crops = [c for c in crops if c.lower() not in index]
+    written = _write_placeholders(crops, args.images_dir, args.workers)
+    print(f"🎨 Rendered {len(written)} placeholders" + (f": {', '.join(written)}" if written else ""))
+    return {"written": written}, False
+
+def cmd_thumbnail(args):
+    out_dir = Path(args.output_dir or Path(args.images_dir) / "thumbnails")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = image_index(args.images_dir)
+    with _pool(args.workers) as pool:
+        results = list(pool.map(partial(_thumbnail_file, size=args.size), index.values(), chunksize=4))
+    written, skipped = {}, []
+    for crop, result in zip(index, results):
+        if result is None:
+            skipped.append(crop)
+            continue
+        data, width, height = result
+        atomic_write(out_dir / f"{crop}.jpg", data)
+        written[crop] = {"width": width, "height": height, "bytes": len(data)}
+    print(f"🖼️ Wrote {len(written)} thumbnails to {out_dir}" + (f", skipped unreadable: {', '.join(skipped)}" if skipped else ""))
+    return {"output_dir": str(out_dir), "thumbnails": written, "skipped": skipped}, bool(skipped)
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--images-dir", default=str(IMAGES_DIR))
+    common.add_argument("--workers", type=int, default=0, help="worker processes (default: one per CPU)")
+    common.add_argument("--report", help="write a JSON report to this file ('-' for stdout)")
+
+    parser = argparse.ArgumentParser(prog="krishimitra-assets", description="KrishiMitra crop image maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    verify = sub.add_parser("verify", parents=[common], help="decode every image and list corrupt or missing crops")
+    verify.add_argument("--fix", action="store_true", help="replace corrupt and missing images with placeholders")
+    verify.set_defaults(func=cmd_verify)
+
+    fetch = sub.add_parser("fetch", parents=[common], help="download crop images")
+    fetch.add_argument("crops", nargs="*")
+    fetch.add_argument("--fetch-workers", type=int, default=4, help="concurrent downloads")
+    fetch.add_argument("--min-interval", type=float, default=0.25,
+                       help="average seconds between requests per host (after a burst of --fetch-workers)")
+    fetch.add_argument("--force", action="store_true", help="re-download without conditional requests")
+    fetch.set_defaults(func=cmd_fetch)
+
+    placeholder = sub.add_parser("placeholder", parents=[common], help="render placeholder images")
+    placeholder.add_argument("crops", nargs="*", help="default: every dataset crop without an image")
+    placeholder.add_argument("--force", action="store_true", help="overwrite existing images")
+    placeholder.set_defaults(func=cmd_placeholder)
+
+    thumbnail = sub.add_parser("thumbnail", parents=[common], help="write downsized JPEG copies of every image")
+    thumbnail.add_argument("--size", type=int, default=300)
+    thumbnail.add_argument("--output-dir", default=None)
+    thumbnail.set_defaults(func=cmd_thumbnail)
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    report, failed = args.func(args)
+    report = {"command": args.command, "seconds": round(time.perf_counter() - start, 3), **report}
+    print(f"⏱️ {args.command} finished in {report['seconds']:.2f}s")
+
+    if args.report == "-":
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    elif args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
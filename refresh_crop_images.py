@@ -1,17 +1,35 @@
 #!/usr/bin/env python3
 """
-Refresh Crop Images - Re-downloads all crop images with specific URLs
+Refresh Crop Images - Re-downloads crop images with specific URLs
+
+Downloads run concurrently over one shared session with a per-host token-bucket
+rate limit. Each file is written atomically, and images/.manifest.json records
+each file's ETag, Last-Modified and sha256, so later runs send conditional
+requests and skip images that have not changed. A failed download leaves the
+existing file in place.
+
+    python refresh_crop_images.py [--workers 4] [--min-interval 0.25] [--force] [crop ...]
 """
 
+import argparse
+import hashlib
+import io
+import json
 import os
-import requests
-from PIL import Image
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Configuration
-IMAGES_DIR = Path("images")
-IMAGES_DIR.mkdir(exist_ok=True)
+IMAGES_DIR = Path(__file__).resolve().parent / "images"
+MANIFEST_NAME = ".manifest.json"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
 # Specific high-quality image URLs for each crop
 CROP_SPECIFIC_URLS = {
@@ -40,78 +58,192 @@ CROP_SPECIFIC_URLS = {
     'pomegranate': 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&q=80',  # Pomegranate
 }
 
-def download_image(url, filename):
-    """Download an image from URL"""
+class HostRateLimiter:
+    """Per-host token bucket, shared across threads: up to ``burst`` requests at once, then
+    one every ``min_interval`` seconds on average."""
+
+    def __init__(self, min_interval=0.25, burst=4):
+        self.min_interval = min_interval
+        self.burst = burst
+        self._buckets = {}  # host -> (tokens, last refill time)
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                if self.min_interval > 0:
+                    tokens = min(self.burst, tokens + (now - last) / self.min_interval)
+                else:
+                    tokens = self.burst
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                delay = (1 - tokens) * self.min_interval
+            time.sleep(delay)
+
+def make_session(workers=4):
+    """Shared session with a connection pool sized for the worker threads."""
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(images_dir=IMAGES_DIR):
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        print(f"  📥 Downloading from: {url[:60]}...")
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Save the image
-        with open(filename, 'wb') as f:
-            f.write(response.content)
-        
-        # Verify it's a valid image
-        img = Image.open(filename)
+        with open(Path(images_dir) / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def atomic_write(path, data):
+    """Write ``data`` next to ``path`` and rename it into place, so readers never see a partial file."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def save_manifest(manifest, images_dir=IMAGES_DIR):
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    atomic_write(Path(images_dir) / MANIFEST_NAME, data)
+
+def image_size(data):
+    """Verify downloaded bytes are a readable image and return (width, height)."""
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as img:
+        size = img.size
         img.verify()
-        
-        # Reload image to get size info
-        img = Image.open(filename)
-        print(f"  ✅ Downloaded: {filename.name} ({img.size[0]}x{img.size[1]})")
-        return True
-        
+    return size
+
+def image_paths(crop_names, images_dir=IMAGES_DIR):
+    """Target file per crop, reusing an existing file whose name differs only in case."""
+    existing = {name.lower(): name for name in os.listdir(images_dir)}
+    return {c: Path(images_dir) / existing.get(f"{c.lower()}.jpg", f"{c}.jpg") for c in crop_names}
+
+def fetch_image(session, url, path, entry=None, limiter=None, timeout=30, conditional=True):
+    """Fetch one crop image into ``path``; returns (status, manifest entry, message).
+
+    status is "downloaded", "not_modified", "unchanged" or "failed". ``conditional=False``
+    always downloads, ignoring the stored ETag/Last-Modified.
+    """
+    path = Path(path)
+    entry = dict(entry or {})
+
+    # Only trust the validators when the file on disk is the one they describe
+    current_hash = file_sha256(path) if path.exists() else None
+    headers = {}
+    if conditional and current_hash and entry.get("sha256") == current_hash and entry.get("url") == url:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        if limiter:
+            limiter.wait(url)
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return "not_modified", entry, "not modified"
+        response.raise_for_status()
+
+        data = response.content
+        width, height = image_size(data)
+        new_hash = hashlib.sha256(data).hexdigest()
+        entry.update({
+            "url": url,
+            "file": path.name,
+            "sha256": new_hash,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        })
+        if new_hash == current_hash:
+            return "unchanged", entry, "content unchanged"
+
+        atomic_write(path, data)
+        return "downloaded", entry, f"{width}x{height}, {len(data) // 1024} KB"
     except Exception as e:
-        print(f"  ❌ Download failed: {e}")
-        if os.path.exists(filename):
-            os.remove(filename)
-        return False
+        return "failed", entry, str(e)
+
+def refresh_images(urls=CROP_SPECIFIC_URLS, images_dir=IMAGES_DIR, session=None, workers=4,
+                   min_interval=0.25, force=False):
+    """Fetch every crop in ``urls`` concurrently and update the manifest; returns {crop: (status, message)}.
+
+    ``force`` re-downloads the crops in ``urls`` unconditionally; manifest entries of
+    other crops are kept.
+    """
+    images_dir = Path(images_dir)
+    images_dir.mkdir(exist_ok=True)
+    manifest = load_manifest(images_dir)
+    session = session or make_session(workers)
+    limiter = HostRateLimiter(min_interval, burst=workers)
+    paths = image_paths(urls, images_dir)
+
+    def run(item):
+        crop_name, url = item
+        return crop_name, fetch_image(session, url, paths[crop_name], manifest.get(crop_name), limiter,
+                                      conditional=not force)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for crop_name, (status, entry, message) in pool.map(run, urls.items()):
+            results[crop_name] = (status, message)
+            if status != "failed":
+                manifest[crop_name] = entry
+
+    save_manifest(manifest, images_dir)
+    return results
+
+STATUS_ICONS = {"downloaded": "✅", "not_modified": "💤", "unchanged": "💤", "failed": "❌"}
 
 def main():
-    print("🔄 Refreshing All Crop Images")
+    parser = argparse.ArgumentParser(description="Refresh crop images")
+    parser.add_argument("crops", nargs="*", help="only refresh these crops (default: all)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--min-interval", type=float, default=0.25,
+                        help="average seconds between requests to the same host (after a burst of --workers)")
+    parser.add_argument("--force", action="store_true", help="re-download without conditional requests")
+    parser.add_argument("--images-dir", default=str(IMAGES_DIR))
+    args = parser.parse_args()
+
+    urls = {c: u for c, u in CROP_SPECIFIC_URLS.items() if not args.crops or c in args.crops}
+    print("🔄 Refreshing Crop Images")
     print("=" * 50)
-    
-    success_count = 0
-    total_crops = len(CROP_SPECIFIC_URLS)
-    
-    for i, (crop_name, url) in enumerate(CROP_SPECIFIC_URLS.items(), 1):
-        print(f"[{i}/{total_crops}] {crop_name.title()}")
-        
-        filename = IMAGES_DIR / f"{crop_name}.jpg"
-        
-        # Remove old file if it exists
-        if filename.exists():
-            filename.unlink()
-        
-        if download_image(url, filename):
-            success_count += 1
-        
-        print()
-        
-        # Rate limiting to be respectful to the server
-        if i < total_crops:
-            time.sleep(1)
-    
+
+    start = time.perf_counter()
+    results = refresh_images(urls, args.images_dir, workers=args.workers,
+                             min_interval=args.min_interval, force=args.force)
+    for crop_name, (status, message) in results.items():
+        print(f"  {STATUS_ICONS[status]} {crop_name}: {message}")
+
+    failed = [c for c, (status, _) in results.items() if status == "failed"]
+    fetched = sum(1 for status, _ in results.values() if status == "downloaded")
     print("=" * 50)
-    print(f"✅ Refresh Complete!")
-    print(f"   Successfully downloaded: {success_count}/{total_crops} images")
-    
-    if success_count == total_crops:
-        print("🎉 All crop images are now unique and specific!")
-    else:
-        failed = total_crops - success_count
-        print(f"⚠️ {failed} images need manual attention")
+    print(f"✅ Refresh Complete in {time.perf_counter() - start:.1f}s!")
+    print(f"   Downloaded: {fetched}, up to date: {len(results) - fetched - len(failed)}, failed: {len(failed)}")
+    if failed:
+        print(f"⚠️ {len(failed)} images need manual attention: {', '.join(failed)}")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
     try:
-        main()
+        raise SystemExit(main())
     except KeyboardInterrupt:
         print("\n⚠️ Download cancelled by user")
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Fold accumulated farmer feedback into crop_model.pkl without a full refit.
+
+New trees are grown on the latest feedback batch (plus a small stratified replay
+sample of Crop_recommendation.csv so every crop class stays represented) and
+appended to the existing forest with warm_start. The updated bundle is published
+atomically as a new model version.
+
+    python update_model.py                # fold in everything since the last update
+    python update_model.py --trees 10 --max-trees 300
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from feedback_store import database_id, fetch_feedback  # noqa: E402
+from inference import FEATURE_ORDER  # noqa: E402
+
+def replay_sample(data_path, per_class, seed):
+    """A few rows of every crop from the base dataset so new trees see all classes."""
+    df = pd.read_csv(data_path)
+    per_class = min(per_class, int(df["label"].value_counts().min()))
+    return df.groupby("label").sample(n=per_class, random_state=seed).reset_index(drop=True)
+
+def publish(bundle, model_path, versions_dir):
+    """Atomically replace model_path and keep a copy of this version."""
+    model_dir = os.path.dirname(os.path.abspath(model_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".pkl", dir=model_dir)
+    os.close(fd)
+    try:
+        joblib.dump(bundle, tmp_path)
+        os.makedirs(versions_dir, exist_ok=True)
+        shutil.copyfile(tmp_path, os.path.join(versions_dir, f"crop_model_v{bundle['version']}.pkl"))
+        os.replace(tmp_path, model_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally update crop_model.pkl from farmer feedback")
+    parser.add_argument("--model", default="crop_model.pkl")
+    parser.add_argument("--data", default="Crop_recommendation.csv")
+    parser.add_argument("--db", default=None, help="feedback database (default: KRISHIMITRA_FEEDBACK_DB or feedback.db)")
+    parser.add_argument("--versions-dir", default="model_versions")
+    parser.add_argument("--trees", type=int, default=10, help="trees grown per update")
+    parser.add_argument("--max-trees", type=int, default=300, help="oldest trees are retired beyond this")
+    parser.add_argument("--replay-per-class", type=int, default=20)
+    parser.add_argument("--min-batch", type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bundle = joblib.load(args.model)
+    model, encoder = bundle["model"], bundle["encoder"]
+    if not hasattr(model, "estimators_") or not hasattr(model, "warm_start"):
+        print("❌ Incremental updates need the full forest bundle from train_model.py")
+        return 1
+
+    # 1. New feedback since the last published version. The cursor only counts for the
+    # database it was read from; a bundle trained elsewhere starts from the first row
+    db_id = database_id(args.db)
+    since_id = bundle.get("feedback_rowid", 0) if bundle.get("feedback_db") == db_id else 0
+    features, labels, last_id = fetch_feedback(since_id, args.db)
+    known = set(encoder.classes_)
+    batch = [(f, l) for f, l in zip(features, labels) if l in known]
+    skipped = len(features) - len(batch)
+    if len(batch) < args.min_batch:
+        print(f"ℹ️ {len(batch)} new feedback rows (need {args.min_batch}); model unchanged")
+        return 0
+
+    # 2. Batch + replay sample keeps the class set identical to the existing trees
+    feedback_df = pd.DataFrame([f for f, _ in batch], columns=FEATURE_ORDER)
+    feedback_df["label"] = [l for _, l in batch]
+    train_df = pd.concat([feedback_df, replay_sample(args.data, args.replay_per_class, last_id)], ignore_index=True)
+    X = train_df[FEATURE_ORDER]
+    y = encoder.transform(train_df["label"])
+
+    # 3. Grow new trees on top of the existing forest
+    model.warm_start = True
+    model.n_estimators = len(model.estimators_) + args.trees
+    model.fit(X, y)
+    if len(model.estimators_) > args.max_trees:
+        model.estimators_ = model.estimators_[-args.max_trees:]
+        model.n_estimators = len(model.estimators_)
+    model.warm_start = False
+
+    # 4. Publish the new version
+    bundle.update({
+        "model": model,
+        "version": bundle.get("version", 0) + 1,
+        "feedback_rowid": last_id,
+        "feedback_db": db_id,
+        "updated_at": time.time(),
+    })
+    publish(bundle, args.model, args.versions_dir)
+
+    print(f"✅ Published model version {bundle['version']} in {time.perf_counter() - start:.1f}s")
+    print(f"   Feedback rows folded in: {len(batch)} (skipped {skipped} with unknown crops)")
+    print(f"   Trees in forest: {len(model.estimators_)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())